@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 from src.core.database import Base
 from src.core.config import settings
-from src.models.models import User, Workout, Goal
+from src.models.models import User, Workout, Goal, WorkoutDailyRollup, WorkoutSamples, PersonalRecord
 
 
 config = context.config
@@ -0,0 +1,133 @@
+"""Requests/sec of GET /workouts?limit=500 when every request is a cache hit.
+
+Compares the raw-bytes response path with the previous one, where the cached
+JSON was parsed into models and re-serialized by FastAPI's response_model.
+Runs in-process against SQLite and an in-memory Redis stand-in.
+
+Usage:
+
+    python -m benchmarks.cached_pages --rows 500 --requests 2000 --concurrency 20
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import httpx
+from fakeredis import FakeAsyncRedis
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.api.dependencies import get_current_principal
+from src.core import database
+from src.core.cache import cache_service
+from src.core.database import Base, get_db
+from src.core.security import create_access_token
+from src.main import app
+from src.models.models import User, Workout, WorkoutType
+from src.schemas.user import UserPrincipal
+from src.schemas.workout import WorkoutResponse
+from src.services.workout_service import WorkoutService
+
+
+validated = APIRouter()
+
+
+@validated.get("/bench/workouts", response_model=List[WorkoutResponse])
+async def get_workouts_validated(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    workout_type: Optional[WorkoutType] = None,
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    return await WorkoutService.get_user_workouts(db, current_user.id, skip, limit, workout_type)
+
+
+async def seed(session_factory, rows):
+    async with session_factory() as session:
+        user = User(email="bench@example.com", username="bench", hashed_password="x", weight=70)
+        session.add(user)
+        await session.flush()
+
+        started = datetime(2024, 1, 1)
+        types = list(WorkoutType)
+        await session.execute(
+            insert(Workout),
+            [
+                {
+                    "user_id": user.id,
+                    "workout_type": types[i % len(types)],
+                    "duration_minutes": 30 + i % 60,
+                    "distance_km": 5 + i % 10,
+                    "calories_burned": 300.5 + i,
+                    "average_heart_rate": 140,
+                    "avg_speed_kmh": 10.2,
+                    "notes": "интервалы",
+                    "started_at": started + timedelta(hours=i * 7),
+                }
+                for i in range(rows)
+            ],
+        )
+        await session.commit()
+        return user.id
+
+
+async def run(client, path, headers, args):
+    response = await client.get(path, headers=headers, params={"limit": args.rows})
+    response.raise_for_status()
+    size = len(response.content)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one():
+        async with semaphore:
+            await client.get(path, headers=headers, params={"limit": args.rows})
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - started
+    return args.requests / elapsed, size
+
+
+async def main(args):
+    engine = create_async_engine(args.database_url)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    database.AsyncSessionLocal = session_factory
+    app.dependency_overrides[get_db] = override_get_db
+    app.include_router(validated)
+    cache_service.redis = FakeAsyncRedis()
+
+    user_id = await seed(session_factory, args.rows)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        results = {
+            "response_model": await run(client, "/bench/workouts", headers, args),
+            "raw bytes": await run(client, "/api/v1/workouts", headers, args),
+        }
+
+    print(f"{'путь':>16} {'запр/с':>10} {'байт':>10}")
+    for title, (rate, size) in results.items():
+        print(f"{title:>16} {rate:>10.0f} {size:>10}")
+
+    await cache_service.redis.aclose()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,52 @@
+"""Scalar CalorieCalculator/WorkoutAnalytics loop versus the vectorized batch engine.
+
+Usage:
+
+    python -m benchmarks.calorie_engine --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.models.models import WorkoutType
+from src.services.analytics import CalorieCalculator, WorkoutAnalytics
+
+
+def scalar(type_codes, durations, distances, weights):
+    workout_types = list(WorkoutType)
+    for code, duration, distance, weight in zip(
+        type_codes.tolist(), durations.tolist(), distances.tolist(), weights.tolist()
+    ):
+        workout_type = workout_types[code]
+        speed = WorkoutAnalytics.calculate_average_speed(distance, duration)
+        CalorieCalculator.calculate_calories(workout_type, duration, weight, speed)
+        WorkoutAnalytics.estimate_steps(distance, workout_type)
+
+
+def main(args):
+    rng = np.random.default_rng(0)
+    type_codes = rng.integers(0, len(WorkoutType), args.rows)
+    durations = rng.uniform(5, 240, args.rows)
+    distances = rng.uniform(0.5, 60, args.rows)
+    weights = rng.uniform(40, 140, args.rows)
+
+    scalar_rows = min(args.rows, args.scalar_rows)
+    started = time.perf_counter()
+    scalar(type_codes[:scalar_rows], durations[:scalar_rows], distances[:scalar_rows], weights[:scalar_rows])
+    scalar_elapsed = (time.perf_counter() - started) * args.rows / scalar_rows
+
+    started = time.perf_counter()
+    WorkoutAnalytics.calculate_batch(type_codes, durations, distances, weights)
+    batch_elapsed = time.perf_counter() - started
+
+    print(f"строк: {args.rows:,}")
+    print(f"поэлементно: {scalar_elapsed:.2f} с (экстраполяция по {scalar_rows:,} строкам)")
+    print(f"пакетно:     {batch_elapsed:.3f} с ({scalar_elapsed / batch_elapsed:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--scalar-rows", type=int, default=100_000)
+    main(parser.parse_args())
@@ -0,0 +1,72 @@
+"""Peak Python memory of the streaming workout export versus history size.
+
+Runs against a temporary SQLite file by default; pass --database-url to use Postgres.
+
+Usage:
+
+    python -m benchmarks.export_memory --rows 1000 10000 100000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.keyset_pagination import seed
+from src.core import database
+from src.core.database import Base
+from src.services.export_service import WorkoutExportService
+
+
+async def measure(session_factory, rows, file_format):
+    user_id = await seed(session_factory, rows)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    first_chunk_ms = None
+    total_bytes = 0
+    async for chunk in WorkoutExportService.stream_workouts(user_id, file_format):
+        if first_chunk_ms is None:
+            first_chunk_ms = (time.perf_counter() - started) * 1000
+        total_bytes += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak, first_chunk_ms, elapsed, total_bytes
+
+
+async def main(args):
+    print(f"{'строк':>8} {'пик памяти, МБ':>15} {'первый байт, мс':>16} {'всего, с':>9} {'размер, МБ':>11}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as directory:
+            url = args.database_url or f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}"
+            engine = create_async_engine(url)
+            session_factory = async_sessionmaker(
+                engine, class_=AsyncSession, expire_on_commit=False
+            )
+            database.AsyncSessionLocal = session_factory
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+                await conn.run_sync(Base.metadata.create_all)
+
+            peak, first_chunk_ms, elapsed, total_bytes = await measure(
+                session_factory, rows, args.format
+            )
+            await engine.dispose()
+
+        print(
+            f"{rows:>8} {peak / 2**20:>15.2f} {first_chunk_ms:>16.1f} "
+            f"{elapsed:>9.2f} {total_bytes / 2**20:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,41 @@
+"""Throughput of decode_access_token with and without the verified-token cache.
+
+Usage:
+
+    python -m benchmarks.jwt_decode --tokens 10000 --rounds 5
+"""
+import argparse
+import time
+
+from src.core.security import create_access_token, decode_access_token, token_cache
+
+
+def run(tokens, rounds, clear_each_call):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for token in tokens:
+            if clear_each_call:
+                token_cache.clear()
+            decode_access_token(token)
+    elapsed = time.perf_counter() - started
+    return len(tokens) * rounds / elapsed
+
+
+def main(args):
+    tokens = [create_access_token({"sub": str(user_id)}) for user_id in range(args.tokens)]
+
+    uncached = run(tokens, args.rounds, clear_each_call=True)
+    token_cache.clear()
+    run(tokens, 1, clear_each_call=False)
+    cached = run(tokens, args.rounds, clear_each_call=False)
+
+    print(f"токенов: {args.tokens}, проходов: {args.rounds}")
+    print(f"без кэша: {uncached:,.0f} decode/s")
+    print(f"с кэшем:  {cached:,.0f} decode/s ({cached / uncached:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,100 @@
+"""Page latency of OFFSET pagination versus keyset (cursor) pagination by depth.
+
+Runs against SQLite by default; pass --database-url to use Postgres.
+
+Usage:
+
+    python -m benchmarks.keyset_pagination --rows 60000 --limit 100
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.database import Base
+from src.models.models import User, Workout, WorkoutType
+from src.services.workout_service import WorkoutService
+
+
+async def seed(session_factory, rows):
+    async with session_factory() as session:
+        user = User(email="bench@example.com", username="bench", hashed_password="x")
+        session.add(user)
+        await session.flush()
+
+        started = datetime(2020, 1, 1)
+        types = list(WorkoutType)
+        batch = []
+        for i in range(rows):
+            batch.append(
+                {
+                    "user_id": user.id,
+                    "workout_type": types[i % len(types)],
+                    "duration_minutes": 30,
+                    "distance_km": 5,
+                    "started_at": started + timedelta(minutes=i * 90),
+                }
+            )
+            if len(batch) == 5000:
+                await session.execute(insert(Workout), batch)
+                batch = []
+        if batch:
+            await session.execute(insert(Workout), batch)
+        await session.commit()
+        return user.id
+
+
+async def timed(coro):
+    started = time.perf_counter()
+    result = await coro
+    return result, (time.perf_counter() - started) * 1000
+
+
+async def main(args):
+    engine = create_async_engine(args.database_url)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    user_id = await seed(session_factory, args.rows)
+
+    async with session_factory() as session:
+        cursors = {}
+        cursor = None
+        depth = 0
+        while depth < args.rows:
+            page = await WorkoutService.get_user_workouts_page(session, user_id, args.limit, cursor)
+            depth += args.limit
+            cursor = page.next_cursor
+            cursors[depth] = cursor
+            if not cursor:
+                break
+
+        print(f"{'глубина':>8} {'offset, мс':>12} {'keyset, мс':>12}")
+        for depth in args.depths:
+            if depth not in cursors:
+                continue
+            _, offset_ms = await timed(
+                WorkoutService.get_user_workouts(session, user_id, depth, args.limit)
+            )
+            _, keyset_ms = await timed(
+                WorkoutService.get_user_workouts_page(session, user_id, args.limit, cursors[depth])
+            )
+            print(f"{depth:>8} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--rows", type=int, default=60000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument(
+        "--depths", type=int, nargs="+", default=[100, 1000, 10000, 30000, 50000]
+    )
+    asyncio.run(main(parser.parse_args()))
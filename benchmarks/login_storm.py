@@ -0,0 +1,90 @@
+"""Latency of GET /workouts while a concurrent /users/login storm is running.
+
+Usage (against a running API with an existing user):
+
+    python -m benchmarks.login_storm --base-url http://localhost:8000 \
+        --username testuser --password testpass123 --logins 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def login(client, username, password):
+    response = await client.post(
+        "/api/v1/users/login",
+        json={"username": username, "password": password},
+    )
+    return response.status_code
+
+
+async def login_storm(client, args, stop):
+    semaphore = asyncio.Semaphore(args.concurrency)
+    statuses = []
+
+    async def one():
+        async with semaphore:
+            statuses.append(await login(client, args.username, args.password))
+
+    await asyncio.gather(*(one() for _ in range(args.logins)))
+    stop.set()
+    return statuses
+
+
+async def poll_workouts(client, headers, stop):
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/api/v1/workouts", headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        response = await client.post(
+            "/api/v1/users/login",
+            json={"username": args.username, "password": args.password},
+        )
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        baseline_stop = asyncio.Event()
+        asyncio.get_running_loop().call_later(2, baseline_stop.set)
+        baseline = await poll_workouts(client, headers, baseline_stop)
+
+        stop = asyncio.Event()
+        statuses, latencies = await asyncio.gather(
+            login_storm(client, args, stop),
+            poll_workouts(client, headers, stop),
+        )
+
+    for title, values in (("без нагрузки", baseline), ("во время логинов", latencies)):
+        print(
+            f"/workouts {title}: n={len(values)} "
+            f"p50={statistics.median(values):.1f} ms "
+            f"p99={percentile(values, 99):.1f} ms"
+        )
+    print(
+        "логины: "
+        + ", ".join(f"{code}={statuses.count(code)}" for code in sorted(set(statuses)))
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default="testuser")
+    parser.add_argument("--password", default="testpass123")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
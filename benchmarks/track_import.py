@@ -0,0 +1,67 @@
+"""Parse and analyze time of the GPX/TCX track import on synthetic tracks.
+
+Usage:
+
+    python -m benchmarks.track_import --points 10000 100000
+"""
+import argparse
+import io
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.services.track_service import TrackImportService
+
+
+def synthetic_gpx(points, seed=0):
+    rng = np.random.default_rng(seed)
+    latitudes = 55.75 + np.cumsum(rng.normal(0, 2e-5, points))
+    longitudes = 37.61 + np.cumsum(rng.normal(3e-5, 2e-5, points))
+    heart_rates = np.clip(140 + np.cumsum(rng.integers(-1, 2, points)), 60, 200)
+    started = datetime(2026, 5, 1, 6, 0, 0)
+
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1" '
+        'xmlns:gpxtpx="http://www.garmin.com/xmlschemas/TrackPointExtension/v1">'
+        "<trk><trkseg>"
+    ]
+    for i, (lat, lon, hr) in enumerate(zip(latitudes.tolist(), longitudes.tolist(), heart_rates.tolist())):
+        moment = (started + timedelta(seconds=i)).isoformat()
+        parts.append(
+            f'<trkpt lat="{lat:.7f}" lon="{lon:.7f}"><ele>150.0</ele><time>{moment}Z</time>'
+            f"<extensions><gpxtpx:TrackPointExtension><gpxtpx:hr>{hr}</gpxtpx:hr>"
+            f"</gpxtpx:TrackPointExtension></extensions></trkpt>"
+        )
+    parts.append("</trkseg></trk></gpx>")
+    return "".join(parts).encode()
+
+
+def main(args):
+    print(f"{'точек':>8} {'размер, МБ':>11} {'разбор, с':>10} {'расчет, мс':>11} {'пик памяти, МБ':>15} {'км':>7}")
+    for points in args.points:
+        payload = synthetic_gpx(points)
+
+        started = time.perf_counter()
+        track = TrackImportService.parse(io.BytesIO(payload))
+        parsed = time.perf_counter()
+        summary = TrackImportService.analyze(**track)
+        analyzed = time.perf_counter()
+
+        tracemalloc.start()
+        TrackImportService.analyze(**TrackImportService.parse(io.BytesIO(payload)))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"{points:>8} {len(payload) / 2**20:>11.1f} {parsed - started:>10.3f} "
+            f"{(analyzed - parsed) * 1000:>11.1f} {peak / 2**20:>15.1f} {summary.distance_km:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, nargs="+", default=[10000, 100000])
+    main(parser.parse_args())
@@ -5,15 +5,16 @@ from src.core.database import get_db
 from src.core.security import decode_access_token
 from src.services.user_service import UserService
 from src.models.models import User
+from src.schemas.user import UserPrincipal
 
 
 security = HTTPBearer()
 
 
-async def get_current_user(
+async def get_current_principal(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
-) -> User:
+) -> UserPrincipal:
     token = credentials.credentials
     
     payload = decode_access_token(token)
@@ -33,19 +34,35 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = await UserService.get_user_by_id(db, int(user_id))
+    principal = await UserService.get_principal(db, int(user_id))
     
-    if not user:
+    if not principal:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Пользователь не найден",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Пользователь деактивирован",
         )
     
+    return principal
+
+
+async def get_current_user(
+    principal: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    user = await UserService.get_user_by_id(db, principal.id)
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Пользователь не найден",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     return user
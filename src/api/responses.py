@@ -0,0 +1,46 @@
+from fastapi import Request, status
+from fastapi.responses import Response
+from src.core.cache import cache_service
+from typing import Awaitable, Callable, Optional, Sequence
+import hashlib
+
+
+def json_response(payload: bytes, etag: Optional[str] = None) -> Response:
+    response = Response(content=payload, media_type="application/json")
+    if etag:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque for candidate in header.split(",")
+    )
+
+
+async def data_etag(tags: Sequence[str], *parts) -> Optional[str]:
+    version = await cache_service.data_version(tags)
+    if version is None:
+        return None
+    digest = hashlib.sha1(":".join(map(str, (version, *parts))).encode()).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+async def conditional_json(
+    request: Request,
+    tags: Sequence[str],
+    parts: Sequence,
+    load: Callable[[], Awaitable[bytes]],
+) -> Response:
+    etag = await data_etag(tags, *parts)
+    if etag and etag_matches(request, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+        )
+    return json_response(await load(), etag)
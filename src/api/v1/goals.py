@@ -1,22 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.database import get_db
 from src.schemas.goal import GoalCreate, GoalResponse, GoalUpdate, GoalProgress
 from src.services.goal_service import GoalService
-from src.api.dependencies import get_current_user
-from src.models.models import User
+from src.api.dependencies import get_current_principal
+from src.api.responses import conditional_json
+from src.schemas.user import UserPrincipal
 from typing import List
 from src.core.logging import get_logger
+from src.core.cache import cache_service
+from datetime import datetime
 
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/goals", tags=["goals"])
 
 
+async def invalidate_goal_caches(user_id: int):
+    await cache_service.invalidate_tags(f"user:{user_id}:goals")
+
+
 @router.post("", response_model=GoalResponse, status_code=status.HTTP_201_CREATED)
 async def create_goal(
     goal_data: GoalCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     logger.info(f"Создание цели для пользователя: ID {current_user.id}")
@@ -24,23 +31,44 @@ async def create_goal(
     goal = await GoalService.create_goal(db, current_user.id, goal_data)
     await db.commit()
     
+    await invalidate_goal_caches(current_user.id)
+    
     return goal
 
 
 @router.get("", response_model=List[GoalResponse])
 async def get_goals(
+    request: Request,
     active_only: bool = Query(False),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    return await conditional_json(
+        request,
+        [f"user:{current_user.id}:goals"],
+        ("goals", active_only),
+        lambda: GoalService.get_user_goals.raw(db, current_user.id, active_only),
+    )
+
+
+@router.get("/progress", response_model=List[GoalProgress])
+async def get_goals_progress(
+    request: Request,
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
-    goals = await GoalService.get_user_goals(db, current_user.id, active_only)
-    return goals
+    return await conditional_json(
+        request,
+        [f"user:{current_user.id}:goals", f"user:{current_user.id}:workouts"],
+        ("goals:progress", datetime.utcnow().date()),
+        lambda: GoalService.get_goals_progress.raw(db, current_user.id),
+    )
 
 
 @router.get("/{goal_id}", response_model=GoalResponse)
 async def get_goal(
     goal_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     goal = await GoalService.get_goal_by_id(db, goal_id, current_user.id)
@@ -57,26 +85,35 @@ async def get_goal(
 
 @router.get("/{goal_id}/progress", response_model=GoalProgress)
 async def get_goal_progress(
+    request: Request,
     goal_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
-    progress = await GoalService.get_goal_progress(db, goal_id, current_user.id)
+    async def load() -> bytes:
+        progress = await GoalService.get_goal_progress.raw(db, goal_id, current_user.id)
+        
+        if progress == b"null":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Цель не найдена",
+            )
+        
+        return progress
     
-    if not progress:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Цель не найдена",
-        )
-    
-    return progress
+    return await conditional_json(
+        request,
+        [f"user:{current_user.id}:goals", f"user:{current_user.id}:workouts"],
+        ("goals:progress", goal_id, datetime.utcnow().date()),
+        load,
+    )
 
 
 @router.put("/{goal_id}", response_model=GoalResponse)
 async def update_goal(
     goal_id: int,
     goal_data: GoalUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     updated_goal = await GoalService.update_goal(db, goal_id, current_user.id, goal_data)
@@ -89,13 +126,15 @@ async def update_goal(
     
     await db.commit()
     
+    await invalidate_goal_caches(current_user.id)
+    
     return updated_goal
 
 
 @router.delete("/{goal_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_goal(
     goal_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     deleted = await GoalService.delete_goal(db, goal_id, current_user.id)
@@ -107,3 +146,5 @@ async def delete_goal(
         )
     
     await db.commit()
+    
+    await invalidate_goal_caches(current_user.id)
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.database import get_db
+from src.schemas.leaderboard import Leaderboard, LeaderboardPosition
+from src.services.leaderboard_service import LeaderboardService
+from src.api.dependencies import get_current_principal
+from src.schemas.user import UserPrincipal
+from src.core.logging import get_logger
+from src.core.cache import cache_service
+from src.core.config import settings
+from typing import Optional
+from datetime import date, datetime
+
+
+logger = get_logger(__name__)
+router = APIRouter(prefix="/leaderboards", tags=["leaderboards"])
+
+METRIC_PATTERN = "^(distance|calories|workouts)$"
+PERIOD_PATTERN = "^(week|month)$"
+
+
+def require_redis():
+    if not cache_service.redis:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Рейтинги временно недоступны",
+        )
+
+
+@router.get("/{metric}", response_model=Leaderboard)
+async def get_leaderboard(
+    metric: str = Path(..., pattern=METRIC_PATTERN),
+    period: str = Query("week", pattern=PERIOD_PATTERN),
+    on: Optional[date] = Query(None, alias="date"),
+    limit: int = Query(10, ge=1, le=settings.LEADERBOARD_MAX_LIMIT),
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    require_redis()
+    return await LeaderboardService.top(
+        db, metric, period, on or datetime.utcnow().date(), limit
+    )
+
+
+@router.get("/{metric}/me", response_model=LeaderboardPosition)
+async def get_my_leaderboard_position(
+    metric: str = Path(..., pattern=METRIC_PATTERN),
+    period: str = Query("week", pattern=PERIOD_PATTERN),
+    on: Optional[date] = Query(None, alias="date"),
+    current_user: UserPrincipal = Depends(get_current_principal),
+):
+    require_redis()
+    return await LeaderboardService.position(
+        metric, period, on or datetime.utcnow().date(), current_user.id
+    )
+
+
+@router.get("/{metric}/around-me", response_model=Leaderboard)
+async def get_leaderboard_around_me(
+    metric: str = Path(..., pattern=METRIC_PATTERN),
+    period: str = Query("week", pattern=PERIOD_PATTERN),
+    on: Optional[date] = Query(None, alias="date"),
+    radius: int = Query(5, ge=1, le=settings.LEADERBOARD_MAX_RADIUS),
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    require_redis()
+    return await LeaderboardService.around(
+        db, metric, period, on or datetime.utcnow().date(), current_user.id, radius
+    )
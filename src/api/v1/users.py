@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.database import get_db
 from src.schemas.user import UserCreate, UserResponse, UserUpdate, UserLogin, Token
+from src.schemas.workout import CalorieRecalculationProgress, PersonalRecordResponse
 from src.services.user_service import UserService
+from src.services.workout_service import WorkoutService, recalculation_progress
+from src.services.record_service import PersonalRecordService
+from src.services.leaderboard_service import LeaderboardService
 from src.core.security import create_access_token
-from src.api.dependencies import get_current_user
+from src.api.dependencies import get_current_user, get_current_principal
+from src.schemas.user import UserPrincipal
 from src.models.models import User
 from src.core.logging import get_logger
+from src.core.cache import cache_service
+from typing import List
 
 
 logger = get_logger(__name__)
@@ -64,14 +71,27 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
     return current_user
 
 
+@router.get("/me/records", response_model=List[PersonalRecordResponse])
+async def get_personal_records(
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    return await PersonalRecordService.get_records(db, current_user.id)
+
+
 @router.put("/me", response_model=UserResponse)
 async def update_current_user(
     user_data: UserUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     logger.info(f"Обновление профиля пользователя: ID {current_user.id}")
     
+    weight_changed = (
+        "weight" in user_data.model_fields_set and user_data.weight != current_user.weight
+    )
+    
     updated_user = await UserService.update_user(db, current_user.id, user_data)
     await db.commit()
     
@@ -81,9 +101,27 @@ async def update_current_user(
             detail="Пользователь не найден",
         )
     
+    await UserService.invalidate_principal(current_user.id)
+    
+    if weight_changed:
+        background_tasks.add_task(WorkoutService.recalculate_calories, current_user.id)
+    
     return updated_user
 
 
+@router.get("/me/calorie-recalculation", response_model=CalorieRecalculationProgress)
+async def get_calorie_recalculation(current_user: User = Depends(get_current_user)):
+    progress = recalculation_progress.get(current_user.id)
+    
+    if not progress:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Пересчет калорий не запускался",
+        )
+    
+    return progress
+
+
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_current_user(
     current_user: User = Depends(get_current_user),
@@ -99,3 +137,7 @@ async def delete_current_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Пользователь не найден",
         )
+    
+    await UserService.invalidate_principal(current_user.id)
+    await cache_service.purge(f"user:{current_user.id}:*")
+    await LeaderboardService.remove_user(current_user.id)
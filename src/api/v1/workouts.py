@@ -1,25 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.database import get_db
-from src.schemas.workout import WorkoutCreate, WorkoutResponse, WorkoutUpdate, WorkoutStats
+from src.schemas.workout import (
+    WorkoutCreate,
+    WorkoutResponse,
+    WorkoutUpdate,
+    WorkoutStats,
+    WorkoutStatsSeries,
+    WorkoutPage,
+    WorkoutBatchCreate,
+    WorkoutBatchItemError,
+    WorkoutBatchResult,
+    WorkoutImportProgress,
+    WorkoutSamplesCreate,
+    WorkoutSamplesResponse,
+    WorkoutSamplesSummary,
+    HeartRateZonesResponse,
+    WorkoutTrackImportResult,
+)
 from src.services.workout_service import WorkoutService
-from src.api.dependencies import get_current_user
-from src.models.models import User, WorkoutType
+from src.services.import_service import WorkoutImportService, import_progress
+from src.services.export_service import WorkoutExportService
+from src.services.samples_service import WorkoutSamplesService
+from src.services.track_service import TrackImportService
+from src.services.leaderboard_service import LeaderboardService
+from fastapi.responses import StreamingResponse
+from src.api.dependencies import get_current_principal
+from src.api.responses import conditional_json
+from src.models.models import WorkoutType
+from src.schemas.user import UserPrincipal
 from typing import List, Optional
 from src.core.logging import get_logger
 from src.core.cache import cache_service
-from datetime import timedelta
-import json
+from src.core.config import settings
+from pydantic import ValidationError
+from datetime import date, datetime, timedelta
+import asyncio
 
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/workouts", tags=["workouts"])
 
 
+async def invalidate_workout_caches(db: AsyncSession, user_id: int):
+    await LeaderboardService.publish(db)
+    await cache_service.invalidate_tags(f"user:{user_id}:workouts")
+
+
 @router.post("", response_model=WorkoutResponse, status_code=status.HTTP_201_CREATED)
 async def create_workout(
     workout_data: WorkoutCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     logger.info(f"Создание тренировки для пользователя: ID {current_user.id}")
@@ -27,70 +58,242 @@ async def create_workout(
     workout = await WorkoutService.create_workout(db, current_user.id, workout_data)
     await db.commit()
     
-    await cache_service.delete(f"user:{current_user.id}:workouts")
-    await cache_service.delete(f"user:{current_user.id}:stats")
+    await invalidate_workout_caches(db, current_user.id)
     
     return workout
 
 
+@router.post("/batch", response_model=WorkoutBatchResult)
+async def create_workouts_batch(
+    batch: WorkoutBatchCreate,
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    logger.info(
+        f"Пакетная загрузка {len(batch.workouts)} тренировок для пользователя: ID {current_user.id}"
+    )
+    
+    valid = []
+    errors = []
+    for index, item in enumerate(batch.workouts):
+        try:
+            valid.append(WorkoutCreate.model_validate(item))
+        except ValidationError as e:
+            errors.append(
+                WorkoutBatchItemError(
+                    index=index,
+                    errors=[
+                        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                        for error in e.errors()
+                    ],
+                )
+            )
+    
+    workout_ids = []
+    if valid:
+        workout_ids = await WorkoutService.create_workouts_bulk(db, current_user.id, valid)
+        await db.commit()
+        await invalidate_workout_caches(db, current_user.id)
+    
+    return WorkoutBatchResult(created=len(workout_ids), workout_ids=workout_ids, errors=errors)
+
+
+@router.post("/import", response_model=WorkoutImportProgress)
+async def import_workouts(
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    start_row: int = Query(0, ge=0),
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    if not file_format:
+        filename = (file.filename or "").lower()
+        file_format = "csv" if filename.endswith(".csv") else "ndjson"
+    
+    try:
+        progress = await WorkoutImportService.import_workouts(
+            db, current_user.id, file.read, file_format, start_row
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    finally:
+        await invalidate_workout_caches(db, current_user.id)
+    
+    return progress
+
+
+@router.post(
+    "/import/track",
+    response_model=WorkoutTrackImportResult,
+    status_code=status.HTTP_201_CREATED,
+)
+async def import_workout_track(
+    file: UploadFile = File(...),
+    workout_type: WorkoutType = Query(WorkoutType.RUNNING),
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    logger.info(f"Импорт трека {file.filename} для пользователя: ID {current_user.id}")
+    
+    try:
+        track = await asyncio.to_thread(TrackImportService.parse, file.file)
+        summary = await asyncio.to_thread(TrackImportService.analyze, **track)
+        workout = await TrackImportService.create_workout(
+            db, current_user.id, workout_type, summary
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    
+    await db.commit()
+    
+    await invalidate_workout_caches(db, current_user.id)
+    
+    return WorkoutTrackImportResult(workout=workout, track=summary)
+
+
+@router.get("/import/progress", response_model=WorkoutImportProgress)
+async def get_import_progress(
+    current_user: UserPrincipal = Depends(get_current_principal),
+):
+    progress = import_progress.get(current_user.id)
+    
+    if not progress:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Импорт не найден",
+        )
+    
+    return progress
+
+
+@router.get("/export")
+async def export_workouts(
+    file_format: str = Query("ndjson", pattern="^(csv|ndjson)$"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    current_user: UserPrincipal = Depends(get_current_principal),
+):
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Начало периода не может быть позже его окончания",
+        )
+    
+    media_type = "text/csv" if file_format == "csv" else "application/x-ndjson"
+    
+    return StreamingResponse(
+        WorkoutExportService.stream_workouts(current_user.id, file_format, date_from, date_to),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="workouts.{file_format}"'},
+    )
+
+
 @router.get("", response_model=List[WorkoutResponse])
 async def get_workouts(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     workout_type: Optional[WorkoutType] = None,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
-    cache_key = f"user:{current_user.id}:workouts:{skip}:{limit}:{workout_type}"
-    
-    cached = await cache_service.get(cache_key)
-    if cached:
-        logger.info(f"Получение тренировок из кэша для пользователя: ID {current_user.id}")
-        return json.loads(cached)
-    
-    workouts = await WorkoutService.get_user_workouts(
-        db, current_user.id, skip, limit, workout_type
+    return await conditional_json(
+        request,
+        [f"user:{current_user.id}:workouts"],
+        ("workouts", skip, limit, workout_type),
+        lambda: WorkoutService.get_user_workouts.raw(
+            db, current_user.id, skip, limit, workout_type
+        ),
     )
+
+
+@router.get("/page", response_model=WorkoutPage)
+async def get_workouts_page(
+    request: Request,
+    cursor: Optional[str] = Query(None, max_length=200),
+    limit: int = Query(100, ge=1, le=500),
+    workout_type: Optional[WorkoutType] = None,
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    if cursor:
+        try:
+            WorkoutService.decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
     
-    result = [WorkoutResponse.model_validate(w) for w in workouts]
-    
-    await cache_service.set(
-        cache_key,
-        json.dumps([r.model_dump(mode="json") for r in result], default=str),
-        expire=timedelta(minutes=5),
+    return await conditional_json(
+        request,
+        [f"user:{current_user.id}:workouts"],
+        ("workouts:page", cursor, limit, workout_type),
+        lambda: WorkoutService.get_user_workouts_page.raw(
+            db, current_user.id, limit, cursor, workout_type
+        ),
     )
-    
-    return result
 
 
 @router.get("/stats", response_model=WorkoutStats)
 async def get_workout_stats(
+    request: Request,
     days: int = Query(30, ge=1, le=365),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    return await conditional_json(
+        request,
+        [f"user:{current_user.id}:workouts"],
+        ("stats", days, datetime.utcnow().date()),
+        lambda: WorkoutService.get_workout_statistics.raw(db, current_user.id, days),
+    )
+
+
+@router.get("/stats/series", response_model=WorkoutStatsSeries)
+async def get_workout_stats_series(
+    request: Request,
+    bucket: str = Query("day", pattern="^(day|week|month)$"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
-    cache_key = f"user:{current_user.id}:stats:{days}"
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=30)
     
-    cached = await cache_service.get(cache_key)
-    if cached:
-        logger.info(f"Получение статистики из кэша для пользователя: ID {current_user.id}")
-        return WorkoutStats(**json.loads(cached))
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Начало периода не может быть позже его окончания",
+        )
     
-    stats = await WorkoutService.get_workout_statistics(db, current_user.id, days)
+    if (date_to - date_from).days > settings.STATS_SERIES_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Период не может превышать {settings.STATS_SERIES_MAX_DAYS} дней",
+        )
     
-    await cache_service.set(
-        cache_key,
-        json.dumps(stats.model_dump()),
-        expire=timedelta(minutes=10),
+    return await conditional_json(
+        request,
+        [f"user:{current_user.id}:workouts"],
+        ("stats:series", bucket, date_from, date_to),
+        lambda: WorkoutService.get_workout_series.raw(
+            db, current_user.id, bucket, date_from, date_to
+        ),
     )
-    
-    return stats
 
 
 @router.get("/{workout_id}", response_model=WorkoutResponse)
 async def get_workout(
     workout_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     workout = await WorkoutService.get_workout_by_id(db, workout_id, current_user.id)
@@ -109,7 +312,7 @@ async def get_workout(
 async def update_workout(
     workout_id: int,
     workout_data: WorkoutUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     updated_workout = await WorkoutService.update_workout(
@@ -124,8 +327,7 @@ async def update_workout(
     
     await db.commit()
     
-    await cache_service.delete(f"user:{current_user.id}:workouts")
-    await cache_service.delete(f"user:{current_user.id}:stats")
+    await invalidate_workout_caches(db, current_user.id)
     
     return updated_workout
 
@@ -133,7 +335,7 @@ async def update_workout(
 @router.delete("/{workout_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_workout(
     workout_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     deleted = await WorkoutService.delete_workout(db, workout_id, current_user.id)
@@ -146,5 +348,81 @@ async def delete_workout(
     
     await db.commit()
     
-    await cache_service.delete(f"user:{current_user.id}:workouts")
-    await cache_service.delete(f"user:{current_user.id}:stats")
+    await invalidate_workout_caches(db, current_user.id)
+
+
+async def get_workout_or_404(db: AsyncSession, workout_id: int, user_id: int):
+    workout = await WorkoutService.get_workout_by_id(db, workout_id, user_id)
+    
+    if not workout:
+        logger.warning(f"Тренировка не найдена: ID {workout_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Тренировка не найдена",
+        )
+    
+    return workout
+
+
+@router.put("/{workout_id}/samples", response_model=WorkoutSamplesSummary)
+async def put_workout_samples(
+    workout_id: int,
+    samples: WorkoutSamplesCreate,
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    await get_workout_or_404(db, workout_id, current_user.id)
+    
+    try:
+        record = await WorkoutSamplesService.save_samples(db, workout_id, samples)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    
+    await db.commit()
+    
+    return WorkoutSamplesSummary(
+        workout_id=workout_id,
+        sample_count=record.sample_count,
+        stored_bytes=WorkoutSamplesService.stored_bytes(record),
+    )
+
+
+@router.get("/{workout_id}/samples", response_model=WorkoutSamplesResponse)
+async def get_workout_samples(
+    workout_id: int,
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    await get_workout_or_404(db, workout_id, current_user.id)
+    
+    record = await WorkoutSamplesService.get_samples(db, workout_id)
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Отсчеты датчиков не найдены",
+        )
+    
+    return WorkoutSamplesService.to_response(record)
+
+
+@router.get("/{workout_id}/samples/zones", response_model=HeartRateZonesResponse)
+async def get_workout_heart_rate_zones(
+    workout_id: int,
+    max_heart_rate: Optional[int] = Query(None, ge=30, le=250),
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    workout = await get_workout_or_404(db, workout_id, current_user.id)
+    
+    record = await WorkoutSamplesService.get_samples(db, workout_id)
+    zones = record and WorkoutSamplesService.heart_rate_zones(workout, record, max_heart_rate)
+    if not zones:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Отсчеты пульса не найдены",
+        )
+    
+    return zones
@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+from src.core.database import session_scope
+from src.services.rollup_service import RollupService
+from src.services.goal_evaluator import GoalEvaluator
+from src.services.record_service import PersonalRecordService
+from src.services.leaderboard_service import LeaderboardService, PERIODS
+from src.core.cache import cache_service
+from src.core.config import settings
+from datetime import date, datetime
+
+
+async def rebuild_rollups(args):
+    await cache_service.connect()
+    try:
+        if args.user_id:
+            async with session_scope() as session:
+                await RollupService.rebuild(session, [args.user_id])
+            await cache_service.invalidate_tags(f"user:{args.user_id}:workouts")
+            print(f"Агрегаты пересобраны для пользователя ID {args.user_id}")
+        else:
+            rebuilt = await RollupService.rebuild_all()
+            print(f"Агрегаты пересобраны для {rebuilt} пользователей")
+    finally:
+        await cache_service.disconnect()
+
+
+async def evaluate_goals(args):
+    await cache_service.connect()
+    try:
+        result = await GoalEvaluator.evaluate_all()
+        print(
+            f"Проверено целей: {result['evaluated']}, достигнуто: {result['achieved']}, "
+            f"{result['duration_seconds']} с"
+        )
+    finally:
+        await cache_service.disconnect()
+
+
+async def backfill_records(args):
+    if args.user_id:
+        async with session_scope() as session:
+            await PersonalRecordService.rebuild(session, [args.user_id])
+        print(f"Личные рекорды пересчитаны для пользователя ID {args.user_id}")
+    else:
+        processed = await PersonalRecordService.backfill(args.concurrency)
+        print(f"Личные рекорды пересчитаны для {processed} пользователей")
+
+
+async def rebuild_leaderboards(args):
+    await cache_service.connect()
+    try:
+        day = args.date or datetime.utcnow().date()
+        for period in [args.period] if args.period else PERIODS:
+            users = await LeaderboardService.rebuild(period, day)
+            period_id, _, _ = LeaderboardService.period_bounds(period, day)
+            print(f"Рейтинги за период {period_id} пересобраны для {users} пользователей")
+    finally:
+        await cache_service.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    rollups = commands.add_parser(
+        "rebuild-rollups", help="Пересобрать дневные агрегаты тренировок"
+    )
+    rollups.add_argument("--user-id", type=int, default=None)
+    rollups.set_defaults(handler=rebuild_rollups)
+    
+    goals = commands.add_parser(
+        "evaluate-goals", help="Отметить достигнутые цели всех пользователей"
+    )
+    goals.set_defaults(handler=evaluate_goals)
+    
+    records = commands.add_parser(
+        "backfill-records", help="Пересчитать личные рекорды пользователей"
+    )
+    records.add_argument("--user-id", type=int, default=None)
+    records.add_argument(
+        "--concurrency", type=int, default=settings.RECORDS_BACKFILL_CONCURRENCY
+    )
+    records.set_defaults(handler=backfill_records)
+    
+    leaderboards = commands.add_parser(
+        "rebuild-leaderboards", help="Пересобрать рейтинги из дневных агрегатов"
+    )
+    leaderboards.add_argument("--period", choices=PERIODS, default=None)
+    leaderboards.add_argument("--date", type=date.fromisoformat, default=None)
+    leaderboards.set_defaults(handler=rebuild_leaderboards)
+    
+    args = parser.parse_args()
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,272 @@
 import redis.asyncio as aioredis
 from src.core.config import settings
-from typing import Optional
+from src.core.database import session_scope
+from src.core.logging import get_logger
+from typing import Any, Awaitable, Callable, Optional, Sequence
+from pydantic import TypeAdapter
+import asyncio
+import functools
+import inspect
+import secrets
+from collections import Counter, OrderedDict, defaultdict
 import json
+import sys
+import threading
+import time
+import zlib
 from datetime import timedelta
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+logger = get_logger(__name__)
+
+EPOCH_KEY = "cache:epoch"
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+MSGPACK_MARKER = b"\xc1"
+
+
+class PayloadCodec:
+    name = "none"
+    tag = b"\x01"
+
+    def encode(self, data: bytes) -> bytes:
+        return data
+
+    def decode(self, data: bytes) -> bytes:
+        return data
+
+
+class ZlibCodec(PayloadCodec):
+    name = "zlib"
+    tag = b"\x02"
+
+    def encode(self, data: bytes) -> bytes:
+        return zlib.compress(data, settings.CACHE_COMPRESSION_LEVEL or 6)
+
+    def decode(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class ZstdCodec(PayloadCodec):
+    name = "zstd"
+    tag = b"\x03"
+
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=settings.CACHE_COMPRESSION_LEVEL or 3)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def encode(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decode(self, data: bytes) -> bytes:
+        return self._decompressor.decompress(data)
+
+
+def build_codecs() -> dict[bytes, PayloadCodec]:
+    codecs = [PayloadCodec(), ZlibCodec()]
+    if zstandard is not None:
+        codecs.append(ZstdCodec())
+    return {codec.tag: codec for codec in codecs}
+
+
+class LRUCache:
+    def __init__(
+        self,
+        max_items: int,
+        default_ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ):
+        self.max_items = max_items
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[str, tuple[Optional[float], Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value, size = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.size_bytes -= size
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        if ttl is None:
+            ttl = self.default_ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = sys.getsizeof(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return
+
+        evicted = []
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous:
+                self.size_bytes -= previous[2]
+            self._data[key] = (expires_at, value, size)
+            self.size_bytes += size
+            while len(self._data) > self.max_items or (
+                self.max_bytes and self.size_bytes > self.max_bytes
+            ):
+                evicted_key, (_, _, evicted_size) = self._data.popitem(last=False)
+                self.size_bytes -= evicted_size
+                self.evictions += 1
+                evicted.append(evicted_key)
+
+        if self.on_evict:
+            for evicted_key in evicted:
+                self.on_evict(evicted_key)
+
+    def delete(self, key: str):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry:
+                self.size_bytes -= entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class CacheStats:
+    def __init__(self):
+        self._counters: defaultdict[tuple[str, str], Counter] = defaultdict(Counter)
+
+    @staticmethod
+    def key_prefix(key: str) -> str:
+        parts = key.split(":")[:3]
+        return ":".join("{id}" if part.isdigit() else part for part in parts)
+
+    def record(self, tier: str, key: str, event: str, amount: int = 1):
+        self._counters[(tier, self.key_prefix(key))][event] += amount
+
+    def snapshot(self) -> dict:
+        result: dict = {}
+        for (tier, prefix), counter in sorted(self._counters.items()):
+            result.setdefault(tier, {})[prefix] = dict(counter)
+        return result
+
+    def compression_report(self) -> dict:
+        report = {}
+        for (tier, prefix), counter in sorted(self._counters.items()):
+            if tier != "codec":
+                continue
+            raw_bytes, stored_bytes = counter["raw_bytes"], counter["stored_bytes"]
+            report[prefix] = {
+                **dict(counter),
+                "saved_bytes": raw_bytes - stored_bytes,
+                "ratio": round(raw_bytes / stored_bytes, 2) if stored_bytes else None,
+            }
+        return report
+
+    def reset(self):
+        self._counters.clear()
+
 
 class CacheService:
     def __init__(self):
         self.redis: Optional[aioredis.Redis] = None
+        self.stats = CacheStats()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._background: set[asyncio.Task] = set()
+        self.codecs = build_codecs()
+        self.codec = self._select_codec(settings.CACHE_COMPRESSION)
+        self.json_codec = self._select_json_codec(settings.CACHE_JSON_CODEC)
+        self.local: Optional[LRUCache] = None
+        if settings.CACHE_L1_ENABLED:
+            self.local = LRUCache(
+                max_items=settings.CACHE_L1_MAX_ITEMS,
+                default_ttl=settings.CACHE_L1_TTL_SECONDS,
+                max_bytes=settings.CACHE_L1_MAX_BYTES,
+                on_evict=lambda key: self.stats.record("l1", key, "evictions"),
+            )
+
+    def _select_codec(self, name: str) -> PayloadCodec:
+        for codec in self.codecs.values():
+            if codec.name == name:
+                return codec
+        logger.warning(f"Кодек кэша {name} недоступен, используется zlib")
+        return self.codecs[ZlibCodec.tag]
+
+    @staticmethod
+    def _select_json_codec(name: str) -> str:
+        if name == "msgpack" and msgpack is None:
+            logger.warning("Кодек кэша msgpack недоступен, используется json")
+            return "json"
+        return name
+
+    def encode(self, key: str, data: bytes) -> bytes:
+        codec = self.codecs[PayloadCodec.tag]
+        payload = data
+        if len(data) >= settings.CACHE_COMPRESSION_MIN_BYTES:
+            compressed = self.codec.encode(data)
+            if len(compressed) < len(data):
+                codec, payload = self.codec, compressed
+
+        self.stats.record("codec", key, "raw_bytes", len(data))
+        self.stats.record("codec", key, "stored_bytes", len(payload) + 1)
+        self.stats.record("codec", key, codec.name)
+        return codec.tag + payload
+
+    def decode(self, value: bytes) -> bytes:
+        codec = self.codecs.get(value[:1])
+        if codec is None:
+            return value
+        return codec.decode(value[1:])
 
     async def connect(self):
         self.redis = await aioredis.from_url(
             settings.REDIS_URL,
-            encoding="utf-8",
-            decode_responses=True,
+            decode_responses=False,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
         )
 
     async def disconnect(self):
@@ -21,44 +274,341 @@ class CacheService:
             await self.redis.close()
 
     async def get(self, key: str) -> Optional[str]:
+        value = await self.get_bytes(key)
+        return None if value is None else value.decode()
+
+    async def get_bytes(self, key: str, local: bool = False) -> Optional[bytes]:
         if not self.redis:
             return None
-        return await self.redis.get(key)
+
+        if local and self.local is not None:
+            value = self.local.get(key)
+            if value is not None:
+                self.stats.record("l1", key, "hits")
+                return value
+            self.stats.record("l1", key, "misses")
+
+        value = await self.redis.get(key)
+        self.stats.record("redis", key, "hits" if value is not None else "misses")
+        if value is None:
+            return None
+
+        value = self.decode(value)
+        if local and self.local is not None:
+            self.local.set(key, value)
+        return value
 
     async def set(
         self,
         key: str,
         value: str,
         expire: Optional[timedelta] = None,
+    ) -> bool:
+        return await self.set_bytes(key, value.encode(), expire)
+
+    async def set_bytes(
+        self,
+        key: str,
+        value: bytes,
+        expire: Optional[timedelta] = None,
+        local: bool = False,
     ) -> bool:
         if not self.redis:
             return False
         
+        encoded = self.encode(key, value)
         if expire:
-            await self.redis.setex(key, expire, value)
+            await self.redis.setex(key, expire, encoded)
         else:
-            await self.redis.set(key, value)
+            await self.redis.set(key, encoded)
+
+        if local and self.local is not None:
+            local_ttl = settings.CACHE_L1_TTL_SECONDS
+            if expire:
+                local_ttl = min(local_ttl, expire.total_seconds())
+            self.local.set(key, value, local_ttl)
         return True
 
     async def delete(self, key: str) -> bool:
+        return await self.delete_many(key)
+
+    async def delete_many(self, *keys: str) -> bool:
         if not self.redis:
             return False
-        await self.redis.delete(key)
+        if not keys:
+            return True
+        if self.local is not None:
+            for key in keys:
+                self.local.delete(key)
+        await self.redis.unlink(*keys)
         return True
 
-    async def get_json(self, key: str) -> Optional[dict]:
-        value = await self.get(key)
-        if value:
-            return json.loads(value)
+    async def purge(self, pattern: str) -> int:
+        if not self.redis:
+            return 0
+
+        purged = 0
+        batch = []
+        async for key in self.redis.scan_iter(match=pattern, count=settings.REDIS_SCAN_BATCH_SIZE):
+            key = key.decode()
+            if key.endswith(":generation"):
+                continue
+            batch.append(key)
+            if len(batch) >= settings.REDIS_SCAN_BATCH_SIZE:
+                await self.delete_many(*batch)
+                purged += len(batch)
+                batch = []
+        if batch:
+            await self.delete_many(*batch)
+            purged += len(batch)
+
+        logger.info(f"Очищено ключей кэша по шаблону {pattern}: {purged}")
+        return purged
+
+    def get_stats(self) -> dict:
+        return {
+            "tiers": self.stats.snapshot(),
+            "l1": self.local.stats() if self.local is not None else None,
+            "codec": self.codec.name,
+            "json_codec": self.json_codec,
+            "compression": self.stats.compression_report(),
+        }
+
+    @staticmethod
+    def _generation_key(namespace: str) -> str:
+        return f"{namespace}:generation"
+
+    async def get_generations(self, namespaces: Sequence[str]) -> list[int]:
+        if not self.redis or not namespaces:
+            return [0] * len(namespaces)
+        values = await self.redis.mget([self._generation_key(ns) for ns in namespaces])
+        return [int(value) if value else 0 for value in values]
+
+    async def data_version(self, tags: Sequence[str]) -> Optional[str]:
+        if not self.redis:
+            return None
+        epoch, *generations = await self.redis.mget(
+            [EPOCH_KEY, *[self._generation_key(tag) for tag in tags]]
+        )
+        if epoch is None:
+            await self.redis.set(EPOCH_KEY, secrets.token_hex(8), nx=True)
+            epoch = await self.redis.get(EPOCH_KEY)
+        return f"{epoch.decode()}:{'.'.join(str(int(generation or 0)) for generation in generations)}"
+
+    async def tagged_key(self, key: str, tags: Sequence[str]) -> str:
+        generations = await self.get_generations(tags)
+        return f"{key}:g{'.'.join(str(generation) for generation in generations)}"
+
+    async def invalidate_tags(self, *tags: str) -> bool:
+        if not self.redis:
+            return False
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(self._generation_key(tag))
+            await pipe.execute()
+        return True
+
+    @staticmethod
+    def _wrap(payload: bytes, soft_ttl: timedelta) -> bytes:
+        return b"%.3f|%b" % (time.time() + soft_ttl.total_seconds(), payload)
+
+    @staticmethod
+    def _unwrap(value: bytes) -> Optional[tuple[float, bytes]]:
+        fresh_until, separator, payload = value.partition(b"|")
+        if not separator:
+            return None
+        try:
+            return float(fresh_until), payload
+        except ValueError:
+            return None
+
+    async def _acquire_lock(self, key: str) -> Optional[str]:
+        token = secrets.token_hex(8)
+        acquired = await self.redis.set(
+            f"{key}:lock", token, nx=True, px=settings.CACHE_LOCK_TIMEOUT_MS
+        )
+        return token if acquired else None
+
+    async def _release_lock(self, key: str, token: str):
+        await self.redis.eval(RELEASE_LOCK_SCRIPT, 1, f"{key}:lock", token)
+
+    async def _wait_for_value(self, key: str) -> Optional[bytes]:
+        attempts = settings.CACHE_LOCK_TIMEOUT_MS // settings.CACHE_LOCK_POLL_MS
+        for _ in range(attempts):
+            await asyncio.sleep(settings.CACHE_LOCK_POLL_MS / 1000)
+            value = await self.redis.get(key)
+            if value is not None:
+                entry = self._unwrap(self.decode(value))
+                if entry:
+                    return entry[1]
+            elif not await self.redis.exists(f"{key}:lock"):
+                return None
         return None
 
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[bytes]],
+        soft_ttl: timedelta,
+        hard_ttl: timedelta,
+        wait_for_lock: bool,
+    ) -> Optional[bytes]:
+        token = await self._acquire_lock(key)
+        if not token:
+            if not wait_for_lock:
+                return None
+            payload = await self._wait_for_value(key)
+            if payload is not None:
+                return payload
+
+        try:
+            payload = await loader()
+            await self.set_bytes(key, self._wrap(payload, soft_ttl), hard_ttl, local=True)
+            return payload
+        finally:
+            if token:
+                await self._release_lock(key, token)
+
+    async def _single_flight(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[bytes]],
+        soft_ttl: timedelta,
+        hard_ttl: timedelta,
+        wait_for_lock: bool = True,
+    ) -> Optional[bytes]:
+        inflight = self._inflight.get(key)
+        if inflight:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+            return await self._single_flight(key, loader, soft_ttl, hard_ttl, wait_for_lock)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            payload = await self._load(key, loader, soft_ttl, hard_ttl, wait_for_lock)
+            future.set_result(payload)
+            return payload
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            self._inflight.pop(key, None)
+
+    async def _refresh(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[bytes]],
+        soft_ttl: timedelta,
+        hard_ttl: timedelta,
+    ):
+        try:
+            await self._single_flight(key, loader, soft_ttl, hard_ttl, wait_for_lock=False)
+        except Exception:
+            logger.exception(f"Ошибка фонового обновления кэша: {key}")
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[bytes]],
+        soft_ttl: timedelta,
+        hard_ttl: timedelta,
+    ) -> bytes:
+        if not self.redis:
+            return await loader()
+
+        value = await self.get_bytes(key, local=True)
+        entry = self._unwrap(value) if value is not None else None
+        if entry:
+            fresh_until, payload = entry
+            if fresh_until < time.time() and key not in self._inflight:
+                self.stats.record("swr", key, "stale")
+                task = asyncio.create_task(self._refresh(key, loader, soft_ttl, hard_ttl))
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+            return payload
+
+        return await self._single_flight(key, loader, soft_ttl, hard_ttl)
+
+    async def get_json(self, key: str) -> Optional[dict]:
+        value = await self.get_bytes(key)
+        if not value:
+            return None
+        if value.startswith(MSGPACK_MARKER):
+            if msgpack is None:
+                return None
+            return msgpack.unpackb(value[1:])
+        return json.loads(value)
+
     async def set_json(
         self,
         key: str,
         value: dict,
         expire: Optional[timedelta] = None,
     ) -> bool:
+        if self.json_codec == "msgpack":
+            return await self.set_bytes(key, MSGPACK_MARKER + msgpack.packb(value), expire)
         return await self.set(key, json.dumps(value), expire)
 
 
 cache_service = CacheService()
+
+
+def cached(
+    key: str,
+    ttl: timedelta,
+    model: Any,
+    tags: Sequence[str] = (),
+    soft_ttl: Optional[timedelta] = None,
+):
+    adapter = TypeAdapter(model)
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        async def payload(*args, **kwargs) -> Optional[bytes]:
+            if not cache_service.redis:
+                return None
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            cache_key = await cache_service.tagged_key(
+                key.format(**arguments),
+                [tag.format(**arguments) for tag in tags],
+            )
+
+            async def loader() -> bytes:
+                async with session_scope() as session:
+                    result = await func(**{**arguments, "db": session})
+                    value = adapter.validate_python(result, from_attributes=True)
+                return adapter.dump_json(value)
+
+            return await cache_service.get_or_load(
+                cache_key, loader, soft_ttl=soft_ttl or ttl, hard_ttl=ttl
+            )
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cached_payload = await payload(*args, **kwargs)
+            if cached_payload is None:
+                return adapter.validate_python(await func(*args, **kwargs), from_attributes=True)
+            return adapter.validate_json(cached_payload)
+
+        async def raw(*args, **kwargs) -> bytes:
+            cached_payload = await payload(*args, **kwargs)
+            if cached_payload is None:
+                value = adapter.validate_python(await func(*args, **kwargs), from_attributes=True)
+                return adapter.dump_json(value)
+            return cached_payload
+
+        wrapper.raw = raw
+        return wrapper
+
+    return decorator
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -9,10 +10,65 @@ class Settings(BaseSettings):
     
     DATABASE_URL: str
     REDIS_URL: str
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 1.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_SCAN_BATCH_SIZE: int = 500
     
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_MAX_ITEMS: int = 50000
+    
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    
+    CACHE_L1_ENABLED: bool = True
+    CACHE_L1_MAX_ITEMS: int = 10000
+    CACHE_L1_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_L1_TTL_SECONDS: int = 30
+    
+    CACHE_COMPRESSION: str = "zlib"
+    CACHE_COMPRESSION_MIN_BYTES: int = 1024
+    CACHE_COMPRESSION_LEVEL: Optional[int] = None
+    CACHE_JSON_CODEC: str = "msgpack"
+    
+    CACHE_LOCK_TIMEOUT_MS: int = 5000
+    CACHE_LOCK_POLL_MS: int = 50
+    
+    WORKOUTS_CACHE_TTL_SECONDS: int = 6 * 3600
+    WORKOUTS_CACHE_SOFT_TTL_SECONDS: int = 15 * 60
+    STATS_CACHE_TTL_SECONDS: int = 6 * 3600
+    STATS_CACHE_SOFT_TTL_SECONDS: int = 5 * 60
+    STATS_SERIES_MAX_DAYS: int = 1096
+    GOALS_CACHE_TTL_SECONDS: int = 6 * 3600
+    GOAL_PROGRESS_CACHE_SOFT_TTL_SECONDS: int = 5 * 60
+    
+    WORKOUT_BATCH_MAX_ITEMS: int = 5000
+    IMPORT_READ_CHUNK_BYTES: int = 64 * 1024
+    IMPORT_CHUNK_ROWS: int = 1000
+    IMPORT_QUEUE_CHUNKS: int = 2
+    IMPORT_MAX_REPORTED_ERRORS: int = 100
+    IMPORT_MAX_RECORD_LENGTH: int = 64 * 1024
+    EXPORT_CHUNK_ROWS: int = 1000
+    RECALCULATION_CHUNK_ROWS: int = 2000
+    ROLLUP_REBUILD_CHUNK_USERS: int = 500
+    RECORDS_BACKFILL_CHUNK_USERS: int = 500
+    RECORDS_BACKFILL_CONCURRENCY: int = 4
+    GOAL_EVALUATION_CHUNK_GOALS: int = 5000
+    GOAL_EVALUATION_INTERVAL_SECONDS: int = 15 * 60
+    WORKOUT_SAMPLES_MAX: int = 24 * 3600
+    TRACK_MAX_POINTS: int = 500_000
+    TRACK_MOVING_SPEED_KMH: float = 1.0
+    LEADERBOARD_RETENTION_DAYS: int = 28
+    LEADERBOARD_REBUILD_CHUNK_USERS: int = 5000
+    LEADERBOARD_MIN_SCORE: float = 1e-6
+    LEADERBOARD_MAX_LIMIT: int = 100
+    LEADERBOARD_MAX_RADIUS: int = 50
+    
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ITEMS: int = 10000
     
     class Config:
         env_file = ".env"
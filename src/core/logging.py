@@ -5,13 +5,15 @@ from pathlib import Path
 
 def setup_logging():
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    log_file = Path("logs/app.log")
+    log_file.parent.mkdir(exist_ok=True)
     
     logging.basicConfig(
         level=logging.INFO,
         format=log_format,
         handlers=[
             logging.StreamHandler(sys.stdout),
-            logging.FileHandler(Path("logs/app.log"), encoding="utf-8"),
+            logging.FileHandler(log_file, encoding="utf-8"),
         ],
     )
 
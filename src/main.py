@@ -1,13 +1,20 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from src.core.config import settings
 from src.core.cache import cache_service
+from src.core.security import PasswordHasherBusyError, password_hasher, token_cache
 from src.core.logging import setup_logging, get_logger
+from src.services.user_service import principal_cache, principal_cache_stats
+from src.services.goal_evaluator import GoalEvaluator, goal_evaluation_stats
 from src.api.v1.users import router as users_router
 from src.api.v1.workouts import router as workouts_router
 from src.api.v1.goals import router as goals_router
+from src.api.v1.leaderboards import router as leaderboards_router
 from pathlib import Path
+import asyncio
+import contextlib
 
 
 Path("logs").mkdir(exist_ok=True)
@@ -20,12 +27,24 @@ async def lifespan(app: FastAPI):
     logger.info("Запуск приложения TrackFit Pro API")
     await cache_service.connect()
     logger.info("Подключение к Redis успешно")
+    logger.info(
+        f"Кодеки кэша: сжатие {cache_service.codec.name}, JSON {cache_service.json_codec}"
+    )
+    
+    goal_evaluator = None
+    if settings.GOAL_EVALUATION_INTERVAL_SECONDS > 0:
+        goal_evaluator = asyncio.create_task(GoalEvaluator.run_periodically())
     
     yield
     
     logger.info("Остановка приложения TrackFit Pro API")
+    if goal_evaluator:
+        goal_evaluator.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await goal_evaluator
     await cache_service.disconnect()
     logger.info("Отключение от Redis")
+    password_hasher.shutdown()
 
 
 app = FastAPI(
@@ -45,9 +64,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusyError):
+    logger.warning(
+        f"Пул хэширования паролей перегружен: {password_hasher.pending} задач в очереди"
+    )
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Сервис временно перегружен, повторите попытку позже"},
+        headers={"Retry-After": "1"},
+    )
+
+
 app.include_router(users_router, prefix=settings.API_V1_PREFIX)
 app.include_router(workouts_router, prefix=settings.API_V1_PREFIX)
 app.include_router(goals_router, prefix=settings.API_V1_PREFIX)
+app.include_router(leaderboards_router, prefix=settings.API_V1_PREFIX)
 
 
 @app.get("/")
@@ -63,3 +96,16 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "cache": cache_service.get_stats(),
+        "token_cache": token_cache.stats(),
+        "principal_cache": {
+            **principal_cache.stats(),
+            **principal_cache_stats,
+        },
+        "goal_evaluator": goal_evaluation_stats,
+    }
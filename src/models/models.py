@@ -1,5 +1,5 @@
-from datetime import datetime
-from sqlalchemy import String, Integer, Float, DateTime, Enum, ForeignKey, Index
+from datetime import date, datetime
+from sqlalchemy import String, Integer, Float, Date, DateTime, Enum, ForeignKey, Index, LargeBinary
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.core.database import Base
 import enum
@@ -42,6 +42,12 @@ class User(Base):
     goals: Mapped[List["Goal"]] = relationship(
         "Goal", back_populates="user", cascade="all, delete-orphan"
     )
+    daily_rollups: Mapped[List["WorkoutDailyRollup"]] = relationship(
+        "WorkoutDailyRollup", cascade="all, delete-orphan"
+    )
+    personal_records: Mapped[List["PersonalRecord"]] = relationship(
+        "PersonalRecord", cascade="all, delete-orphan"
+    )
 
 
 class Workout(Base):
@@ -71,13 +77,60 @@ class Workout(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
     user: Mapped["User"] = relationship("User", back_populates="workouts")
+    samples: Mapped["WorkoutSamples"] = relationship(
+        "WorkoutSamples", uselist=False, cascade="all, delete-orphan"
+    )
     
     __table_args__ = (
-        Index("ix_workouts_user_started", "user_id", "started_at"),
+        Index("ix_workouts_user_started", "user_id", "started_at", "id"),
+        Index("ix_workouts_user_type_started", "user_id", "workout_type", "started_at", "id"),
         Index("ix_workouts_type_started", "workout_type", "started_at"),
     )
 
 
+class WorkoutSamples(Base):
+    __tablename__ = "workout_samples"
+    
+    workout_id: Mapped[int] = mapped_column(Integer, ForeignKey("workouts.id"), primary_key=True)
+    interval_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=1.0)
+    sample_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    
+    heart_rate: Mapped[bytes] = mapped_column(LargeBinary, nullable=True)
+    speed_kmh: Mapped[bytes] = mapped_column(LargeBinary, nullable=True)
+    cadence: Mapped[bytes] = mapped_column(LargeBinary, nullable=True)
+    
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class WorkoutDailyRollup(Base):
+    __tablename__ = "workout_daily_rollups"
+    
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    workout_type: Mapped[WorkoutType] = mapped_column(Enum(WorkoutType), primary_key=True)
+    
+    workout_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_duration_minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    total_distance_km: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    total_calories: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    heart_rate_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    heart_rate_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class PersonalRecord(Base):
+    __tablename__ = "personal_records"
+    
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), primary_key=True)
+    record_type: Mapped[str] = mapped_column(String(32), primary_key=True)
+    
+    value: Mapped[float] = mapped_column(Float, nullable=False)
+    workout_id: Mapped[int] = mapped_column(Integer, ForeignKey("workouts.id"), nullable=True)
+    achieved_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
 class Goal(Base):
     __tablename__ = "goals"
     
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    username: Optional[str]
+    score: float
+
+
+class Leaderboard(BaseModel):
+    metric: str
+    period: str
+    total: int
+    entries: List[LeaderboardEntry]
+
+
+class LeaderboardPosition(BaseModel):
+    metric: str
+    period: str
+    total: int
+    rank: Optional[int]
+    score: Optional[float]
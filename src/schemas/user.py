@@ -37,6 +37,15 @@ class UserResponse(UserBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserPrincipal(BaseModel):
+    id: int
+    is_active: bool
+    weight: Optional[float] = None
+    height: Optional[float] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
 class UserLogin(BaseModel):
     username: str
     password: str
@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field, ConfigDict
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
 from src.models.models import WorkoutType
+from src.core.config import settings
 
 
 class WorkoutBase(BaseModel):
@@ -46,6 +47,46 @@ class WorkoutResponse(WorkoutBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class WorkoutBatchCreate(BaseModel):
+    workouts: List[Dict[str, Any]] = Field(
+        ..., min_length=1, max_length=settings.WORKOUT_BATCH_MAX_ITEMS
+    )
+
+
+class WorkoutBatchItemError(BaseModel):
+    index: int
+    errors: List[str]
+
+
+class WorkoutBatchResult(BaseModel):
+    created: int
+    workout_ids: List[int]
+    errors: List[WorkoutBatchItemError]
+
+
+class WorkoutImportProgress(BaseModel):
+    rows_read: int = 0
+    imported: int = 0
+    failed: int = 0
+    next_row: int = 0
+    completed: bool = False
+    error: Optional[str] = None
+    errors: List[WorkoutBatchItemError] = []
+
+
+class CalorieRecalculationProgress(BaseModel):
+    status: str = "running"
+    total: int = 0
+    processed: int = 0
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class WorkoutPage(BaseModel):
+    items: List[WorkoutResponse]
+    next_cursor: Optional[str] = None
+
+
 class WorkoutStats(BaseModel):
     total_workouts: int
     total_duration_minutes: float
@@ -53,3 +94,78 @@ class WorkoutStats(BaseModel):
     total_calories_burned: float
     average_heart_rate: Optional[float]
     favorite_workout_type: Optional[str]
+
+
+class WorkoutTotals(BaseModel):
+    total_workouts: int
+    total_duration_minutes: float
+    total_distance_km: float
+    total_calories_burned: float
+
+
+class WorkoutStatsBucket(WorkoutTotals):
+    start: date
+    by_type: Dict[str, WorkoutTotals]
+
+
+class WorkoutStatsSeries(BaseModel):
+    bucket: str
+    date_from: date
+    date_to: date
+    buckets: List[WorkoutStatsBucket]
+
+
+class WorkoutSamplesCreate(BaseModel):
+    interval_seconds: float = Field(1.0, gt=0, le=60)
+    heart_rate: Optional[List[int]] = None
+    speed_kmh: Optional[List[float]] = None
+    cadence: Optional[List[int]] = None
+
+
+class WorkoutSamplesResponse(WorkoutSamplesCreate):
+    workout_id: int
+    sample_count: int
+
+
+class WorkoutSamplesSummary(BaseModel):
+    workout_id: int
+    sample_count: int
+    stored_bytes: int
+
+
+class HeartRateZonesResponse(BaseModel):
+    workout_id: int
+    max_heart_rate: int
+    zones: Dict[str, Dict[str, int]]
+    seconds_in_zone: Dict[str, float]
+
+
+class TrackSplit(BaseModel):
+    km: int
+    duration_seconds: float
+
+
+class TrackSummary(BaseModel):
+    points: int
+    started_at: datetime
+    distance_km: float
+    elapsed_minutes: float
+    moving_minutes: float
+    avg_moving_speed_kmh: Optional[float]
+    average_heart_rate: Optional[int]
+    max_heart_rate: Optional[int]
+    splits: List[TrackSplit]
+
+
+class WorkoutTrackImportResult(BaseModel):
+    workout: WorkoutResponse
+    track: TrackSummary
+
+
+class PersonalRecordResponse(BaseModel):
+    record_type: str
+    value: float
+    workout_id: Optional[int]
+    achieved_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
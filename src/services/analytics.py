@@ -1,4 +1,9 @@
 from src.models.models import WorkoutType
+from typing import Dict, Optional
+import numpy as np
+
+
+WORKOUT_TYPE_CODES = {workout_type: code for code, workout_type in enumerate(WorkoutType)}
 
 
 class TrainingConstants:
@@ -28,6 +33,55 @@ class CalorieCalculator:
     YOGA_MET = 2.5
     DEFAULT_MET = 5.0
     
+    BASE_METS = {
+        WorkoutType.RUNNING: RUNNING_MET,
+        WorkoutType.WALKING: WALKING_MET,
+        WorkoutType.SWIMMING: SWIMMING_MET,
+        WorkoutType.CYCLING: CYCLING_MET,
+        WorkoutType.STRENGTH: STRENGTH_MET,
+        WorkoutType.YOGA: YOGA_MET,
+        WorkoutType.OTHER: DEFAULT_MET,
+    }
+    
+    SPEED_MET_TIERS = {
+        WorkoutType.RUNNING: ([8, 10, 12, 14], [8.0, 9.8, 11.0, 11.8, 14.5]),
+        WorkoutType.WALKING: ([4, 5, 6], [2.8, 3.5, 4.3, 5.0]),
+        WorkoutType.CYCLING: ([16, 20, 25], [4.0, 6.8, 8.0, 10.0]),
+    }
+    
+    @staticmethod
+    def calculate_met_batch(type_codes: np.ndarray, avg_speeds_kmh: np.ndarray) -> np.ndarray:
+        type_codes = np.asarray(type_codes)
+        speeds = np.asarray(avg_speeds_kmh, dtype=np.float64)
+        
+        base_mets = np.array(
+            [CalorieCalculator.BASE_METS[workout_type] for workout_type in WorkoutType]
+        )
+        met = base_mets[type_codes]
+        has_speed = np.isfinite(speeds) & (speeds != 0)
+        
+        for workout_type, (thresholds, tier_mets) in CalorieCalculator.SPEED_MET_TIERS.items():
+            mask = has_speed & (type_codes == WORKOUT_TYPE_CODES[workout_type])
+            if mask.any():
+                tiers = np.searchsorted(thresholds, speeds[mask], side="right")
+                met[mask] = np.asarray(tier_mets)[tiers]
+        
+        return met
+    
+    @staticmethod
+    def calculate_calories_batch(
+        type_codes: np.ndarray,
+        durations_minutes: np.ndarray,
+        weights_kg: np.ndarray,
+        avg_speeds_kmh: np.ndarray,
+    ) -> np.ndarray:
+        met = CalorieCalculator.calculate_met_batch(type_codes, avg_speeds_kmh)
+        duration_hours = np.asarray(durations_minutes, dtype=np.float64) / 60
+        weights = np.asarray(weights_kg, dtype=np.float64)
+        
+        calories = np.round(met * weights * duration_hours, 2)
+        return np.where(np.isfinite(weights) & (weights != 0), calories, np.nan)
+    
     @staticmethod
     def calculate_calories(
         workout_type: WorkoutType,
@@ -35,65 +89,16 @@ class CalorieCalculator:
         weight_kg: float,
         avg_speed_kmh: float = None,
     ) -> float:
-        met_values = {
-            WorkoutType.RUNNING: CalorieCalculator._get_running_met(avg_speed_kmh),
-            WorkoutType.WALKING: CalorieCalculator._get_walking_met(avg_speed_kmh),
-            WorkoutType.SWIMMING: CalorieCalculator.SWIMMING_MET,
-            WorkoutType.CYCLING: CalorieCalculator._get_cycling_met(avg_speed_kmh),
-            WorkoutType.STRENGTH: CalorieCalculator.STRENGTH_MET,
-            WorkoutType.YOGA: CalorieCalculator.YOGA_MET,
-            WorkoutType.OTHER: CalorieCalculator.DEFAULT_MET,
-        }
-        
-        met = met_values.get(workout_type, CalorieCalculator.DEFAULT_MET)
+        met = float(
+            CalorieCalculator.calculate_met_batch(
+                np.array([WORKOUT_TYPE_CODES.get(workout_type, WORKOUT_TYPE_CODES[WorkoutType.OTHER])]),
+                np.array([avg_speed_kmh or np.nan]),
+            )[0]
+        )
         duration_hours = duration_minutes / 60
         calories = met * weight_kg * duration_hours
         
         return round(calories, 2)
-    
-    @staticmethod
-    def _get_running_met(avg_speed_kmh: float = None) -> float:
-        if not avg_speed_kmh:
-            return CalorieCalculator.RUNNING_MET
-        
-        if avg_speed_kmh < 8:
-            return 8.0
-        elif avg_speed_kmh < 10:
-            return 9.8
-        elif avg_speed_kmh < 12:
-            return 11.0
-        elif avg_speed_kmh < 14:
-            return 11.8
-        else:
-            return 14.5
-    
-    @staticmethod
-    def _get_walking_met(avg_speed_kmh: float = None) -> float:
-        if not avg_speed_kmh:
-            return CalorieCalculator.WALKING_MET
-        
-        if avg_speed_kmh < 4:
-            return 2.8
-        elif avg_speed_kmh < 5:
-            return 3.5
-        elif avg_speed_kmh < 6:
-            return 4.3
-        else:
-            return 5.0
-    
-    @staticmethod
-    def _get_cycling_met(avg_speed_kmh: float = None) -> float:
-        if not avg_speed_kmh:
-            return CalorieCalculator.CYCLING_MET
-        
-        if avg_speed_kmh < 16:
-            return 4.0
-        elif avg_speed_kmh < 20:
-            return 6.8
-        elif avg_speed_kmh < 25:
-            return 8.0
-        else:
-            return 10.0
 
 
 class WorkoutAnalytics:
@@ -135,6 +140,63 @@ class WorkoutAnalytics:
         steps = distance_km / step_length
         return int(steps)
     
+    @staticmethod
+    def calculate_batch(
+        type_codes: np.ndarray,
+        durations_minutes: np.ndarray,
+        distances_km: np.ndarray,
+        weights_kg: np.ndarray,
+        steps: Optional[np.ndarray] = None,
+        pool_lengths_m: Optional[np.ndarray] = None,
+        pool_laps: Optional[np.ndarray] = None,
+    ) -> Dict[str, np.ndarray]:
+        type_codes = np.asarray(type_codes)
+        size = len(type_codes)
+        missing = np.full(size, np.nan)
+        durations = np.asarray(durations_minutes, dtype=np.float64)
+        distances = np.asarray(distances_km, dtype=np.float64)
+        steps = missing if steps is None else np.asarray(steps, dtype=np.float64)
+        pool_lengths = missing if pool_lengths_m is None else np.asarray(pool_lengths_m, dtype=np.float64)
+        laps = missing if pool_laps is None else np.asarray(pool_laps, dtype=np.float64)
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            has_distance = np.isfinite(distances) & (distances != 0)
+            has_duration = np.isfinite(durations) & (durations > 0)
+            avg_speeds = np.where(
+                has_distance & has_duration,
+                np.round(distances / (durations / 60), 2),
+                np.nan,
+            )
+            
+            is_pool_swim = (
+                (type_codes == WORKOUT_TYPE_CODES[WorkoutType.SWIMMING])
+                & np.isfinite(pool_lengths) & (pool_lengths != 0)
+                & np.isfinite(laps) & (laps != 0)
+            )
+            distances = np.where(is_pool_swim, np.round(pool_lengths * laps / 1000, 3), distances)
+            
+            calories = CalorieCalculator.calculate_calories_batch(
+                type_codes, durations, weights_kg, avg_speeds
+            )
+            
+            step_lengths = np.zeros(len(WorkoutType))
+            step_lengths[WORKOUT_TYPE_CODES[WorkoutType.RUNNING]] = 0.00078
+            step_lengths[WORKOUT_TYPE_CODES[WorkoutType.WALKING]] = 0.00065
+            row_step_lengths = step_lengths[type_codes]
+            estimated_steps = np.where(
+                row_step_lengths > 0, np.trunc(distances / row_step_lengths), 0
+            )
+            has_steps = np.isfinite(steps) & (steps != 0)
+            needs_estimate = ~has_steps & np.isfinite(distances) & (distances != 0)
+            steps = np.where(needs_estimate, estimated_steps, steps)
+        
+        return {
+            "avg_speed_kmh": avg_speeds,
+            "distance_km": distances,
+            "calories_burned": calories,
+            "steps": steps,
+        }
+    
     @staticmethod
     def calculate_heart_rate_zones(max_hr: int) -> dict:
         return {
@@ -0,0 +1,89 @@
+from sqlalchemy import select, desc, and_
+from src.models.models import Workout
+from src.schemas.workout import WorkoutResponse
+from src.core.database import session_scope
+from src.core.config import settings
+from src.core.logging import get_logger
+from typing import AsyncIterator, Any, Optional
+from datetime import date, datetime, time, timedelta
+import enum
+import csv
+import io
+import json
+
+
+logger = get_logger(__name__)
+
+EXPORT_COLUMNS = list(WorkoutResponse.model_fields)
+
+
+class WorkoutExportService:
+    
+    @staticmethod
+    def _serialize_value(value: Any) -> Any:
+        if isinstance(value, enum.Enum):
+            return value.value
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+    
+    @staticmethod
+    def _write_ndjson(rows) -> bytes:
+        buffer = io.StringIO()
+        for row in rows:
+            record = {
+                column: WorkoutExportService._serialize_value(value)
+                for column, value in zip(EXPORT_COLUMNS, row)
+            }
+            buffer.write(json.dumps(record, ensure_ascii=False))
+            buffer.write("\n")
+        return buffer.getvalue().encode()
+    
+    @staticmethod
+    def _write_csv(rows) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(
+                "" if value is None else WorkoutExportService._serialize_value(value)
+                for value in row
+            )
+        return buffer.getvalue().encode()
+    
+    @staticmethod
+    async def stream_workouts(
+        user_id: int,
+        file_format: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> AsyncIterator[bytes]:
+        logger.info(f"Экспорт тренировок ({file_format}) для пользователя: ID {user_id}")
+        
+        write = (
+            WorkoutExportService._write_csv
+            if file_format == "csv"
+            else WorkoutExportService._write_ndjson
+        )
+        
+        if file_format == "csv":
+            yield WorkoutExportService._write_csv([EXPORT_COLUMNS])
+        
+        filters = [Workout.user_id == user_id]
+        if date_from:
+            filters.append(Workout.started_at >= datetime.combine(date_from, time.min))
+        if date_to:
+            filters.append(Workout.started_at < datetime.combine(date_to + timedelta(days=1), time.min))
+        
+        exported = 0
+        async with session_scope() as session:
+            result = await session.stream(
+                select(*[Workout.__table__.c[column] for column in EXPORT_COLUMNS])
+                .where(and_(*filters))
+                .order_by(desc(Workout.started_at), desc(Workout.id))
+                .execution_options(yield_per=settings.EXPORT_CHUNK_ROWS)
+            )
+            async for partition in result.partitions():
+                exported += len(partition)
+                yield write(partition)
+        
+        logger.info(f"Экспорт завершен для пользователя ID {user_id}: {exported} тренировок")
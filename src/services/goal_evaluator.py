@@ -0,0 +1,178 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, and_, or_, case, cast, literal, Date
+from src.models.models import Goal, WorkoutDailyRollup
+from src.core.cache import cache_service
+from src.core.database import session_scope
+from src.core.config import settings
+from src.core.logging import get_logger
+from typing import List, Tuple
+from datetime import date, datetime
+import asyncio
+import time
+
+
+logger = get_logger(__name__)
+
+goal_evaluation_stats = {
+    "runs": 0,
+    "goals_evaluated": 0,
+    "goals_achieved": 0,
+    "last_run_at": None,
+    "last_duration_seconds": None,
+    "last_goals_per_second": None,
+}
+
+
+class GoalEvaluator:
+    
+    @staticmethod
+    def _window(db: AsyncSession, today: date):
+        if db.bind.dialect.name == "postgresql":
+            deadline_day = cast(Goal.deadline, Date)
+        else:
+            deadline_day = func.date(Goal.deadline)
+        
+        today = literal(today, Date)
+        end = case(
+            (and_(Goal.deadline.isnot(None), deadline_day < today), deadline_day),
+            else_=today,
+        )
+        
+        if db.bind.dialect.name == "postgresql":
+            return end - 6, end
+        return func.date(end, "-6 days"), end
+    
+    @staticmethod
+    async def evaluate_chunk(
+        db: AsyncSession, first_id: int, last_id: int, today: date
+    ) -> List[int]:
+        start, end = GoalEvaluator._window(db, today)
+        
+        achieved = (
+            select(Goal.id)
+            .join(
+                WorkoutDailyRollup,
+                and_(
+                    WorkoutDailyRollup.user_id == Goal.user_id,
+                    WorkoutDailyRollup.day >= start,
+                    WorkoutDailyRollup.day <= end,
+                ),
+            )
+            .where(
+                and_(
+                    Goal.id.between(first_id, last_id),
+                    Goal.is_achieved == False,
+                    or_(
+                        Goal.target_workouts_per_week.isnot(None),
+                        Goal.target_calories_per_week.isnot(None),
+                        Goal.target_distance_km.isnot(None),
+                    ),
+                )
+            )
+            .group_by(Goal.id)
+            .having(
+                and_(
+                    or_(
+                        Goal.target_workouts_per_week.is_(None),
+                        func.sum(WorkoutDailyRollup.workout_count) >= Goal.target_workouts_per_week,
+                    ),
+                    or_(
+                        Goal.target_calories_per_week.is_(None),
+                        func.sum(WorkoutDailyRollup.total_calories) >= Goal.target_calories_per_week,
+                    ),
+                    or_(
+                        Goal.target_distance_km.is_(None),
+                        func.sum(WorkoutDailyRollup.total_distance_km) >= Goal.target_distance_km,
+                    ),
+                )
+            )
+        )
+        
+        result = await db.execute(
+            update(Goal)
+            .where(Goal.id.in_(achieved))
+            .values(is_achieved=True, updated_at=datetime.utcnow())
+            .returning(Goal.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
+    
+    @staticmethod
+    async def _next_chunk(last_id: int) -> Tuple[int, int, int]:
+        async with session_scope() as session:
+            result = await session.execute(
+                select(Goal.id)
+                .where(and_(Goal.id > last_id, Goal.is_achieved == False))
+                .order_by(Goal.id)
+                .limit(settings.GOAL_EVALUATION_CHUNK_GOALS)
+            )
+            ids = list(result.scalars().all())
+        if not ids:
+            return 0, 0, 0
+        return ids[0], ids[-1], len(ids)
+    
+    @staticmethod
+    async def evaluate_all() -> dict:
+        logger.info("Оценка достижения активных целей")
+        
+        started = time.perf_counter()
+        today = datetime.utcnow().date()
+        evaluated = 0
+        achieved = 0
+        last_id = 0
+        
+        while True:
+            first_id, chunk_last_id, count = await GoalEvaluator._next_chunk(last_id)
+            if not count:
+                break
+            
+            async with session_scope() as session:
+                user_ids = await GoalEvaluator.evaluate_chunk(
+                    session, first_id, chunk_last_id, today
+                )
+            
+            if user_ids:
+                await cache_service.invalidate_tags(
+                    *{f"user:{user_id}:goals" for user_id in user_ids}
+                )
+            
+            last_id = chunk_last_id
+            evaluated += count
+            achieved += len(user_ids)
+        
+        elapsed = time.perf_counter() - started
+        goal_evaluation_stats["runs"] += 1
+        goal_evaluation_stats["goals_evaluated"] += evaluated
+        goal_evaluation_stats["goals_achieved"] += achieved
+        goal_evaluation_stats["last_run_at"] = datetime.utcnow().isoformat()
+        goal_evaluation_stats["last_duration_seconds"] = round(elapsed, 3)
+        goal_evaluation_stats["last_goals_per_second"] = round(evaluated / elapsed, 1) if elapsed else None
+        
+        logger.info(
+            f"Оценка целей завершена: проверено {evaluated}, достигнуто {achieved}, "
+            f"{elapsed:.2f} с"
+        )
+        return {"evaluated": evaluated, "achieved": achieved, "duration_seconds": round(elapsed, 3)}
+    
+    @staticmethod
+    async def _claim_run() -> bool:
+        if not cache_service.redis:
+            return True
+        return bool(
+            await cache_service.redis.set(
+                "goals:evaluation:lock",
+                datetime.utcnow().isoformat(),
+                nx=True,
+                ex=settings.GOAL_EVALUATION_INTERVAL_SECONDS,
+            )
+        )
+    
+    @staticmethod
+    async def run_periodically():
+        while True:
+            await asyncio.sleep(settings.GOAL_EVALUATION_INTERVAL_SECONDS)
+            try:
+                if await GoalEvaluator._claim_run():
+                    await GoalEvaluator.evaluate_all()
+            except Exception:
+                logger.exception("Ошибка фоновой оценки целей")
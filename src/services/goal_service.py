@@ -1,9 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, desc
-from src.models.models import Goal, Workout
-from src.schemas.goal import GoalCreate, GoalUpdate, GoalProgress
-from typing import Optional, List
-from datetime import datetime, timedelta
+from src.models.models import Goal, WorkoutDailyRollup
+from src.schemas.goal import GoalCreate, GoalUpdate, GoalProgress, GoalResponse
+from src.core.cache import cached
+from src.core.config import settings
+from typing import Optional, List, Dict, Tuple
+from datetime import date, datetime, timedelta
 from src.core.logging import get_logger
 
 
@@ -42,9 +44,15 @@ class GoalService:
         return result.scalar_one_or_none()
     
     @staticmethod
+    @cached(
+        key="user:{user_id}:goals:{active_only}",
+        tags=["user:{user_id}:goals"],
+        model=List[GoalResponse],
+        ttl=timedelta(seconds=settings.GOALS_CACHE_TTL_SECONDS),
+    )
     async def get_user_goals(
         db: AsyncSession, user_id: int, active_only: bool = False
-    ) -> List[Goal]:
+    ) -> List[GoalResponse]:
         query = select(Goal).where(Goal.user_id == user_id)
         
         if active_only:
@@ -91,59 +99,124 @@ class GoalService:
         return True
     
     @staticmethod
-    async def get_goal_progress(
-        db: AsyncSession, goal_id: int, user_id: int
-    ) -> Optional[GoalProgress]:
-        logger.info(f"Получение прогресса цели: ID {goal_id}")
-        
-        goal = await GoalService.get_goal_by_id(db, goal_id, user_id)
-        if not goal:
-            return None
-        
-        start_date = datetime.utcnow() - timedelta(days=7)
-        
+    def _progress_window(goal: Goal, today: date) -> Tuple[date, date]:
+        end = min(today, goal.deadline.date()) if goal.deadline else today
+        return end - timedelta(days=6), end
+    
+    @staticmethod
+    async def _daily_totals(
+        db: AsyncSession, user_id: int, start: date, end: date
+    ) -> Dict[date, Tuple[int, float, float]]:
+        day = WorkoutDailyRollup.day
         result = await db.execute(
             select(
-                func.count(Workout.id).label("workout_count"),
-                func.coalesce(func.sum(Workout.calories_burned), 0).label("total_calories"),
-                func.coalesce(func.sum(Workout.distance_km), 0).label("total_distance"),
-            ).where(
+                day,
+                func.sum(WorkoutDailyRollup.workout_count),
+                func.sum(WorkoutDailyRollup.total_calories),
+                func.sum(WorkoutDailyRollup.total_distance_km),
+            )
+            .where(
                 and_(
-                    Workout.user_id == user_id,
-                    Workout.started_at >= start_date,
+                    WorkoutDailyRollup.user_id == user_id,
+                    day >= start,
+                    day <= end,
                 )
             )
+            .group_by(day)
         )
-        
-        stats = result.one()
+        return {row[0]: tuple(row[1:]) for row in result.all()}
+    
+    @staticmethod
+    def _evaluate(goal: Goal, daily: Dict[date, Tuple[int, float, float]], today: date) -> GoalProgress:
+        start, end = GoalService._progress_window(goal, today)
+        workout_count, total_calories, total_distance = 0, 0.0, 0.0
+        for day, (count, calories, distance) in daily.items():
+            if start <= day <= end:
+                workout_count += count
+                total_calories += calories
+                total_distance += distance
         
         progress = 0.0
         is_on_track = True
         
         if goal.target_workouts_per_week:
-            workout_progress = (stats.workout_count / goal.target_workouts_per_week) * 100
+            workout_progress = (workout_count / goal.target_workouts_per_week) * 100
             progress = max(progress, workout_progress)
-            is_on_track = is_on_track and (stats.workout_count >= goal.target_workouts_per_week)
+            is_on_track = is_on_track and (workout_count >= goal.target_workouts_per_week)
         
         if goal.target_calories_per_week:
-            calorie_progress = (stats.total_calories / goal.target_calories_per_week) * 100
+            calorie_progress = (total_calories / goal.target_calories_per_week) * 100
             progress = max(progress, calorie_progress)
-            is_on_track = is_on_track and (stats.total_calories >= goal.target_calories_per_week)
+            is_on_track = is_on_track and (total_calories >= goal.target_calories_per_week)
         
         if goal.target_distance_km:
-            distance_progress = (stats.total_distance / goal.target_distance_km) * 100
+            distance_progress = (total_distance / goal.target_distance_km) * 100
             progress = max(progress, distance_progress)
-            is_on_track = is_on_track and (stats.total_distance >= goal.target_distance_km)
+            is_on_track = is_on_track and (total_distance >= goal.target_distance_km)
         
         return GoalProgress(
             goal_id=goal.id,
             goal_title=goal.title,
-            current_workouts=stats.workout_count,
+            current_workouts=workout_count,
             target_workouts=goal.target_workouts_per_week,
-            current_calories=float(stats.total_calories),
+            current_calories=float(total_calories),
             target_calories=goal.target_calories_per_week,
-            current_distance=float(stats.total_distance),
+            current_distance=float(total_distance),
             target_distance=goal.target_distance_km,
             progress_percentage=round(min(progress, 100), 2),
             is_on_track=is_on_track,
         )
+    
+    @staticmethod
+    @cached(
+        key="user:{user_id}:goals:{goal_id}:progress",
+        tags=["user:{user_id}:goals", "user:{user_id}:workouts"],
+        model=Optional[GoalProgress],
+        ttl=timedelta(seconds=settings.GOALS_CACHE_TTL_SECONDS),
+        soft_ttl=timedelta(seconds=settings.GOAL_PROGRESS_CACHE_SOFT_TTL_SECONDS),
+    )
+    async def get_goal_progress(
+        db: AsyncSession, goal_id: int, user_id: int
+    ) -> Optional[GoalProgress]:
+        logger.info(f"Получение прогресса цели: ID {goal_id}")
+        
+        goal = await GoalService.get_goal_by_id(db, goal_id, user_id)
+        if not goal:
+            return None
+        
+        today = datetime.utcnow().date()
+        start, end = GoalService._progress_window(goal, today)
+        daily = await GoalService._daily_totals(db, user_id, start, end)
+        
+        return GoalService._evaluate(goal, daily, today)
+    
+    @staticmethod
+    @cached(
+        key="user:{user_id}:goals:progress",
+        tags=["user:{user_id}:goals", "user:{user_id}:workouts"],
+        model=List[GoalProgress],
+        ttl=timedelta(seconds=settings.GOALS_CACHE_TTL_SECONDS),
+        soft_ttl=timedelta(seconds=settings.GOAL_PROGRESS_CACHE_SOFT_TTL_SECONDS),
+    )
+    async def get_goals_progress(db: AsyncSession, user_id: int) -> List[GoalProgress]:
+        logger.info(f"Получение прогресса всех активных целей пользователя: ID {user_id}")
+        
+        result = await db.execute(
+            select(Goal)
+            .where(and_(Goal.user_id == user_id, Goal.is_achieved == False))
+            .order_by(desc(Goal.created_at))
+        )
+        goals = list(result.scalars().all())
+        if not goals:
+            return []
+        
+        today = datetime.utcnow().date()
+        windows = [GoalService._progress_window(goal, today) for goal in goals]
+        daily = await GoalService._daily_totals(
+            db,
+            user_id,
+            min(start for start, _ in windows),
+            max(end for _, end in windows),
+        )
+        
+        return [GoalService._evaluate(goal, daily, today) for goal in goals]
@@ -0,0 +1,191 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import ValidationError
+from src.schemas.workout import WorkoutCreate, WorkoutBatchItemError, WorkoutImportProgress
+from src.services.workout_service import WorkoutService
+from src.services.leaderboard_service import LeaderboardService
+from src.core.config import settings
+from src.core.logging import get_logger
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+import asyncio
+import codecs
+import csv
+import json
+
+
+logger = get_logger(__name__)
+
+import_progress: Dict[int, WorkoutImportProgress] = {}
+
+
+class WorkoutImportService:
+    
+    @staticmethod
+    async def _read_lines(read: Callable[[int], Awaitable[bytes]]) -> AsyncIterator[str]:
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        buffer = ""
+        
+        while True:
+            chunk = await read(settings.IMPORT_READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            
+            buffer += decoder.decode(chunk)
+            lines = buffer.split("\n")
+            buffer = lines.pop()
+            for line in lines:
+                yield line + "\n"
+            
+            if len(buffer) > settings.IMPORT_MAX_RECORD_LENGTH:
+                raise ValueError(
+                    f"Строка длиннее {settings.IMPORT_MAX_RECORD_LENGTH} символов"
+                )
+        
+        buffer += decoder.decode(b"", final=True)
+        if buffer:
+            yield buffer
+    
+    @staticmethod
+    async def _parse_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[dict]:
+        async for line in lines:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {"__error__": f"Некорректная строка JSON: {e.msg}"}
+                continue
+            
+            if isinstance(row, dict):
+                yield row
+            else:
+                yield {"__error__": "Строка должна быть JSON-объектом"}
+    
+    @staticmethod
+    async def _parse_csv(lines: AsyncIterator[str]) -> AsyncIterator[dict]:
+        header = None
+        record = ""
+        
+        async for line in lines:
+            record += line
+            if record.count('"') % 2:
+                if len(record) > settings.IMPORT_MAX_RECORD_LENGTH:
+                    raise ValueError(
+                        f"Запись CSV длиннее {settings.IMPORT_MAX_RECORD_LENGTH} символов"
+                    )
+                continue
+            
+            values = next(csv.reader([record]), [])
+            record = ""
+            if not values:
+                continue
+            
+            if header is None:
+                header = [value.strip() for value in values]
+                continue
+            
+            yield {key: value for key, value in zip(header, values) if value != ""}
+        
+        if header is None:
+            raise ValueError("CSV файл не содержит заголовка")
+    
+    @staticmethod
+    async def _chunks(
+        rows: AsyncIterator[dict], start_row: int, progress: WorkoutImportProgress
+    ) -> AsyncIterator[Tuple[int, List[WorkoutCreate]]]:
+        chunk = []
+        row_number = -1
+        
+        async for row in rows:
+            row_number += 1
+            if row_number < start_row:
+                continue
+            
+            progress.rows_read += 1
+            try:
+                if "__error__" in row:
+                    raise ValueError(row["__error__"])
+                chunk.append(WorkoutCreate.model_validate(row))
+            except (ValidationError, ValueError) as e:
+                progress.failed += 1
+                if len(progress.errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+                    messages = (
+                        [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()]
+                        if isinstance(e, ValidationError)
+                        else [str(e)]
+                    )
+                    progress.errors.append(WorkoutBatchItemError(index=row_number, errors=messages))
+            
+            if len(chunk) >= settings.IMPORT_CHUNK_ROWS:
+                yield row_number + 1, chunk
+                chunk = []
+        
+        yield row_number + 1, chunk
+    
+    @staticmethod
+    async def import_workouts(
+        db: AsyncSession,
+        user_id: int,
+        read: Callable[[int], Awaitable[bytes]],
+        file_format: str,
+        start_row: int = 0,
+    ) -> WorkoutImportProgress:
+        logger.info(
+            f"Импорт тренировок ({file_format}) для пользователя: ID {user_id}, "
+            f"начиная со строки {start_row}"
+        )
+        
+        progress = WorkoutImportProgress(next_row=start_row)
+        import_progress[user_id] = progress
+        
+        lines = WorkoutImportService._read_lines(read)
+        if file_format == "csv":
+            rows = WorkoutImportService._parse_csv(lines)
+        else:
+            rows = WorkoutImportService._parse_ndjson(lines)
+        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.IMPORT_QUEUE_CHUNKS)
+        
+        async def produce():
+            try:
+                async for item in WorkoutImportService._chunks(rows, start_row, progress):
+                    await queue.put(item)
+            finally:
+                await queue.put(None)
+        
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                
+                next_row, chunk = item
+                if chunk:
+                    await WorkoutService.create_workouts_bulk(db, user_id, chunk)
+                    await db.commit()
+                    await LeaderboardService.publish(db)
+                    progress.imported += len(chunk)
+                progress.next_row = next_row
+                
+                logger.info(
+                    f"Импорт для пользователя ID {user_id}: прочитано {progress.rows_read}, "
+                    f"загружено {progress.imported}, ошибок {progress.failed}"
+                )
+            
+            await producer
+            progress.completed = True
+        except Exception as e:
+            await db.rollback()
+            LeaderboardService.discard(db)
+            if isinstance(e, ValueError) and not start_row and not progress.rows_read:
+                raise
+            progress.error = str(e)
+            logger.exception(
+                f"Импорт прерван для пользователя ID {user_id}, "
+                f"продолжить можно со строки {progress.next_row}"
+            )
+        finally:
+            if not producer.done():
+                producer.cancel()
+        
+        return progress
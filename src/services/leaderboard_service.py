@@ -0,0 +1,236 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_
+from src.models.models import User, WorkoutDailyRollup
+from src.core.cache import cache_service
+from src.core.database import session_scope
+from src.core.config import settings
+from src.core.logging import get_logger
+from typing import Dict, List, Optional, Tuple
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+import calendar
+
+
+logger = get_logger(__name__)
+
+METRICS = {
+    "distance": "total_distance_km",
+    "calories": "total_calories",
+    "workouts": "workout_count",
+}
+
+PERIODS = ("week", "month")
+
+DELTAS_KEY = "leaderboard_deltas"
+
+
+class LeaderboardService:
+    
+    @staticmethod
+    def period_bounds(period: str, day: date) -> Tuple[str, date, date]:
+        if period == "week":
+            year, week, _ = day.isocalendar()
+            start = day - timedelta(days=day.weekday())
+            return f"{year}-W{week:02d}", start, start + timedelta(days=6)
+        
+        start = day.replace(day=1)
+        end = day.replace(day=calendar.monthrange(day.year, day.month)[1])
+        return f"{day:%Y-%m}", start, end
+    
+    @staticmethod
+    def key(metric: str, period_id: str) -> str:
+        return f"leaderboard:{metric}:{period_id}"
+    
+    @staticmethod
+    def _expire_at(end: date) -> int:
+        expires = datetime.combine(end, time.max) + timedelta(days=settings.LEADERBOARD_RETENTION_DAYS)
+        return int(calendar.timegm(expires.timetuple()))
+    
+    @staticmethod
+    def record(db: AsyncSession, rows: List[dict]):
+        db.info.setdefault(DELTAS_KEY, []).extend(rows)
+    
+    @staticmethod
+    def discard(db: AsyncSession):
+        db.info.pop(DELTAS_KEY, None)
+    
+    @staticmethod
+    async def publish(db: AsyncSession):
+        rows = db.info.pop(DELTAS_KEY, None)
+        if not rows or not cache_service.redis:
+            return
+        
+        increments: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        expiry: Dict[str, int] = {}
+        for row in rows:
+            for period in PERIODS:
+                period_id, _, end = LeaderboardService.period_bounds(period, row["day"])
+                for metric, column in METRICS.items():
+                    if row[column]:
+                        key = LeaderboardService.key(metric, period_id)
+                        increments[key][str(row["user_id"])] += row[column]
+                        expiry[key] = LeaderboardService._expire_at(end)
+        
+        try:
+            async with cache_service.redis.pipeline(transaction=False) as pipe:
+                for key, members in increments.items():
+                    for member, amount in members.items():
+                        if amount:
+                            pipe.zincrby(key, amount, member)
+                    if any(amount < 0 for amount in members.values()):
+                        pipe.zremrangebyscore(key, "-inf", settings.LEADERBOARD_MIN_SCORE)
+                    pipe.expireat(key, expiry[key])
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Не удалось обновить рейтинги: {e}")
+    
+    @staticmethod
+    async def _usernames(db: AsyncSession, user_ids: List[int]) -> Dict[int, str]:
+        if not user_ids:
+            return {}
+        result = await db.execute(select(User.id, User.username).where(User.id.in_(user_ids)))
+        return dict(result.all())
+    
+    @staticmethod
+    async def _entries(db: AsyncSession, start_rank: int, members: list) -> List[dict]:
+        user_ids = [int(member) for member, _ in members]
+        usernames = await LeaderboardService._usernames(db, user_ids)
+        return [
+            {
+                "rank": start_rank + offset + 1,
+                "user_id": user_id,
+                "username": usernames.get(user_id),
+                "score": round(score, 3),
+            }
+            for offset, (user_id, (_, score)) in enumerate(zip(user_ids, members))
+        ]
+    
+    @staticmethod
+    async def top(
+        db: AsyncSession, metric: str, period: str, day: date, limit: int
+    ) -> dict:
+        period_id, _, _ = LeaderboardService.period_bounds(period, day)
+        key = LeaderboardService.key(metric, period_id)
+        async with cache_service.redis.pipeline(transaction=False) as pipe:
+            pipe.zrevrange(key, 0, limit - 1, withscores=True)
+            pipe.zcard(key)
+            members, total = await pipe.execute()
+        return {
+            "metric": metric,
+            "period": period_id,
+            "total": total,
+            "entries": await LeaderboardService._entries(db, 0, members),
+        }
+    
+    @staticmethod
+    async def _rank(key: str, user_id: int) -> Tuple[Optional[int], Optional[float], int]:
+        async with cache_service.redis.pipeline(transaction=False) as pipe:
+            pipe.zrevrank(key, str(user_id))
+            pipe.zscore(key, str(user_id))
+            pipe.zcard(key)
+            return tuple(await pipe.execute())
+    
+    @staticmethod
+    async def position(metric: str, period: str, day: date, user_id: int) -> dict:
+        period_id, _, _ = LeaderboardService.period_bounds(period, day)
+        rank, score, total = await LeaderboardService._rank(
+            LeaderboardService.key(metric, period_id), user_id
+        )
+        return {
+            "metric": metric,
+            "period": period_id,
+            "total": total,
+            "rank": None if rank is None else rank + 1,
+            "score": None if score is None else round(score, 3),
+        }
+    
+    @staticmethod
+    async def around(
+        db: AsyncSession, metric: str, period: str, day: date, user_id: int, radius: int
+    ) -> dict:
+        period_id, _, _ = LeaderboardService.period_bounds(period, day)
+        key = LeaderboardService.key(metric, period_id)
+        rank, _, total = await LeaderboardService._rank(key, user_id)
+        
+        entries = []
+        if rank is not None:
+            start = max(rank - radius, 0)
+            members = await cache_service.redis.zrevrange(key, start, rank + radius, withscores=True)
+            entries = await LeaderboardService._entries(db, start, members)
+        
+        return {
+            "metric": metric,
+            "period": period_id,
+            "total": total,
+            "entries": entries,
+        }
+    
+    @staticmethod
+    async def remove_user(user_id: int):
+        if not cache_service.redis:
+            return
+        async for key in cache_service.redis.scan_iter(
+            match="leaderboard:*", count=settings.REDIS_SCAN_BATCH_SIZE
+        ):
+            await cache_service.redis.zrem(key, str(user_id))
+    
+    @staticmethod
+    async def rebuild(period: str, day: date) -> int:
+        period_id, start, end = LeaderboardService.period_bounds(period, day)
+        logger.info(f"Пересборка рейтингов за период {period_id}")
+        
+        if not cache_service.redis:
+            raise ValueError("Redis недоступен")
+        
+        staging = {
+            metric: f"{LeaderboardService.key(metric, period_id)}:rebuild" for metric in METRICS
+        }
+        await cache_service.redis.delete(*staging.values())
+        
+        users = 0
+        filled = set()
+        async with session_scope() as session:
+            result = await session.stream(
+                select(
+                    WorkoutDailyRollup.user_id,
+                    *[
+                        func.sum(getattr(WorkoutDailyRollup, column)).label(metric)
+                        for metric, column in METRICS.items()
+                    ],
+                )
+                .where(
+                    and_(
+                        WorkoutDailyRollup.day >= start,
+                        WorkoutDailyRollup.day <= end,
+                    )
+                )
+                .group_by(WorkoutDailyRollup.user_id)
+                .execution_options(yield_per=settings.LEADERBOARD_REBUILD_CHUNK_USERS)
+            )
+            async for partition in result.partitions():
+                async with cache_service.redis.pipeline(transaction=False) as pipe:
+                    for metric, key in staging.items():
+                        scores = {
+                            str(row.user_id): float(getattr(row, metric))
+                            for row in partition
+                            if (getattr(row, metric) or 0) > settings.LEADERBOARD_MIN_SCORE
+                        }
+                        if scores:
+                            pipe.zadd(key, scores)
+                            filled.add(metric)
+                    await pipe.execute()
+                users += len(partition)
+        
+        expire_at = LeaderboardService._expire_at(end)
+        async with cache_service.redis.pipeline(transaction=True) as pipe:
+            for metric, staging_key in staging.items():
+                live_key = LeaderboardService.key(metric, period_id)
+                if metric in filled:
+                    pipe.rename(staging_key, live_key)
+                    pipe.expireat(live_key, expire_at)
+                else:
+                    pipe.delete(live_key)
+            await pipe.execute()
+        
+        logger.info(f"Рейтинги за период {period_id} пересобраны: {users} пользователей")
+        return users
@@ -0,0 +1,395 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, insert, func, and_, desc, asc
+from sqlalchemy.dialects import postgresql, sqlite
+from src.models.models import Workout, WorkoutType, WorkoutDailyRollup, PersonalRecord, User
+from src.services.rollup_service import RollupService
+from src.core.database import session_scope
+from src.core.config import settings
+from src.core.logging import get_logger
+from typing import Dict, Iterable, List, Optional
+from datetime import date, datetime, timedelta
+import asyncio
+
+
+logger = get_logger(__name__)
+
+WORKOUT_RECORDS = {
+    "fastest_1k": {"workout_type": WorkoutType.RUNNING, "distance_km": 1.0, "lower_is_better": True},
+    "fastest_5k": {"workout_type": WorkoutType.RUNNING, "distance_km": 5.0, "lower_is_better": True},
+    "fastest_10k": {"workout_type": WorkoutType.RUNNING, "distance_km": 10.0, "lower_is_better": True},
+    "longest_ride": {"workout_type": WorkoutType.CYCLING, "distance_km": None, "lower_is_better": False},
+}
+
+BIGGEST_WEEK = "biggest_week"
+
+
+class PersonalRecordService:
+    
+    @staticmethod
+    def snapshot(workout: Workout) -> dict:
+        return {
+            "id": workout.id,
+            "workout_type": workout.workout_type,
+            "distance_km": workout.distance_km,
+            "duration_minutes": workout.duration_minutes,
+            "started_at": workout.started_at,
+        }
+    
+    @staticmethod
+    def _candidate(record_type: str, workout: dict) -> Optional[float]:
+        definition = WORKOUT_RECORDS[record_type]
+        distance = workout["distance_km"]
+        if workout["workout_type"] != definition["workout_type"] or not distance:
+            return None
+        if definition["distance_km"] is None:
+            return distance
+        if distance < definition["distance_km"]:
+            return None
+        return workout["duration_minutes"] * definition["distance_km"] / distance
+    
+    @staticmethod
+    def _metric(record_type: str):
+        definition = WORKOUT_RECORDS[record_type]
+        if definition["distance_km"] is None:
+            return Workout.distance_km
+        return Workout.duration_minutes * definition["distance_km"] / Workout.distance_km
+    
+    @staticmethod
+    def _filter(record_type: str):
+        definition = WORKOUT_RECORDS[record_type]
+        return and_(
+            Workout.workout_type == definition["workout_type"],
+            Workout.distance_km >= (definition["distance_km"] or 0),
+            Workout.distance_km > 0,
+        )
+    
+    @staticmethod
+    def _is_better(record_type: str, value: float, current: Optional[PersonalRecord]) -> bool:
+        if current is None:
+            return True
+        if record_type in WORKOUT_RECORDS and WORKOUT_RECORDS[record_type]["lower_is_better"]:
+            return value < current.value
+        return value > current.value
+    
+    @staticmethod
+    def _week_start(moment: datetime) -> date:
+        day = moment.date()
+        return day - timedelta(days=day.weekday())
+    
+    @staticmethod
+    async def get_records(db: AsyncSession, user_id: int) -> List[PersonalRecord]:
+        result = await db.execute(
+            select(PersonalRecord)
+            .where(PersonalRecord.user_id == user_id)
+            .order_by(PersonalRecord.record_type)
+        )
+        return list(result.scalars().all())
+    
+    @staticmethod
+    def _insert(db: AsyncSession):
+        if db.bind.dialect.name == "postgresql":
+            return postgresql.insert(PersonalRecord)
+        return sqlite.insert(PersonalRecord)
+    
+    @staticmethod
+    async def _set(
+        db: AsyncSession,
+        records: Dict[str, PersonalRecord],
+        user_id: int,
+        record_type: str,
+        value: float,
+        workout_id: Optional[int],
+        achieved_at: datetime,
+    ):
+        record = records.get(record_type)
+        if record is not None:
+            record.value = value
+            record.workout_id = workout_id
+            record.achieved_at = achieved_at
+            return
+        
+        if record_type in WORKOUT_RECORDS and WORKOUT_RECORDS[record_type]["lower_is_better"]:
+            better = PersonalRecord.value > value
+        else:
+            better = PersonalRecord.value < value
+        
+        stmt = PersonalRecordService._insert(db).values(
+            user_id=user_id,
+            record_type=record_type,
+            value=value,
+            workout_id=workout_id,
+            achieved_at=achieved_at,
+            updated_at=datetime.utcnow(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "record_type"],
+            set_={
+                "value": stmt.excluded.value,
+                "workout_id": stmt.excluded.workout_id,
+                "achieved_at": stmt.excluded.achieved_at,
+                "updated_at": stmt.excluded.updated_at,
+            },
+            where=better,
+        )
+        await db.execute(stmt)
+        records[record_type] = await db.get(
+            PersonalRecord, (user_id, record_type), populate_existing=True
+        )
+    
+    @staticmethod
+    async def _week_distances(db: AsyncSession, user_id: int, weeks: set) -> Dict[date, float]:
+        week = RollupService.bucket_start(db, "week").label("week")
+        result = await db.execute(
+            select(week, func.sum(WorkoutDailyRollup.total_distance_km).label("total"))
+            .where(
+                and_(
+                    WorkoutDailyRollup.user_id == user_id,
+                    WorkoutDailyRollup.day >= min(weeks),
+                    WorkoutDailyRollup.day <= max(weeks) + timedelta(days=6),
+                )
+            )
+            .group_by(week)
+        )
+        totals = {date.fromisoformat(str(row.week)): float(row.total or 0) for row in result}
+        return {week_start: totals.get(week_start, 0.0) for week_start in weeks}
+    
+    @staticmethod
+    async def _recompute_workout_record(
+        db: AsyncSession, records: Dict[str, PersonalRecord], user_id: int, record_type: str
+    ):
+        metric = PersonalRecordService._metric(record_type)
+        order = asc if WORKOUT_RECORDS[record_type]["lower_is_better"] else desc
+        result = await db.execute(
+            select(Workout.id, Workout.started_at, metric.label("value"))
+            .where(and_(Workout.user_id == user_id, PersonalRecordService._filter(record_type)))
+            .order_by(order(metric), Workout.id)
+            .limit(1)
+        )
+        best = result.first()
+        
+        if best:
+            await PersonalRecordService._set(
+                db, records, user_id, record_type, best.value, best.id, best.started_at
+            )
+        elif record_type in records:
+            await db.delete(records.pop(record_type))
+    
+    @staticmethod
+    async def _recompute_biggest_week(
+        db: AsyncSession, records: Dict[str, PersonalRecord], user_id: int
+    ):
+        week = RollupService.bucket_start(db, "week").label("week")
+        total = func.sum(WorkoutDailyRollup.total_distance_km).label("total")
+        result = await db.execute(
+            select(week, total)
+            .where(WorkoutDailyRollup.user_id == user_id)
+            .group_by(week)
+            .order_by(desc(total), week)
+            .limit(1)
+        )
+        best = result.first()
+        
+        if best and best.total:
+            week_start = date.fromisoformat(str(best.week))
+            await PersonalRecordService._set(
+                db,
+                records,
+                user_id,
+                BIGGEST_WEEK,
+                float(best.total),
+                None,
+                datetime.combine(week_start, datetime.min.time()),
+            )
+        elif BIGGEST_WEEK in records:
+            await db.delete(records.pop(BIGGEST_WEEK))
+    
+    @staticmethod
+    async def _offer(
+        db: AsyncSession,
+        records: Dict[str, PersonalRecord],
+        user_id: int,
+        workouts: Iterable[dict],
+    ):
+        weeks = set()
+        for workout in workouts:
+            weeks.add(PersonalRecordService._week_start(workout["started_at"]))
+            for record_type in WORKOUT_RECORDS:
+                value = PersonalRecordService._candidate(record_type, workout)
+                if value is not None and PersonalRecordService._is_better(
+                    record_type, value, records.get(record_type)
+                ):
+                    await PersonalRecordService._set(
+                        db, records, user_id, record_type, value, workout["id"], workout["started_at"]
+                    )
+        
+        if not weeks:
+            return
+        
+        totals = await PersonalRecordService._week_distances(db, user_id, weeks)
+        for week_start, total in sorted(totals.items()):
+            if total and PersonalRecordService._is_better(BIGGEST_WEEK, total, records.get(BIGGEST_WEEK)):
+                await PersonalRecordService._set(
+                    db,
+                    records,
+                    user_id,
+                    BIGGEST_WEEK,
+                    total,
+                    None,
+                    datetime.combine(week_start, datetime.min.time()),
+                )
+    
+    @staticmethod
+    async def _load(db: AsyncSession, user_id: int) -> Dict[str, PersonalRecord]:
+        return {
+            record.record_type: record
+            for record in await PersonalRecordService.get_records(db, user_id)
+        }
+    
+    @staticmethod
+    async def on_created(db: AsyncSession, user_id: int, workouts: List[dict]):
+        records = await PersonalRecordService._load(db, user_id)
+        await PersonalRecordService._offer(db, records, user_id, workouts)
+    
+    @staticmethod
+    async def on_updated(db: AsyncSession, user_id: int, before: dict, after: dict):
+        records = await PersonalRecordService._load(db, user_id)
+        
+        for record_type in WORKOUT_RECORDS:
+            record = records.get(record_type)
+            if record and record.workout_id == before["id"]:
+                await PersonalRecordService._recompute_workout_record(db, records, user_id, record_type)
+        
+        week = records.get(BIGGEST_WEEK)
+        if week and week.achieved_at.date() == PersonalRecordService._week_start(before["started_at"]):
+            await PersonalRecordService._recompute_biggest_week(db, records, user_id)
+        
+        await PersonalRecordService._offer(db, records, user_id, [after])
+    
+    @staticmethod
+    async def release(db: AsyncSession, user_id: int, workout_id: int) -> List[str]:
+        result = await db.execute(
+            delete(PersonalRecord)
+            .where(and_(PersonalRecord.user_id == user_id, PersonalRecord.workout_id == workout_id))
+            .returning(PersonalRecord.record_type)
+            .execution_options(synchronize_session="fetch")
+        )
+        return list(result.scalars().all())
+    
+    @staticmethod
+    async def on_deleted(db: AsyncSession, user_id: int, workout: dict, released: List[str]):
+        records = await PersonalRecordService._load(db, user_id)
+        
+        for record_type in released:
+            await PersonalRecordService._recompute_workout_record(db, records, user_id, record_type)
+        
+        week = records.get(BIGGEST_WEEK)
+        if week and week.achieved_at.date() == PersonalRecordService._week_start(workout["started_at"]):
+            await PersonalRecordService._recompute_biggest_week(db, records, user_id)
+    
+    @staticmethod
+    async def rebuild(db: AsyncSession, user_ids: List[int]):
+        await db.execute(delete(PersonalRecord).where(PersonalRecord.user_id.in_(user_ids)))
+        
+        rows = []
+        for record_type, definition in WORKOUT_RECORDS.items():
+            metric = PersonalRecordService._metric(record_type)
+            order = asc if definition["lower_is_better"] else desc
+            ranked = (
+                select(
+                    Workout.user_id,
+                    Workout.id,
+                    Workout.started_at,
+                    metric.label("value"),
+                    func.row_number()
+                    .over(partition_by=Workout.user_id, order_by=(order(metric), Workout.id))
+                    .label("rank"),
+                )
+                .where(and_(Workout.user_id.in_(user_ids), PersonalRecordService._filter(record_type)))
+                .subquery()
+            )
+            result = await db.execute(select(ranked).where(ranked.c.rank == 1))
+            rows.extend(
+                {
+                    "user_id": row.user_id,
+                    "record_type": record_type,
+                    "value": row.value,
+                    "workout_id": row.id,
+                    "achieved_at": row.started_at,
+                }
+                for row in result
+            )
+        
+        week = RollupService.bucket_start(db, "week")
+        weekly = (
+            select(
+                WorkoutDailyRollup.user_id,
+                week.label("week"),
+                func.sum(WorkoutDailyRollup.total_distance_km).label("total"),
+            )
+            .where(WorkoutDailyRollup.user_id.in_(user_ids))
+            .group_by(WorkoutDailyRollup.user_id, week)
+            .subquery()
+        )
+        ranked = select(
+            weekly,
+            func.row_number()
+            .over(partition_by=weekly.c.user_id, order_by=(desc(weekly.c.total), weekly.c.week))
+            .label("rank"),
+        ).subquery()
+        result = await db.execute(
+            select(ranked).where(and_(ranked.c.rank == 1, ranked.c.total > 0))
+        )
+        rows.extend(
+            {
+                "user_id": row.user_id,
+                "record_type": BIGGEST_WEEK,
+                "value": float(row.total),
+                "workout_id": None,
+                "achieved_at": datetime.combine(
+                    date.fromisoformat(str(row.week)), datetime.min.time()
+                ),
+            }
+            for row in result
+        )
+        
+        if rows:
+            await db.execute(insert(PersonalRecord), rows)
+    
+    @staticmethod
+    async def backfill(concurrency: int = 4) -> int:
+        logger.info(f"Пересчет личных рекордов, параллельных потоков: {concurrency}")
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        processed = 0
+        
+        async def rebuild_chunk(user_ids: List[int]):
+            nonlocal processed
+            async with semaphore:
+                async with session_scope() as session:
+                    await PersonalRecordService.rebuild(session, user_ids)
+                processed += len(user_ids)
+                logger.info(f"Личные рекорды пересчитаны для {processed} пользователей")
+        
+        tasks = []
+        last_id = 0
+        while True:
+            async with session_scope() as session:
+                result = await session.execute(
+                    select(User.id)
+                    .where(User.id > last_id)
+                    .order_by(User.id)
+                    .limit(settings.RECORDS_BACKFILL_CHUNK_USERS)
+                )
+                user_ids = list(result.scalars().all())
+            if not user_ids:
+                break
+            
+            last_id = user_ids[-1]
+            tasks.append(asyncio.create_task(rebuild_chunk(user_ids)))
+            
+            pending = [task for task in tasks if not task.done()]
+            if len(pending) >= concurrency:
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        
+        await asyncio.gather(*tasks)
+        return processed
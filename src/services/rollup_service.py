@@ -0,0 +1,165 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func, and_, cast, Date
+from sqlalchemy.dialects import postgresql, sqlite
+from src.models.models import Workout, WorkoutDailyRollup, User
+from src.core.database import session_scope
+from src.core.cache import cache_service
+from src.services.leaderboard_service import LeaderboardService
+from src.core.config import settings
+from src.core.logging import get_logger
+from typing import Iterable, Optional, List
+from collections import defaultdict
+
+
+logger = get_logger(__name__)
+
+ROLLUP_METRICS = (
+    "workout_count",
+    "total_duration_minutes",
+    "total_distance_km",
+    "total_calories",
+    "heart_rate_sum",
+    "heart_rate_count",
+)
+
+WORKOUT_FIELDS = (
+    "user_id",
+    "workout_type",
+    "started_at",
+    "duration_minutes",
+    "distance_km",
+    "calories_burned",
+    "average_heart_rate",
+)
+
+
+class RollupService:
+    
+    @staticmethod
+    def snapshot(workout: Workout) -> dict:
+        return {field: getattr(workout, field) for field in WORKOUT_FIELDS}
+    
+    @staticmethod
+    def _aggregate(workouts: Iterable[dict], sign: int, deltas: dict):
+        for workout in workouts:
+            key = (workout["user_id"], workout["started_at"].date(), workout["workout_type"])
+            delta = deltas[key]
+            heart_rate = workout["average_heart_rate"]
+            delta["workout_count"] += sign
+            delta["total_duration_minutes"] += sign * workout["duration_minutes"]
+            delta["total_distance_km"] += sign * (workout["distance_km"] or 0)
+            delta["total_calories"] += sign * (workout["calories_burned"] or 0)
+            delta["heart_rate_sum"] += sign * (heart_rate or 0)
+            delta["heart_rate_count"] += sign * (1 if heart_rate else 0)
+    
+    @staticmethod
+    def _insert(db: AsyncSession):
+        if db.bind.dialect.name == "postgresql":
+            return postgresql.insert(WorkoutDailyRollup)
+        return sqlite.insert(WorkoutDailyRollup)
+    
+    @staticmethod
+    def bucket_start(db: AsyncSession, bucket: str):
+        if db.bind.dialect.name == "postgresql":
+            return cast(func.date_trunc(bucket, WorkoutDailyRollup.day), Date)
+        
+        modifiers = {
+            "day": (),
+            "week": ("weekday 0", "-6 days"),
+            "month": ("start of month",),
+        }
+        return func.date(WorkoutDailyRollup.day, *modifiers[bucket])
+    
+    @staticmethod
+    async def apply(
+        db: AsyncSession,
+        added: Iterable[dict] = (),
+        removed: Iterable[dict] = (),
+    ):
+        deltas: dict = defaultdict(lambda: dict.fromkeys(ROLLUP_METRICS, 0))
+        RollupService._aggregate(added, 1, deltas)
+        RollupService._aggregate(removed, -1, deltas)
+        
+        rows = [
+            {"user_id": user_id, "day": day, "workout_type": workout_type, **delta}
+            for (user_id, day, workout_type), delta in deltas.items()
+            if any(delta.values())
+        ]
+        if not rows:
+            return
+        
+        LeaderboardService.record(db, rows)
+        
+        stmt = RollupService._insert(db).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "day", "workout_type"],
+            set_={
+                metric: getattr(WorkoutDailyRollup, metric) + getattr(stmt.excluded, metric)
+                for metric in ROLLUP_METRICS
+            },
+        )
+        await db.execute(stmt)
+        
+        if any(row["workout_count"] < 0 for row in rows):
+            await db.execute(
+                delete(WorkoutDailyRollup).where(
+                    and_(
+                        WorkoutDailyRollup.user_id.in_({row["user_id"] for row in rows}),
+                        WorkoutDailyRollup.workout_count <= 0,
+                    )
+                )
+            )
+    
+    @staticmethod
+    async def rebuild(db: AsyncSession, user_ids: Optional[List[int]] = None):
+        day = func.date(Workout.started_at)
+        source = select(
+            Workout.user_id,
+            day,
+            Workout.workout_type,
+            func.count(Workout.id),
+            func.sum(Workout.duration_minutes),
+            func.coalesce(func.sum(Workout.distance_km), 0),
+            func.coalesce(func.sum(Workout.calories_burned), 0),
+            func.coalesce(func.sum(Workout.average_heart_rate), 0),
+            func.count(Workout.average_heart_rate),
+        ).group_by(Workout.user_id, day, Workout.workout_type)
+        cleanup = delete(WorkoutDailyRollup)
+        
+        if user_ids is not None:
+            source = source.where(Workout.user_id.in_(user_ids))
+            cleanup = cleanup.where(WorkoutDailyRollup.user_id.in_(user_ids))
+        
+        await db.execute(cleanup)
+        await db.execute(
+            RollupService._insert(db).from_select(
+                ["user_id", "day", "workout_type", *ROLLUP_METRICS], source
+            )
+        )
+    
+    @staticmethod
+    async def rebuild_all() -> int:
+        logger.info("Пересборка дневных агрегатов тренировок")
+        
+        rebuilt = 0
+        last_id = 0
+        while True:
+            async with session_scope() as session:
+                result = await session.execute(
+                    select(User.id)
+                    .where(User.id > last_id)
+                    .order_by(User.id)
+                    .limit(settings.ROLLUP_REBUILD_CHUNK_USERS)
+                )
+                user_ids = list(result.scalars().all())
+                if not user_ids:
+                    break
+                
+                await RollupService.rebuild(session, user_ids)
+            
+            await cache_service.invalidate_tags(*[f"user:{user_id}:workouts" for user_id in user_ids])
+            last_id = user_ids[-1]
+            rebuilt += len(user_ids)
+            logger.info(f"Агрегаты пересобраны для {rebuilt} пользователей")
+        
+        return rebuilt
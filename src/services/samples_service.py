@@ -0,0 +1,170 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from src.models.models import Workout, WorkoutSamples
+from src.schemas.workout import WorkoutSamplesCreate, WorkoutSamplesResponse
+from src.services.analytics import WorkoutAnalytics
+from src.core.config import settings
+from src.core.logging import get_logger
+from typing import Dict, Optional
+import numpy as np
+import zlib
+
+
+logger = get_logger(__name__)
+
+SAMPLE_DTYPE = np.dtype("<i2")
+
+CHANNELS = {
+    "heart_rate": {"scale": 1, "max": 250},
+    "speed_kmh": {"scale": 100, "max": 300},
+    "cadence": {"scale": 1, "max": 400},
+}
+
+
+class WorkoutSamplesService:
+    
+    @staticmethod
+    def encode_channel(values, scale: int = 1) -> bytes:
+        scaled = np.rint(np.asarray(values, dtype=np.float64) * scale).astype(np.int32)
+        deltas = np.diff(scaled, prepend=0)
+        return zlib.compress(deltas.astype(SAMPLE_DTYPE).tobytes())
+    
+    @staticmethod
+    def decode_channel(blob: bytes, scale: int = 1) -> np.ndarray:
+        deltas = np.frombuffer(zlib.decompress(blob), dtype=SAMPLE_DTYPE)
+        values = np.cumsum(deltas, dtype=np.int32)
+        if scale == 1:
+            return values
+        return values / scale
+    
+    @staticmethod
+    def _validate(samples: WorkoutSamplesCreate) -> int:
+        lengths = {
+            len(getattr(samples, name))
+            for name in CHANNELS
+            if getattr(samples, name) is not None
+        }
+        if not lengths:
+            raise ValueError("Не передан ни один канал данных")
+        if len(lengths) > 1:
+            raise ValueError("Каналы данных должны содержать одинаковое число отсчетов")
+        
+        sample_count = lengths.pop()
+        if not 0 < sample_count <= settings.WORKOUT_SAMPLES_MAX:
+            raise ValueError(
+                f"Число отсчетов должно быть от 1 до {settings.WORKOUT_SAMPLES_MAX}"
+            )
+        
+        for name, channel in CHANNELS.items():
+            values = getattr(samples, name)
+            if values is None:
+                continue
+            array = np.asarray(values, dtype=np.float64)
+            if not np.all((array >= 0) & (array <= channel["max"])):
+                raise ValueError(f"Значения канала {name} должны быть от 0 до {channel['max']}")
+        
+        return sample_count
+    
+    @staticmethod
+    async def save_samples(
+        db: AsyncSession, workout_id: int, samples: WorkoutSamplesCreate
+    ) -> WorkoutSamples:
+        logger.info(f"Сохранение отсчетов датчиков для тренировки: ID {workout_id}")
+        
+        sample_count = WorkoutSamplesService._validate(samples)
+        blobs = {
+            name: (
+                None
+                if getattr(samples, name) is None
+                else WorkoutSamplesService.encode_channel(getattr(samples, name), channel["scale"])
+            )
+            for name, channel in CHANNELS.items()
+        }
+        
+        record = await db.get(WorkoutSamples, workout_id)
+        if not record:
+            record = WorkoutSamples(workout_id=workout_id)
+            db.add(record)
+        
+        record.interval_seconds = samples.interval_seconds
+        record.sample_count = sample_count
+        for name, blob in blobs.items():
+            setattr(record, name, blob)
+        
+        await db.flush()
+        
+        logger.info(
+            f"Отсчеты сохранены для тренировки ID {workout_id}: {sample_count} шт., "
+            f"{WorkoutSamplesService.stored_bytes(record)} байт"
+        )
+        return record
+    
+    @staticmethod
+    async def get_samples(db: AsyncSession, workout_id: int) -> Optional[WorkoutSamples]:
+        result = await db.execute(
+            select(WorkoutSamples).where(WorkoutSamples.workout_id == workout_id)
+        )
+        return result.scalar_one_or_none()
+    
+    @staticmethod
+    def stored_bytes(record: WorkoutSamples) -> int:
+        return sum(len(getattr(record, name) or b"") for name in CHANNELS)
+    
+    @staticmethod
+    def decode(record: WorkoutSamples) -> Dict[str, Optional[np.ndarray]]:
+        return {
+            name: (
+                None
+                if getattr(record, name) is None
+                else WorkoutSamplesService.decode_channel(getattr(record, name), channel["scale"])
+            )
+            for name, channel in CHANNELS.items()
+        }
+    
+    @staticmethod
+    def to_response(record: WorkoutSamples) -> WorkoutSamplesResponse:
+        channels = WorkoutSamplesService.decode(record)
+        return WorkoutSamplesResponse(
+            workout_id=record.workout_id,
+            sample_count=record.sample_count,
+            interval_seconds=record.interval_seconds,
+            **{
+                name: None if values is None else values.tolist()
+                for name, values in channels.items()
+            },
+        )
+    
+    @staticmethod
+    def time_in_zones(
+        heart_rate: np.ndarray, max_heart_rate: int, interval_seconds: float
+    ) -> Dict[str, float]:
+        zones = WorkoutAnalytics.calculate_heart_rate_zones(max_heart_rate)
+        names = list(zones)
+        lower_bounds = np.array([zones[name]["min"] for name in names])
+        
+        counted = heart_rate[heart_rate >= lower_bounds[0]]
+        indexes = np.searchsorted(lower_bounds, counted, side="right") - 1
+        counts = np.bincount(indexes, minlength=len(names))
+        
+        return {
+            name: float(count * interval_seconds)
+            for name, count in zip(names, counts.tolist())
+        }
+    
+    @staticmethod
+    def heart_rate_zones(
+        workout: Workout, record: WorkoutSamples, max_heart_rate: Optional[int] = None
+    ) -> Optional[dict]:
+        if record.heart_rate is None:
+            return None
+        
+        heart_rate = WorkoutSamplesService.decode_channel(record.heart_rate)
+        max_heart_rate = max_heart_rate or workout.max_heart_rate or int(heart_rate.max())
+        return {
+            "workout_id": workout.id,
+            "max_heart_rate": max_heart_rate,
+            "zones": WorkoutAnalytics.calculate_heart_rate_zones(max_heart_rate),
+            "seconds_in_zone": WorkoutSamplesService.time_in_zones(
+                heart_rate, max_heart_rate, record.interval_seconds
+            ),
+        }
@@ -0,0 +1,200 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.models import Workout, WorkoutType
+from src.schemas.workout import WorkoutCreate, TrackSplit, TrackSummary
+from src.services.workout_service import WorkoutService
+from src.core.config import settings
+from src.core.logging import get_logger
+from typing import BinaryIO, Dict, List, Optional
+from array import array
+from datetime import datetime, timezone
+import xml.etree.ElementTree as ET
+import numpy as np
+
+
+logger = get_logger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+POINT_TAGS = {"trkpt", "Trackpoint"}
+FIELD_TAGS = {
+    "time": "time",
+    "Time": "time",
+    "LatitudeDegrees": "lat",
+    "LongitudeDegrees": "lon",
+    "hr": "hr",
+    "HeartRateBpm": "hr",
+}
+
+
+class _TrackTarget:
+    
+    def __init__(self):
+        self.latitudes, self.longitudes = array("d"), array("d")
+        self.timestamps, self.heart_rates = array("d"), array("d")
+        self.names: Dict[str, str] = {}
+        self.point: Optional[dict] = None
+        self.field: Optional[str] = None
+        self.text: List[str] = []
+    
+    def _local(self, tag: str) -> str:
+        name = self.names.get(tag)
+        if name is None:
+            name = self.names[tag] = tag.rpartition("}")[2]
+        return name
+    
+    def start(self, tag: str, attrib: dict):
+        name = self._local(tag)
+        if name in POINT_TAGS:
+            self.point = {"lat": attrib.get("lat"), "lon": attrib.get("lon")}
+        elif self.point is not None and name in FIELD_TAGS:
+            self.field = FIELD_TAGS[name]
+            self.text = []
+    
+    def data(self, data: str):
+        if self.field:
+            self.text.append(data)
+    
+    def end(self, tag: str):
+        name = self._local(tag)
+        if self.field and name in FIELD_TAGS:
+            text = "".join(self.text).strip()
+            if text:
+                self.point[self.field] = text
+            self.field = None
+        elif name in POINT_TAGS:
+            self._append(self.point)
+            self.point = None
+    
+    def _append(self, point: dict):
+        if point["lat"] is None or point["lon"] is None:
+            return
+        if not point.get("time"):
+            raise ValueError("Точки трека не содержат отметок времени")
+        
+        self.latitudes.append(float(point["lat"]))
+        self.longitudes.append(float(point["lon"]))
+        self.timestamps.append(TrackImportService._timestamp(point["time"]))
+        self.heart_rates.append(float(point["hr"]) if "hr" in point else np.nan)
+        
+        if len(self.timestamps) > settings.TRACK_MAX_POINTS:
+            raise ValueError(f"Трек содержит больше {settings.TRACK_MAX_POINTS} точек")
+    
+    def close(self):
+        return self
+
+
+class TrackImportService:
+    
+    @staticmethod
+    def _timestamp(value: str) -> float:
+        moment = datetime.fromisoformat(value)
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.timestamp()
+    
+    @staticmethod
+    def parse(source: BinaryIO) -> Dict[str, np.ndarray]:
+        target = _TrackTarget()
+        parser = ET.XMLParser(target=target)
+        
+        try:
+            while True:
+                chunk = source.read(settings.IMPORT_READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+            parser.close()
+        except ET.ParseError as e:
+            raise ValueError(f"Некорректный файл трека: {e}")
+        
+        if len(target.timestamps) < 2:
+            raise ValueError("Трек должен содержать не менее двух точек")
+        
+        return {
+            "latitudes": np.frombuffer(target.latitudes, dtype=np.float64),
+            "longitudes": np.frombuffer(target.longitudes, dtype=np.float64),
+            "timestamps": np.frombuffer(target.timestamps, dtype=np.float64),
+            "heart_rates": np.frombuffer(target.heart_rates, dtype=np.float64),
+        }
+    
+    @staticmethod
+    def haversine_km(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        lat = np.radians(latitudes)
+        lon = np.radians(longitudes)
+        a = (
+            np.sin(np.diff(lat) / 2) ** 2
+            + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(np.diff(lon) / 2) ** 2
+        )
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+    
+    @staticmethod
+    def analyze(
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        timestamps: np.ndarray,
+        heart_rates: np.ndarray,
+    ) -> TrackSummary:
+        order = np.argsort(timestamps, kind="stable")
+        latitudes, longitudes = latitudes[order], longitudes[order]
+        timestamps, heart_rates = timestamps[order], heart_rates[order]
+        
+        segment_km = TrackImportService.haversine_km(latitudes, longitudes)
+        segment_seconds = np.diff(timestamps)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            segment_speed = segment_km / (segment_seconds / 3600)
+        moving = (segment_seconds > 0) & (segment_speed >= settings.TRACK_MOVING_SPEED_KMH)
+        
+        distance_km = float(segment_km.sum())
+        elapsed_seconds = float(timestamps[-1] - timestamps[0])
+        moving_seconds = float(segment_seconds[moving].sum())
+        
+        cumulative_km = np.concatenate(([0.0], np.cumsum(segment_km)))
+        cumulative_seconds = np.concatenate(([0.0], np.cumsum(np.where(moving, segment_seconds, 0))))
+        boundaries = np.arange(1, int(distance_km) + 1, dtype=np.float64)
+        boundary_seconds = np.interp(boundaries, cumulative_km, cumulative_seconds)
+        split_seconds = np.diff(boundary_seconds, prepend=0.0)
+        
+        heart_rates = heart_rates[(heart_rates >= 30) & (heart_rates <= 250)]
+        
+        return TrackSummary(
+            points=len(timestamps),
+            started_at=datetime.fromtimestamp(timestamps[0], tz=timezone.utc).replace(tzinfo=None),
+            distance_km=round(distance_km, 3),
+            elapsed_minutes=round(elapsed_seconds / 60, 2),
+            moving_minutes=round(moving_seconds / 60, 2),
+            avg_moving_speed_kmh=(
+                round(distance_km / (moving_seconds / 3600), 2) if moving_seconds else None
+            ),
+            average_heart_rate=int(round(heart_rates.mean())) if heart_rates.size else None,
+            max_heart_rate=int(heart_rates.max()) if heart_rates.size else None,
+            splits=[
+                TrackSplit(km=km, duration_seconds=round(seconds, 1))
+                for km, seconds in enumerate(split_seconds.tolist(), start=1)
+            ],
+        )
+    
+    @staticmethod
+    async def create_workout(
+        db: AsyncSession, user_id: int, workout_type: WorkoutType, summary: TrackSummary
+    ) -> Workout:
+        logger.info(
+            f"Создание тренировки из трека для пользователя: ID {user_id}, "
+            f"{summary.points} точек, {summary.distance_km} км"
+        )
+        
+        duration_minutes = summary.moving_minutes or summary.elapsed_minutes
+        if not duration_minutes:
+            raise ValueError("Трек не содержит движения")
+        
+        return await WorkoutService.create_workout(
+            db,
+            user_id,
+            WorkoutCreate(
+                workout_type=workout_type,
+                duration_minutes=duration_minutes,
+                distance_km=summary.distance_km,
+                average_heart_rate=summary.average_heart_rate,
+                max_heart_rate=summary.max_heart_rate,
+                started_at=summary.started_at,
+            ),
+        )
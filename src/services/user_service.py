@@ -1,14 +1,24 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc
 from src.models.models import User
-from src.schemas.user import UserCreate, UserUpdate
-from src.core.security import get_password_hash, verify_password
+from src.schemas.user import UserCreate, UserUpdate, UserPrincipal
+from src.core.security import hash_password_async, verify_password_async
+from src.core.cache import LRUCache, cache_service
+from src.core.config import settings
 from typing import Optional
+from datetime import timedelta
 from src.core.logging import get_logger
+from redis.exceptions import RedisError
 
 
 logger = get_logger(__name__)
 
+principal_cache = LRUCache(
+    max_items=settings.PRINCIPAL_CACHE_MAX_ITEMS,
+    default_ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+principal_cache_stats = {"db_queries_saved": 0, "db_queries": 0}
+
 
 class UserService:
     
@@ -16,7 +26,7 @@ class UserService:
     async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
         logger.info(f"Создание нового пользователя: {user_data.username}")
         
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await hash_password_async(user_data.password)
         
         user = User(
             email=user_data.email,
@@ -41,6 +51,65 @@ class UserService:
         result = await db.execute(select(User).where(User.id == user_id))
         return result.scalar_one_or_none()
     
+    @staticmethod
+    def _principal_key(user_id: int) -> str:
+        return f"user:{user_id}:principal"
+    
+    @staticmethod
+    async def get_principal(db: AsyncSession, user_id: int) -> Optional[UserPrincipal]:
+        key = UserService._principal_key(user_id)
+        
+        try:
+            local_key = await cache_service.tagged_key(key, [key])
+        except RedisError as e:
+            logger.warning(f"Кэш пользователя недоступен, чтение из БД: {e}")
+            local_key = None
+        
+        if local_key:
+            principal = principal_cache.get(local_key)
+            if principal:
+                principal_cache_stats["db_queries_saved"] += 1
+                return principal
+            
+            try:
+                cached = await cache_service.get_json(key)
+            except RedisError as e:
+                logger.warning(f"Кэш пользователя недоступен, чтение из БД: {e}")
+                cached = None
+            if cached:
+                principal = UserPrincipal(**cached)
+                principal_cache.set(local_key, principal)
+                principal_cache_stats["db_queries_saved"] += 1
+                return principal
+        
+        principal_cache_stats["db_queries"] += 1
+        user = await UserService.get_user_by_id(db, user_id)
+        if not user:
+            return None
+        
+        principal = UserPrincipal.model_validate(user)
+        if local_key:
+            principal_cache.set(local_key, principal)
+            try:
+                await cache_service.set_json(
+                    key,
+                    principal.model_dump(),
+                    expire=timedelta(seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS),
+                )
+            except RedisError as e:
+                logger.warning(f"Не удалось сохранить пользователя в кэш: {e}")
+        return principal
+    
+    @staticmethod
+    async def invalidate_principal(user_id: int):
+        key = UserService._principal_key(user_id)
+        try:
+            principal_cache.delete(await cache_service.tagged_key(key, [key]))
+            await cache_service.invalidate_tags(key)
+            await cache_service.delete(key)
+        except RedisError as e:
+            logger.warning(f"Не удалось удалить пользователя из кэша: {e}")
+    
     @staticmethod
     async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
         result = await db.execute(select(User).where(User.username == username))
@@ -63,7 +132,7 @@ class UserService:
             logger.warning(f"Пользователь не найден: {username}")
             return None
         
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             logger.warning(f"Неверный пароль для пользователя: {username}")
             return None
         
@@ -84,7 +153,9 @@ class UserService:
         update_data = user_data.model_dump(exclude_unset=True)
         
         if "password" in update_data:
-            update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+            update_data["hashed_password"] = await hash_password_async(
+                update_data.pop("password")
+            )
         
         for field, value in update_data.items():
             setattr(user, field, value)
@@ -1,31 +1,41 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, desc
-from src.models.models import Workout, User, WorkoutType
-from src.schemas.workout import WorkoutCreate, WorkoutUpdate, WorkoutStats
-from src.services.analytics import CalorieCalculator, WorkoutAnalytics
-from typing import Optional, List
-from datetime import datetime, timedelta
+from sqlalchemy import select, insert, update, func, and_, desc, tuple_
+from src.models.models import Workout, User, WorkoutType, WorkoutDailyRollup
+from src.schemas.workout import (
+    WorkoutCreate,
+    WorkoutUpdate,
+    WorkoutStats,
+    WorkoutStatsSeries,
+    WorkoutStatsBucket,
+    WorkoutTotals,
+    WorkoutResponse,
+    WorkoutPage,
+    CalorieRecalculationProgress,
+)
+from src.services.analytics import CalorieCalculator, WorkoutAnalytics, WORKOUT_TYPE_CODES
+from src.services.rollup_service import RollupService
+from src.services.record_service import PersonalRecordService
+from src.services.leaderboard_service import LeaderboardService
+from src.core.cache import cached, cache_service
+from src.core.database import session_scope
+from src.core.config import settings
+from typing import Optional, List, Tuple, Dict
+from datetime import date, datetime, timedelta
+import base64
+import math
+import numpy as np
 from src.core.logging import get_logger
 
 
 logger = get_logger(__name__)
 
+recalculation_progress: Dict[int, CalorieRecalculationProgress] = {}
+
 
 class WorkoutService:
     
     @staticmethod
-    async def create_workout(
-        db: AsyncSession, user_id: int, workout_data: WorkoutCreate
-    ) -> Workout:
-        logger.info(f"Создание новой тренировки для пользователя: ID {user_id}")
-        
-        user_result = await db.execute(select(User).where(User.id == user_id))
-        user = user_result.scalar_one_or_none()
-        
-        if not user:
-            logger.error(f"Пользователь не найден: ID {user_id}")
-            raise ValueError("Пользователь не найден")
-        
+    def _build_workout_values(workout_data: WorkoutCreate, weight: Optional[float]) -> dict:
         avg_speed = None
         if workout_data.distance_km and workout_data.duration_minutes:
             avg_speed = WorkoutAnalytics.calculate_average_speed(
@@ -39,11 +49,11 @@ class WorkoutService:
             )
         
         calories_burned = None
-        if user.weight:
+        if weight:
             calories_burned = CalorieCalculator.calculate_calories(
                 workout_data.workout_type,
                 workout_data.duration_minutes,
-                user.weight,
+                weight,
                 avg_speed,
             )
         
@@ -51,8 +61,7 @@ class WorkoutService:
         if not steps and distance_km:
             steps = WorkoutAnalytics.estimate_steps(distance_km, workout_data.workout_type)
         
-        workout = Workout(
-            user_id=user_id,
+        return dict(
             workout_type=workout_data.workout_type,
             duration_minutes=workout_data.duration_minutes,
             distance_km=distance_km,
@@ -67,33 +76,134 @@ class WorkoutService:
             started_at=workout_data.started_at,
             completed_at=workout_data.started_at + timedelta(minutes=workout_data.duration_minutes),
         )
+    
+    @staticmethod
+    def _build_workout_rows(
+        user_id: int, workouts: List[WorkoutCreate], weight: Optional[float]
+    ) -> List[dict]:
+        def column(field: str) -> np.ndarray:
+            return np.array(
+                [np.nan if getattr(w, field) is None else getattr(w, field) for w in workouts],
+                dtype=np.float64,
+            )
+        
+        metrics = WorkoutAnalytics.calculate_batch(
+            type_codes=np.array([WORKOUT_TYPE_CODES[w.workout_type] for w in workouts]),
+            durations_minutes=column("duration_minutes"),
+            distances_km=column("distance_km"),
+            weights_kg=np.full(len(workouts), np.nan if weight is None else weight),
+            steps=column("steps"),
+            pool_lengths_m=column("pool_length_m"),
+            pool_laps=column("pool_laps"),
+        )
+        values = {
+            name: [None if math.isnan(value) else value for value in array.tolist()]
+            for name, array in metrics.items()
+        }
+        
+        return [
+            {
+                "user_id": user_id,
+                "workout_type": w.workout_type,
+                "duration_minutes": w.duration_minutes,
+                "distance_km": values["distance_km"][i],
+                "calories_burned": values["calories_burned"][i],
+                "avg_speed_kmh": values["avg_speed_kmh"][i],
+                "average_heart_rate": w.average_heart_rate,
+                "max_heart_rate": w.max_heart_rate,
+                "steps": None if values["steps"][i] is None else int(values["steps"][i]),
+                "pool_length_m": w.pool_length_m,
+                "pool_laps": w.pool_laps,
+                "notes": w.notes,
+                "started_at": w.started_at,
+                "completed_at": w.started_at + timedelta(minutes=w.duration_minutes),
+            }
+            for i, w in enumerate(workouts)
+        ]
+    
+    @staticmethod
+    async def create_workout(
+        db: AsyncSession, user_id: int, workout_data: WorkoutCreate
+    ) -> Workout:
+        logger.info(f"Создание новой тренировки для пользователя: ID {user_id}")
+        
+        user_result = await db.execute(select(User).where(User.id == user_id))
+        user = user_result.scalar_one_or_none()
+        
+        if not user:
+            logger.error(f"Пользователь не найден: ID {user_id}")
+            raise ValueError("Пользователь не найден")
+        
+        workout = Workout(
+            user_id=user_id,
+            **WorkoutService._build_workout_values(workout_data, user.weight),
+        )
         
         db.add(workout)
         await db.flush()
         await db.refresh(workout)
+        await RollupService.apply(db, added=[RollupService.snapshot(workout)])
+        await PersonalRecordService.on_created(
+            db, user_id, [PersonalRecordService.snapshot(workout)]
+        )
         
         logger.info(f"Тренировка создана успешно: ID {workout.id}")
         return workout
     
+    @staticmethod
+    async def create_workouts_bulk(
+        db: AsyncSession, user_id: int, workouts: List[WorkoutCreate]
+    ) -> List[int]:
+        logger.info(f"Пакетное создание {len(workouts)} тренировок для пользователя: ID {user_id}")
+        
+        user_result = await db.execute(select(User.weight).where(User.id == user_id))
+        user = user_result.one_or_none()
+        
+        if not user:
+            logger.error(f"Пользователь не найден: ID {user_id}")
+            raise ValueError("Пользователь не найден")
+        
+        rows = WorkoutService._build_workout_rows(user_id, workouts, user.weight)
+        
+        result = await db.execute(
+            insert(Workout).returning(Workout.id, sort_by_parameter_order=True), rows
+        )
+        workout_ids = list(result.scalars().all())
+        await RollupService.apply(db, added=rows)
+        await PersonalRecordService.on_created(
+            db, user_id, [{**row, "id": workout_id} for row, workout_id in zip(rows, workout_ids)]
+        )
+        
+        logger.info(f"Пакет тренировок создан успешно: {len(workout_ids)} шт.")
+        return workout_ids
+    
     @staticmethod
     async def get_workout_by_id(
-        db: AsyncSession, workout_id: int, user_id: int
+        db: AsyncSession, workout_id: int, user_id: int, for_update: bool = False
     ) -> Optional[Workout]:
-        result = await db.execute(
-            select(Workout).where(
-                and_(Workout.id == workout_id, Workout.user_id == user_id)
-            )
+        query = select(Workout).where(
+            and_(Workout.id == workout_id, Workout.user_id == user_id)
         )
+        if for_update:
+            query = query.with_for_update()
+        result = await db.execute(query)
         return result.scalar_one_or_none()
     
     @staticmethod
+    @cached(
+        key="user:{user_id}:workouts:{skip}:{limit}:{workout_type}",
+        tags=["user:{user_id}:workouts"],
+        model=List[WorkoutResponse],
+        ttl=timedelta(seconds=settings.WORKOUTS_CACHE_TTL_SECONDS),
+        soft_ttl=timedelta(seconds=settings.WORKOUTS_CACHE_SOFT_TTL_SECONDS),
+    )
     async def get_user_workouts(
         db: AsyncSession,
         user_id: int,
         skip: int = 0,
         limit: int = 100,
         workout_type: Optional[WorkoutType] = None,
-    ) -> List[Workout]:
+    ) -> List[WorkoutResponse]:
         query = select(Workout).where(Workout.user_id == user_id)
         
         if workout_type:
@@ -104,17 +214,74 @@ class WorkoutService:
         result = await db.execute(query)
         return list(result.scalars().all())
     
+    @staticmethod
+    def encode_cursor(started_at: datetime, workout_id: int) -> str:
+        raw = f"{started_at.isoformat()}|{workout_id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            started_at, workout_id = raw.split("|")
+            return datetime.fromisoformat(started_at), int(workout_id)
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError("Некорректный курсор пагинации")
+    
+    @staticmethod
+    @cached(
+        key="user:{user_id}:workouts:cursor:{cursor}:{limit}:{workout_type}",
+        tags=["user:{user_id}:workouts"],
+        model=WorkoutPage,
+        ttl=timedelta(seconds=settings.WORKOUTS_CACHE_TTL_SECONDS),
+        soft_ttl=timedelta(seconds=settings.WORKOUTS_CACHE_SOFT_TTL_SECONDS),
+    )
+    async def get_user_workouts_page(
+        db: AsyncSession,
+        user_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        workout_type: Optional[WorkoutType] = None,
+    ) -> WorkoutPage:
+        query = select(Workout).where(Workout.user_id == user_id)
+        
+        if workout_type:
+            query = query.where(Workout.workout_type == workout_type)
+        
+        if cursor:
+            started_at, workout_id = WorkoutService.decode_cursor(cursor)
+            query = query.where(
+                tuple_(Workout.started_at, Workout.id) < tuple_(started_at, workout_id)
+            )
+        
+        query = query.order_by(desc(Workout.started_at), desc(Workout.id)).limit(limit + 1)
+        
+        result = await db.execute(query)
+        workouts = list(result.scalars().all())
+        
+        next_cursor = None
+        if len(workouts) > limit:
+            workouts = workouts[:limit]
+            next_cursor = WorkoutService.encode_cursor(workouts[-1].started_at, workouts[-1].id)
+        
+        return WorkoutPage(
+            items=[WorkoutResponse.model_validate(w) for w in workouts],
+            next_cursor=next_cursor,
+        )
+    
     @staticmethod
     async def update_workout(
         db: AsyncSession, workout_id: int, user_id: int, workout_data: WorkoutUpdate
     ) -> Optional[Workout]:
         logger.info(f"Обновление тренировки: ID {workout_id}")
         
-        workout = await WorkoutService.get_workout_by_id(db, workout_id, user_id)
+        workout = await WorkoutService.get_workout_by_id(db, workout_id, user_id, for_update=True)
         if not workout:
             logger.warning(f"Тренировка не найдена: ID {workout_id}")
             return None
         
+        before = RollupService.snapshot(workout)
+        record_before = PersonalRecordService.snapshot(workout)
         update_data = workout_data.model_dump(exclude_unset=True)
         
         for field, value in update_data.items():
@@ -127,6 +294,12 @@ class WorkoutService:
         
         await db.flush()
         await db.refresh(workout)
+        await RollupService.apply(
+            db, added=[RollupService.snapshot(workout)], removed=[before]
+        )
+        await PersonalRecordService.on_updated(
+            db, user_id, record_before, PersonalRecordService.snapshot(workout)
+        )
         
         logger.info(f"Тренировка обновлена успешно: ID {workout_id}")
         return workout
@@ -135,60 +308,223 @@ class WorkoutService:
     async def delete_workout(db: AsyncSession, workout_id: int, user_id: int) -> bool:
         logger.info(f"Удаление тренировки: ID {workout_id}")
         
-        workout = await WorkoutService.get_workout_by_id(db, workout_id, user_id)
+        workout = await WorkoutService.get_workout_by_id(db, workout_id, user_id, for_update=True)
         if not workout:
             logger.warning(f"Тренировка не найдена: ID {workout_id}")
             return False
         
+        snapshot = PersonalRecordService.snapshot(workout)
+        released = await PersonalRecordService.release(db, user_id, workout_id)
+        await RollupService.apply(db, removed=[RollupService.snapshot(workout)])
         await db.delete(workout)
+        await db.flush()
+        await PersonalRecordService.on_deleted(db, user_id, snapshot, released)
         logger.info(f"Тренировка удалена успешно: ID {workout_id}")
         return True
     
     @staticmethod
+    @cached(
+        key="user:{user_id}:stats:{days}",
+        tags=["user:{user_id}:workouts"],
+        model=WorkoutStats,
+        ttl=timedelta(seconds=settings.STATS_CACHE_TTL_SECONDS),
+        soft_ttl=timedelta(seconds=settings.STATS_CACHE_SOFT_TTL_SECONDS),
+    )
     async def get_workout_statistics(
         db: AsyncSession, user_id: int, days: int = 30
     ) -> WorkoutStats:
         logger.info(f"Получение статистики тренировок для пользователя: ID {user_id}")
         
-        start_date = datetime.utcnow() - timedelta(days=days)
+        start_day = (datetime.utcnow() - timedelta(days=days)).date()
         
-        result = await db.execute(
+        by_type = (
             select(
-                func.count(Workout.id).label("total_workouts"),
-                func.sum(Workout.duration_minutes).label("total_duration"),
-                func.coalesce(func.sum(Workout.distance_km), 0).label("total_distance"),
-                func.coalesce(func.sum(Workout.calories_burned), 0).label("total_calories"),
-                func.avg(Workout.average_heart_rate).label("avg_heart_rate"),
-            ).where(
+                WorkoutDailyRollup.workout_type,
+                func.sum(WorkoutDailyRollup.workout_count).label("workout_count"),
+                func.sum(WorkoutDailyRollup.total_duration_minutes).label("total_duration"),
+                func.sum(WorkoutDailyRollup.total_distance_km).label("total_distance"),
+                func.sum(WorkoutDailyRollup.total_calories).label("total_calories"),
+                func.sum(WorkoutDailyRollup.heart_rate_sum).label("heart_rate_sum"),
+                func.sum(WorkoutDailyRollup.heart_rate_count).label("heart_rate_count"),
+            )
+            .where(
                 and_(
-                    Workout.user_id == user_id,
-                    Workout.started_at >= start_date,
+                    WorkoutDailyRollup.user_id == user_id,
+                    WorkoutDailyRollup.day >= start_day,
                 )
             )
+            .group_by(WorkoutDailyRollup.workout_type)
+            .subquery()
         )
         
-        stats = result.one()
+        result = await db.execute(
+            select(
+                by_type.c.workout_type,
+                func.sum(by_type.c.workout_count).over().label("total_workouts"),
+                func.sum(by_type.c.total_duration).over().label("total_duration"),
+                func.sum(by_type.c.total_distance).over().label("total_distance"),
+                func.sum(by_type.c.total_calories).over().label("total_calories"),
+                func.sum(by_type.c.heart_rate_sum).over().label("heart_rate_sum"),
+                func.sum(by_type.c.heart_rate_count).over().label("heart_rate_count"),
+            )
+            .order_by(desc(by_type.c.workout_count))
+            .limit(1)
+        )
+        
+        stats = result.first()
+        if not stats:
+            return WorkoutStats(
+                total_workouts=0,
+                total_duration_minutes=0.0,
+                total_distance_km=0.0,
+                total_calories_burned=0.0,
+                average_heart_rate=None,
+                favorite_workout_type=None,
+            )
         
-        type_result = await db.execute(
-            select(Workout.workout_type, func.count(Workout.id).label("count"))
+        return WorkoutStats(
+            total_workouts=stats.total_workouts,
+            total_duration_minutes=float(stats.total_duration),
+            total_distance_km=float(stats.total_distance),
+            total_calories_burned=float(stats.total_calories),
+            average_heart_rate=(
+                stats.heart_rate_sum / stats.heart_rate_count if stats.heart_rate_count else None
+            ),
+            favorite_workout_type=stats.workout_type.value,
+        )
+    
+    @staticmethod
+    @cached(
+        key="user:{user_id}:stats:series:{bucket}:{date_from}:{date_to}",
+        tags=["user:{user_id}:workouts"],
+        model=WorkoutStatsSeries,
+        ttl=timedelta(seconds=settings.STATS_CACHE_TTL_SECONDS),
+        soft_ttl=timedelta(seconds=settings.STATS_CACHE_SOFT_TTL_SECONDS),
+    )
+    async def get_workout_series(
+        db: AsyncSession, user_id: int, bucket: str, date_from: date, date_to: date
+    ) -> WorkoutStatsSeries:
+        logger.info(f"Получение статистики по периодам ({bucket}) для пользователя: ID {user_id}")
+        
+        bucket_start = RollupService.bucket_start(db, bucket).label("bucket_start")
+        
+        result = await db.execute(
+            select(
+                bucket_start,
+                WorkoutDailyRollup.workout_type,
+                func.sum(WorkoutDailyRollup.workout_count).label("total_workouts"),
+                func.sum(WorkoutDailyRollup.total_duration_minutes).label("total_duration_minutes"),
+                func.sum(WorkoutDailyRollup.total_distance_km).label("total_distance_km"),
+                func.sum(WorkoutDailyRollup.total_calories).label("total_calories_burned"),
+            )
             .where(
                 and_(
-                    Workout.user_id == user_id,
-                    Workout.started_at >= start_date,
+                    WorkoutDailyRollup.user_id == user_id,
+                    WorkoutDailyRollup.day >= date_from,
+                    WorkoutDailyRollup.day <= date_to,
                 )
             )
-            .group_by(Workout.workout_type)
-            .order_by(desc("count"))
-            .limit(1)
+            .group_by(bucket_start, WorkoutDailyRollup.workout_type)
+            .order_by(bucket_start)
         )
         
-        favorite_type = type_result.first()
+        buckets: Dict[str, dict] = {}
+        for row in result:
+            totals = WorkoutTotals(
+                total_workouts=row.total_workouts,
+                total_duration_minutes=row.total_duration_minutes,
+                total_distance_km=row.total_distance_km,
+                total_calories_burned=row.total_calories_burned,
+            )
+            entry = buckets.setdefault(
+                str(row.bucket_start),
+                {"start": row.bucket_start, "by_type": {}, **dict.fromkeys(WorkoutTotals.model_fields, 0)},
+            )
+            entry["by_type"][row.workout_type.value] = totals
+            for field in WorkoutTotals.model_fields:
+                entry[field] += getattr(totals, field)
         
-        return WorkoutStats(
-            total_workouts=stats.total_workouts or 0,
-            total_duration_minutes=float(stats.total_duration or 0),
-            total_distance_km=float(stats.total_distance or 0),
-            total_calories_burned=float(stats.total_calories or 0),
-            average_heart_rate=float(stats.avg_heart_rate) if stats.avg_heart_rate else None,
-            favorite_workout_type=favorite_type[0].value if favorite_type else None,
+        return WorkoutStatsSeries(
+            bucket=bucket,
+            date_from=date_from,
+            date_to=date_to,
+            buckets=[WorkoutStatsBucket(**entry) for entry in buckets.values()],
         )
+    
+    @staticmethod
+    async def recalculate_calories(user_id: int) -> CalorieRecalculationProgress:
+        logger.info(f"Пересчет калорий тренировок для пользователя: ID {user_id}")
+        
+        progress = CalorieRecalculationProgress(started_at=datetime.utcnow())
+        recalculation_progress[user_id] = progress
+        
+        try:
+            async with session_scope() as session:
+                total = await session.execute(
+                    select(func.count(Workout.id)).where(Workout.user_id == user_id)
+                )
+                progress.total = total.scalar_one()
+            
+            last_id = 0
+            while True:
+                async with session_scope() as session:
+                    weight = await session.scalar(select(User.weight).where(User.id == user_id))
+                    result = await session.execute(
+                        select(
+                            Workout.id,
+                            Workout.user_id,
+                            Workout.workout_type,
+                            Workout.started_at,
+                            Workout.duration_minutes,
+                            Workout.distance_km,
+                            Workout.calories_burned,
+                            Workout.average_heart_rate,
+                            Workout.avg_speed_kmh,
+                        )
+                        .where(and_(Workout.user_id == user_id, Workout.id > last_id))
+                        .order_by(Workout.id)
+                        .limit(settings.RECALCULATION_CHUNK_ROWS)
+                        .with_for_update()
+                    )
+                    rows = result.all()
+                    if not rows:
+                        break
+                    
+                    calories = CalorieCalculator.calculate_calories_batch(
+                        np.array([WORKOUT_TYPE_CODES[row.workout_type] for row in rows]),
+                        np.array([row.duration_minutes for row in rows], dtype=np.float64),
+                        np.full(len(rows), np.nan if weight is None else weight),
+                        np.array(
+                            [np.nan if row.avg_speed_kmh is None else row.avg_speed_kmh for row in rows],
+                            dtype=np.float64,
+                        ),
+                    )
+                    updated = [
+                        {**row._asdict(), "calories_burned": None if math.isnan(value) else value}
+                        for row, value in zip(rows, calories.tolist())
+                    ]
+                    await session.execute(
+                        update(Workout),
+                        [{"id": row["id"], "calories_burned": row["calories_burned"]} for row in updated],
+                    )
+                    await RollupService.apply(
+                        session, added=updated, removed=[row._asdict() for row in rows]
+                    )
+                await LeaderboardService.publish(session)
+                
+                last_id = rows[-1].id
+                progress.processed += len(rows)
+            
+            progress.status = "completed"
+            logger.info(
+                f"Пересчет калорий завершен для пользователя ID {user_id}: "
+                f"{progress.processed} тренировок"
+            )
+        except Exception:
+            progress.status = "failed"
+            logger.exception(f"Ошибка пересчета калорий для пользователя: ID {user_id}")
+        finally:
+            progress.finished_at = datetime.utcnow()
+            await cache_service.invalidate_tags(f"user:{user_id}:workouts")
+        
+        return progress
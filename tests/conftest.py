@@ -1,11 +1,15 @@
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
+from fakeredis import FakeAsyncRedis
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from src.main import app
+from src.core import database
 from src.core.database import Base, get_db
 from src.models.models import User, Workout, Goal
 from src.core.security import get_password_hash
+from src.core.cache import cache_service
+from src.services.user_service import principal_cache
 
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -41,8 +45,10 @@ async def db_session():
 
 
 @pytest_asyncio.fixture
-async def client(db_session):
+async def client(db_session, monkeypatch):
     app.dependency_overrides[get_db] = override_get_db
+    monkeypatch.setattr(database, "AsyncSessionLocal", TestSessionLocal)
+    principal_cache.clear()
     
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
@@ -50,6 +56,18 @@ async def client(db_session):
     app.dependency_overrides.clear()
 
 
+@pytest_asyncio.fixture
+async def fake_redis():
+    cache_service.redis = FakeAsyncRedis()
+    if cache_service.local is not None:
+        cache_service.local.clear()
+    
+    yield cache_service.redis
+    
+    await cache_service.redis.aclose()
+    cache_service.redis = None
+
+
 @pytest_asyncio.fixture
 async def test_user(db_session):
     user = User(
@@ -0,0 +1,104 @@
+import random
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.models.models import WorkoutType
+from src.schemas.workout import WorkoutCreate
+from src.services.analytics import CalorieCalculator, WORKOUT_TYPE_CODES
+from src.services.workout_service import WorkoutService
+
+
+SPEED_TIERS = {
+    WorkoutType.RUNNING: [(8, 8.0), (10, 9.8), (12, 11.0), (14, 11.8), (None, 14.5)],
+    WorkoutType.WALKING: [(4, 2.8), (5, 3.5), (6, 4.3), (None, 5.0)],
+    WorkoutType.CYCLING: [(16, 4.0), (20, 6.8), (25, 8.0), (None, 10.0)],
+}
+
+
+def reference_calories(workout_type, duration_minutes, weight_kg, avg_speed_kmh=None):
+    met = CalorieCalculator.BASE_METS[workout_type]
+    if avg_speed_kmh and workout_type in SPEED_TIERS:
+        for upper, tier_met in SPEED_TIERS[workout_type]:
+            if upper is None or avg_speed_kmh < upper:
+                met = tier_met
+                break
+    return round(met * weight_kg * (duration_minutes / 60), 2)
+
+
+def random_workouts(count, seed=42):
+    rng = random.Random(seed)
+    workouts = []
+    for _ in range(count):
+        workout_type = rng.choice(list(WorkoutType))
+        pool = workout_type == WorkoutType.SWIMMING and rng.random() < 0.7
+        workouts.append(
+            WorkoutCreate(
+                workout_type=workout_type,
+                duration_minutes=rng.choice([0.5, 15, 30, 45.5, 60, 120]),
+                distance_km=rng.choice([None, 0, 1.2, 5, 8.33, 10, 42.195]),
+                steps=rng.choice([None, 0, 4200]),
+                pool_length_m=25 if pool else None,
+                pool_laps=rng.choice([0, 40]) if pool else None,
+                started_at=datetime(2026, 1, 1),
+            )
+        )
+    return workouts
+
+
+@pytest.mark.parametrize("workout_type", list(WorkoutType))
+@pytest.mark.parametrize("speed", [None, 0, 3.9, 4, 5, 7.99, 8, 10, 12, 14, 15.9, 16, 19.99, 25, 40])
+def test_scalar_calories_match_reference(workout_type, speed):
+    assert CalorieCalculator.calculate_calories(workout_type, 47, 72.5, speed) == (
+        reference_calories(workout_type, 47, 72.5, speed)
+    )
+
+
+def test_batch_calories_match_scalar():
+    rng = np.random.default_rng(7)
+    size = 10000
+    type_codes = rng.integers(0, len(WorkoutType), size)
+    durations = rng.uniform(1, 240, size)
+    weights = rng.uniform(40, 140, size)
+    speeds = np.where(rng.random(size) < 0.2, np.nan, rng.uniform(0, 45, size))
+
+    batch = CalorieCalculator.calculate_calories_batch(type_codes, durations, weights, speeds)
+
+    workout_types = list(WorkoutType)
+    expected = [
+        reference_calories(
+            workout_types[code],
+            duration,
+            weight,
+            None if np.isnan(speed) else speed,
+        )
+        for code, duration, weight, speed in zip(type_codes, durations, weights, speeds)
+    ]
+    np.testing.assert_allclose(batch, expected, atol=0.01)
+
+
+def test_batch_calories_are_missing_without_weight():
+    result = CalorieCalculator.calculate_calories_batch(
+        np.array([WORKOUT_TYPE_CODES[WorkoutType.RUNNING]] * 2),
+        np.array([30.0, 30.0]),
+        np.array([np.nan, 70.0]),
+        np.array([10.0, 10.0]),
+    )
+    assert np.isnan(result[0])
+    assert result[1] == pytest.approx(385.0)
+
+
+@pytest.mark.parametrize("weight", [None, 68.0])
+def test_bulk_rows_match_single_workout_values(weight):
+    workouts = random_workouts(500)
+
+    rows = WorkoutService._build_workout_rows(1, workouts, weight)
+
+    for workout, row in zip(workouts, rows):
+        expected = WorkoutService._build_workout_values(workout, weight)
+        for field, value in expected.items():
+            if isinstance(value, float):
+                assert row[field] == pytest.approx(value, abs=0.01), field
+            else:
+                assert row[field] == value, field
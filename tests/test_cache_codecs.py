@@ -0,0 +1,99 @@
+import json
+import pytest
+from datetime import timedelta
+from src.core import cache
+from src.core.cache import cache_service, MSGPACK_MARKER, ZlibCodec
+
+
+pytestmark = pytest.mark.asyncio
+
+PAGE = json.dumps([{"id": index, "workout_type": "running", "notes": "интервалы"} for index in range(300)])
+
+
+async def test_large_payloads_are_compressed_and_tagged(fake_redis, monkeypatch):
+    monkeypatch.setattr(cache_service, "codec", cache_service.codecs[ZlibCodec.tag])
+
+    await cache_service.set("user:1:workouts:page", PAGE, timedelta(minutes=5))
+    await cache_service.set("user:1:principal", "{}", timedelta(minutes=5))
+    cache_service.local.clear()
+
+    stored = await fake_redis.get("user:1:workouts:page")
+    assert stored[:1] == ZlibCodec.tag
+    assert len(stored) * 4 < len(PAGE.encode())
+    assert (await fake_redis.get("user:1:principal")) == b"\x01{}"
+
+    assert await cache_service.get("user:1:workouts:page") == PAGE
+    assert await cache_service.get("user:1:principal") == "{}"
+
+    report = cache_service.get_stats()["compression"]["user:{id}:workouts"]
+    assert report["saved_bytes"] > 0
+    assert report["ratio"] > 4
+
+
+async def test_legacy_untagged_entries_still_decode(fake_redis):
+    await fake_redis.set("user:2:principal", json.dumps({"id": 2}))
+    await fake_redis.set("user:2:workouts:legacy", "1700000000.000|[]")
+
+    assert await cache_service.get_json("user:2:principal") == {"id": 2}
+    assert await cache_service.get("user:2:workouts:legacy") == "1700000000.000|[]"
+
+
+async def test_cached_pages_survive_compression(client, auth_headers, fake_redis):
+    await client.post(
+        "/api/v1/workouts/batch",
+        headers=auth_headers,
+        json={
+            "workouts": [
+                {"workout_type": "running", "duration_minutes": 30 + index, "distance_km": 5, "started_at": "2026-01-10T08:00:00"}
+                for index in range(100)
+            ]
+        },
+    )
+
+    miss = await client.get("/api/v1/workouts", headers=auth_headers)
+    cache_service.local.clear()
+    hit = await client.get("/api/v1/workouts", headers=auth_headers)
+
+    assert hit.content == miss.content
+    assert len(hit.json()) == 100
+
+
+async def test_msgpack_entries_without_msgpack_are_misses(fake_redis, monkeypatch):
+    monkeypatch.setattr(cache, "msgpack", None)
+    monkeypatch.setattr(cache_service, "json_codec", cache_service._select_json_codec("msgpack"))
+    await fake_redis.set("user:3:principal", b"\x01" + MSGPACK_MARKER + b"\x80")
+
+    assert await cache_service.get_json("user:3:principal") is None
+
+    await cache_service.set_json("user:3:principal", {"id": 3})
+    cache_service.local.clear()
+    assert await cache_service.get_json("user:3:principal") == {"id": 3}
+
+
+async def test_msgpack_round_trip(fake_redis, monkeypatch):
+    pytest.importorskip("msgpack")
+    monkeypatch.setattr(cache_service, "json_codec", cache_service._select_json_codec("msgpack"))
+
+    await cache_service.set_json("user:4:principal", {"id": 4, "username": "тест"})
+    cache_service.local.clear()
+
+    assert (await fake_redis.get("user:4:principal")).startswith(b"\x01" + MSGPACK_MARKER)
+    assert await cache_service.get_json("user:4:principal") == {"id": 4, "username": "тест"}
+
+
+def test_missing_msgpack_falls_back_to_json(monkeypatch):
+    monkeypatch.setattr(cache, "msgpack", None)
+
+    assert cache_service._select_json_codec("msgpack") == "json"
+    assert cache_service._select_json_codec("json") == "json"
+
+
+async def test_zstd_codec(fake_redis, monkeypatch):
+    pytest.importorskip("zstandard")
+    monkeypatch.setattr(cache_service, "codec", cache_service._select_codec("zstd"))
+
+    await cache_service.set("user:5:workouts:page", PAGE)
+    cache_service.local.clear()
+
+    assert (await fake_redis.get("user:5:workouts:page"))[:1] == cache.ZstdCodec.tag
+    assert await cache_service.get("user:5:workouts:page") == PAGE
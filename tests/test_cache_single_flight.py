@@ -0,0 +1,48 @@
+import asyncio
+import pytest
+from datetime import timedelta
+from src.core.cache import cache_service
+
+
+pytestmark = pytest.mark.asyncio
+
+TTL = timedelta(minutes=5)
+
+
+async def test_follower_reloads_when_leader_is_cancelled(fake_redis):
+    started = asyncio.Event()
+    calls = []
+
+    async def slow_loader():
+        calls.append("leader")
+        started.set()
+        await asyncio.sleep(10)
+        return b"[]"
+
+    async def loader():
+        calls.append("follower")
+        return b"[1]"
+
+    leader = asyncio.create_task(cache_service.get_or_load("user:1:workouts:x", slow_loader, TTL, TTL))
+    await started.wait()
+    follower = asyncio.create_task(cache_service.get_or_load("user:1:workouts:x", loader, TTL, TTL))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    assert await asyncio.wait_for(follower, 2) == b"[1]"
+    assert calls == ["leader", "follower"]
+    assert "user:1:workouts:x" not in cache_service._inflight
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+async def test_lock_release_keeps_a_lock_taken_by_another_worker(fake_redis):
+    token = await cache_service._acquire_lock("user:1:stats:30")
+    await fake_redis.set("user:1:stats:30:lock", "другой-воркер")
+
+    await cache_service._release_lock("user:1:stats:30", token)
+    assert await fake_redis.get("user:1:stats:30:lock") == "другой-воркер".encode()
+
+    await fake_redis.set("user:1:stats:30:lock", token)
+    await cache_service._release_lock("user:1:stats:30", token)
+    assert not await fake_redis.exists("user:1:stats:30:lock")
@@ -0,0 +1,49 @@
+import argparse
+import pytest
+from datetime import datetime, timedelta
+from src import cli
+from src.core.cache import cache_service
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def cli_redis(fake_redis, monkeypatch):
+    async def from_url(*args, **kwargs):
+        return fake_redis
+
+    monkeypatch.setattr("src.core.cache.aioredis.from_url", from_url)
+    monkeypatch.setattr(cache_service, "redis", None)
+    return fake_redis
+
+
+async def test_evaluate_goals_bumps_goal_generations(client, auth_headers, cli_redis):
+    await client.post(
+        "/api/v1/workouts",
+        headers=auth_headers,
+        json={"workout_type": "running", "duration_minutes": 30, "started_at": (datetime.utcnow() - timedelta(days=1)).isoformat()},
+    )
+    await client.post("/api/v1/goals", headers=auth_headers, json={"title": "Бег", "target_workouts_per_week": 1})
+    generation = int(await cli_redis.get("user:1:goals:generation") or 0)
+
+    await cli.evaluate_goals(argparse.Namespace())
+
+    assert int(await cli_redis.get("user:1:goals:generation")) == generation + 1
+    goals = await client.get("/api/v1/goals", headers=auth_headers)
+    assert goals.json()[0]["is_achieved"] is True
+
+
+@pytest.mark.parametrize("user_id", [None, 1])
+async def test_rebuild_rollups_bumps_workout_generations(client, auth_headers, cli_redis, user_id):
+    await client.post(
+        "/api/v1/workouts",
+        headers=auth_headers,
+        json={"workout_type": "running", "duration_minutes": 30, "started_at": datetime.utcnow().isoformat()},
+    )
+
+    await cli.rebuild_rollups(argparse.Namespace(user_id=user_id))
+
+    assert await cli_redis.get("user:1:workouts:generation") == b"1"
+    stats = await client.get("/api/v1/workouts/stats", headers=auth_headers)
+    assert stats.json()["total_workouts"] == 1
@@ -0,0 +1,75 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+
+
+pytestmark = pytest.mark.asyncio
+
+WORKOUT = {
+    "workout_type": "running",
+    "duration_minutes": 30,
+    "distance_km": 5,
+    "started_at": (datetime.utcnow() - timedelta(days=1)).isoformat(),
+}
+
+
+async def revalidate(client, headers, path, etag):
+    return await client.get(path, headers={**headers, "If-None-Match": etag})
+
+
+async def test_repeat_poll_gets_304_without_queries(client, auth_headers, db_session, fake_redis):
+    await client.post("/api/v1/workouts", headers=auth_headers, json=WORKOUT)
+
+    for path in ("/api/v1/workouts", "/api/v1/workouts/stats", "/api/v1/goals", "/api/v1/goals/progress"):
+        first = await client.get(path, headers=auth_headers)
+        etag = first.headers["ETag"]
+        assert etag.startswith('W/"')
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db_session.bind.sync_engine, "before_cursor_execute", listener)
+        try:
+            second = await revalidate(client, auth_headers, path, f'"other", {etag}')
+        finally:
+            event.remove(db_session.bind.sync_engine, "before_cursor_execute", listener)
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["ETag"] == etag
+        assert statements == []
+
+
+async def test_writes_change_only_affected_etags(client, auth_headers, fake_redis):
+    created = await client.post("/api/v1/workouts", headers=auth_headers, json=WORKOUT)
+    workouts = (await client.get("/api/v1/workouts", headers=auth_headers)).headers["ETag"]
+    goals = (await client.get("/api/v1/goals", headers=auth_headers)).headers["ETag"]
+    progress = (await client.get("/api/v1/goals/progress", headers=auth_headers)).headers["ETag"]
+
+    await client.put(
+        f"/api/v1/workouts/{created.json()['id']}", headers=auth_headers, json={"duration_minutes": 45}
+    )
+
+    changed = await revalidate(client, auth_headers, "/api/v1/workouts", workouts)
+    assert changed.status_code == 200
+    assert changed.json()[0]["duration_minutes"] == 45
+    assert changed.headers["ETag"] != workouts
+    assert (await revalidate(client, auth_headers, "/api/v1/goals/progress", progress)).status_code == 200
+    assert (await revalidate(client, auth_headers, "/api/v1/goals", goals)).status_code == 304
+
+    await fake_redis.flushall()
+    assert (await revalidate(client, auth_headers, "/api/v1/goals", goals)).status_code == 200
+
+
+async def test_missing_goal_progress_is_not_revalidated(client, auth_headers, fake_redis):
+    response = await client.get("/api/v1/goals/999/progress", headers=auth_headers)
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
+
+
+async def test_etags_disabled_without_redis(client, auth_headers):
+    response = await client.get("/api/v1/workouts", headers=auth_headers)
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+    response = await revalidate(client, auth_headers, "/api/v1/workouts", 'W/"anything"')
+    assert response.status_code == 200
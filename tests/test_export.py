@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+import pytest
+from src.services.export_service import EXPORT_COLUMNS
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def create_workouts(client, auth_headers):
+    items = [
+        {"workout_type": "running", "duration_minutes": 30, "distance_km": 5, "started_at": "2026-03-01T23:30:00", "notes": "вечер, \"легко\""},
+        {"workout_type": "cycling", "duration_minutes": 90, "distance_km": 40, "started_at": "2026-03-02T08:00:00"},
+        {"workout_type": "yoga", "duration_minutes": 60, "started_at": "2026-03-03T00:00:00", "notes": "растяжка\nи дыхание"},
+    ]
+    response = await client.post("/api/v1/workouts/batch", headers=auth_headers, json={"workouts": items})
+    return response.json()["workout_ids"]
+
+
+async def test_ndjson_export(client, auth_headers, monkeypatch):
+    monkeypatch.setattr("src.core.config.settings.EXPORT_CHUNK_ROWS", 2)
+    ids = await create_workouts(client, auth_headers)
+
+    response = await client.get("/api/v1/workouts/export", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["content-disposition"] == 'attachment; filename="workouts.ndjson"'
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == ids[::-1]
+    assert list(rows[0]) == EXPORT_COLUMNS
+    assert rows[0]["workout_type"] == "yoga"
+    assert rows[0]["notes"] == "растяжка\nи дыхание"
+    assert rows[0]["distance_km"] is None
+    assert rows[2]["started_at"] == "2026-03-01T23:30:00"
+
+    listed = await client.get("/api/v1/workouts", headers=auth_headers)
+    assert rows == listed.json()
+
+
+async def test_csv_export(client, auth_headers):
+    ids = await create_workouts(client, auth_headers)
+
+    response = await client.get("/api/v1/workouts/export", headers=auth_headers, params={"file_format": "csv"})
+
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="workouts.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == ids[::-1]
+    assert rows[0]["notes"] == "растяжка\nи дыхание"
+    assert rows[0]["distance_km"] == ""
+    assert rows[2]["notes"] == 'вечер, "легко"'
+    assert rows[2]["workout_type"] == "running"
+
+
+async def test_export_date_filters(client, auth_headers):
+    ids = await create_workouts(client, auth_headers)
+
+    async def exported(**params):
+        response = await client.get("/api/v1/workouts/export", headers=auth_headers, params=params)
+        return [json.loads(line)["id"] for line in response.text.splitlines()]
+
+    assert await exported(**{"from": "2026-03-02"}) == [ids[2], ids[1]]
+    assert await exported(to="2026-03-02") == [ids[1], ids[0]]
+    assert await exported(**{"from": "2026-03-02", "to": "2026-03-02"}) == [ids[1]]
+    assert await exported(**{"from": "2026-04-01"}) == []
+
+    response = await client.get(
+        "/api/v1/workouts/export", headers=auth_headers, params={"from": "2026-03-03", "to": "2026-03-01"}
+    )
+    assert response.status_code == 400
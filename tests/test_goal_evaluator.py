@@ -0,0 +1,86 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from src.models.models import Goal, User, Workout, WorkoutType
+from src.services.goal_evaluator import GoalEvaluator, goal_evaluation_stats
+from src.services.rollup_service import RollupService
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_evaluator_flips_achieved_goals_in_bulk(client, db_session, test_user, monkeypatch):
+    monkeypatch.setattr("src.core.config.settings.GOAL_EVALUATION_CHUNK_GOALS", 2)
+    other = User(email="other@example.com", username="other", hashed_password="x")
+    db_session.add(other)
+    await db_session.flush()
+
+    now = datetime.utcnow()
+    for user, days_ago in ((test_user, 1), (test_user, 2), (test_user, 20), (other, 1)):
+        db_session.add(
+            Workout(
+                user_id=user.id,
+                workout_type=WorkoutType.RUNNING,
+                duration_minutes=30,
+                distance_km=5,
+                calories_burned=300,
+                started_at=now - timedelta(days=days_ago),
+            )
+        )
+    await db_session.flush()
+    await RollupService.rebuild(db_session)
+
+    goals = {
+        "two_runs": Goal(user_id=test_user.id, title="a", target_workouts_per_week=2),
+        "three_runs": Goal(user_id=test_user.id, title="b", target_workouts_per_week=3),
+        "distance_and_calories": Goal(
+            user_id=test_user.id, title="c", target_distance_km=10, target_calories_per_week=600
+        ),
+        "past_deadline": Goal(
+            user_id=test_user.id,
+            title="d",
+            target_workouts_per_week=1,
+            deadline=now - timedelta(days=18),
+        ),
+        "weight_only": Goal(user_id=test_user.id, title="e", target_weight_kg=70),
+        "other_user": Goal(user_id=other.id, title="f", target_workouts_per_week=2),
+    }
+    db_session.add_all(goals.values())
+    await db_session.commit()
+    goal_ids = {name: goal.id for name, goal in goals.items()}
+
+    runs = goal_evaluation_stats["runs"]
+    result = await GoalEvaluator.evaluate_all()
+
+    assert result == {"evaluated": 6, "achieved": 3, "duration_seconds": result["duration_seconds"]}
+    assert goal_evaluation_stats["runs"] == runs + 1
+
+    result = await db_session.execute(select(Goal.id).where(Goal.is_achieved == True))
+    achieved_ids = set(result.scalars().all())
+    achieved = {name for name, goal_id in goal_ids.items() if goal_id in achieved_ids}
+    assert achieved == {"two_runs", "distance_and_calories", "past_deadline"}
+
+
+async def test_evaluator_window_covers_seven_days(client, db_session, test_user):
+    now = datetime.utcnow()
+    for days_ago in (6, 7):
+        db_session.add(
+            Workout(
+                user_id=test_user.id,
+                workout_type=WorkoutType.RUNNING,
+                duration_minutes=30,
+                calories_burned=300,
+                started_at=now - timedelta(days=days_ago),
+            )
+        )
+    await db_session.flush()
+    await RollupService.rebuild(db_session)
+    goal = Goal(user_id=test_user.id, title="a", target_workouts_per_week=2)
+    db_session.add(goal)
+    await db_session.commit()
+
+    result = await GoalEvaluator.evaluate_all()
+
+    assert result["achieved"] == 0
+    await db_session.refresh(goal)
+    assert goal.is_achieved is False
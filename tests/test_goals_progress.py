@@ -0,0 +1,75 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_all_goals_progress_in_two_queries(client, auth_headers, db_session):
+    engine = db_session.bind
+    now = datetime.utcnow()
+    for days_ago in (1, 3, 12):
+        await client.post(
+            "/api/v1/workouts",
+            headers=auth_headers,
+            json={
+                "workout_type": "running",
+                "duration_minutes": 30,
+                "distance_km": 5,
+                "started_at": (now - timedelta(days=days_ago)).isoformat(),
+            },
+        )
+
+    goals = [
+        {"title": "Бег", "target_workouts_per_week": 4},
+        {"title": "Дистанция", "target_distance_km": 10},
+        {
+            "title": "Прошлая неделя",
+            "target_workouts_per_week": 1,
+            "deadline": (now - timedelta(days=10)).isoformat(),
+        },
+    ]
+    for goal in goals:
+        await client.post("/api/v1/goals", headers=auth_headers, json=goal)
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        response = await client.get("/api/v1/goals/progress", headers=auth_headers)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", listener)
+
+    progress = {item["goal_title"]: item for item in response.json()}
+    assert len([s for s in statements if "goals" in s or "workout_daily_rollups" in s]) == 2
+    assert progress["Бег"]["current_workouts"] == 2
+    assert progress["Дистанция"]["progress_percentage"] == 100
+    assert progress["Дистанция"]["is_on_track"] is True
+    assert progress["Прошлая неделя"]["current_workouts"] == 1
+
+    single = await client.get(
+        f"/api/v1/goals/{progress['Дистанция']['goal_id']}/progress", headers=auth_headers
+    )
+    assert single.json() == progress["Дистанция"]
+
+
+async def test_progress_window_covers_seven_days(client, auth_headers):
+    now = datetime.utcnow()
+    for days_ago in (6, 7):
+        await client.post(
+            "/api/v1/workouts",
+            headers=auth_headers,
+            json={
+                "workout_type": "running",
+                "duration_minutes": 30,
+                "distance_km": 5,
+                "started_at": (now - timedelta(days=days_ago)).isoformat(),
+            },
+        )
+    await client.post(
+        "/api/v1/goals", headers=auth_headers, json={"title": "Бег", "target_workouts_per_week": 2}
+    )
+
+    response = await client.get("/api/v1/goals/progress", headers=auth_headers)
+    assert response.json()[0]["current_workouts"] == 1
@@ -0,0 +1,106 @@
+import json
+import pytest
+
+
+pytestmark = pytest.mark.asyncio
+
+CSV = (
+    "workout_type,duration_minutes,distance_km,started_at,notes\n"
+    "running,30,5,2026-03-02T08:00:00,\"темп\n"
+    "ровный, без ускорений\"\n"
+    "cycling,-10,20,2026-03-03T08:00:00,\n"
+    "yoga,60,,2026-03-04T08:00:00,\n"
+    "swimming,45,2,2026-03-05T08:00:00,\"бассейн\"\n"
+).encode()
+
+
+async def upload(client, auth_headers, content, filename="workouts.csv", **params):
+    return await client.post(
+        "/api/v1/workouts/import",
+        headers=auth_headers,
+        params=params,
+        files={"file": (filename, content, "application/octet-stream")},
+    )
+
+
+async def workouts(client, auth_headers):
+    response = await client.get("/api/v1/workouts", headers=auth_headers)
+    return sorted(response.json(), key=lambda workout: workout["started_at"])
+
+
+async def test_csv_import_keeps_quoted_newlines_and_reports_bad_rows(client, auth_headers, monkeypatch):
+    monkeypatch.setattr("src.core.config.settings.IMPORT_READ_CHUNK_BYTES", 16)
+    monkeypatch.setattr("src.core.config.settings.IMPORT_CHUNK_ROWS", 2)
+
+    response = await upload(client, auth_headers, CSV)
+
+    progress = response.json()
+    assert response.status_code == 200
+    assert progress["completed"] is True
+    assert (progress["rows_read"], progress["imported"], progress["failed"]) == (4, 3, 1)
+    assert progress["next_row"] == 4
+    assert progress["errors"][0]["index"] == 1
+    assert progress["errors"][0]["errors"][0].startswith("duration_minutes")
+
+    stored = await workouts(client, auth_headers)
+    assert [workout["workout_type"] for workout in stored] == ["running", "yoga", "swimming"]
+    assert stored[0]["notes"] == "темп\nровный, без ускорений"
+
+
+async def test_import_resumes_from_start_row(client, auth_headers):
+    lines = [
+        json.dumps({"workout_type": "running", "duration_minutes": 30 + i, "started_at": f"2026-03-0{i + 1}T08:00:00"})
+        for i in range(4)
+    ]
+    content = ("\n".join(lines) + "\n").encode()
+
+    response = await upload(client, auth_headers, content, "workouts.ndjson", start_row=2)
+
+    assert response.json()["imported"] == 2
+    assert response.json()["next_row"] == 4
+    assert [workout["duration_minutes"] for workout in await workouts(client, auth_headers)] == [32, 33]
+
+
+async def test_import_stops_at_oversized_record_with_partial_progress(client, auth_headers, monkeypatch):
+    monkeypatch.setattr("src.core.config.settings.IMPORT_CHUNK_ROWS", 2)
+    monkeypatch.setattr("src.core.config.settings.IMPORT_MAX_RECORD_LENGTH", 200)
+    lines = [
+        json.dumps({"workout_type": "running", "duration_minutes": 30, "started_at": f"2026-03-0{i + 1}T08:00:00"})
+        for i in range(3)
+    ]
+    content = ("\n".join(lines) + "\n" + "x" * 500).encode()
+
+    response = await upload(client, auth_headers, content, "workouts.ndjson")
+
+    progress = response.json()
+    assert response.status_code == 200
+    assert progress["completed"] is False
+    assert progress["imported"] == 2
+    assert progress["next_row"] == 2
+    assert "200" in progress["error"]
+
+    unterminated = CSV + b'running,30,5,2026-03-06T08:00:00,"' + b"y\n" * 150
+    response = await upload(client, auth_headers, unterminated, start_row=4)
+    assert response.json()["completed"] is False
+    assert response.json()["next_row"] == 4
+    assert response.json()["error"]
+
+
+async def test_empty_csv_is_rejected(client, auth_headers):
+    response = await upload(client, auth_headers, b"")
+
+    assert response.status_code == 400
+
+
+async def test_ndjson_rows_that_are_not_objects_are_reported(client, auth_headers):
+    good = json.dumps({"workout_type": "running", "duration_minutes": 30, "started_at": "2026-03-02T08:00:00"})
+    content = "\n".join([good, "5", "null", "[1]", '"бег"', good]).encode()
+
+    response = await upload(client, auth_headers, content, "workouts.ndjson")
+
+    progress = response.json()
+    assert progress["completed"] is True
+    assert progress["error"] is None
+    assert (progress["imported"], progress["failed"]) == (2, 4)
+    assert [error["index"] for error in progress["errors"]] == [1, 2, 3, 4]
+    assert progress["errors"][0]["errors"] == ["Строка должна быть JSON-объектом"]
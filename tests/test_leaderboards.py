@@ -0,0 +1,97 @@
+import pytest
+from datetime import datetime, timedelta
+from src.models.models import User
+from src.core.security import get_password_hash
+from src.services.leaderboard_service import LeaderboardService
+
+
+pytestmark = pytest.mark.asyncio
+
+TODAY = datetime.utcnow().date()
+MONDAY = TODAY - timedelta(days=TODAY.weekday())
+NEXT_WEEK = MONDAY + timedelta(days=7 if (MONDAY + timedelta(days=7)).month == MONDAY.month else -7)
+WEEK_ID = f"{MONDAY.isocalendar()[0]}-W{MONDAY.isocalendar()[1]:02d}"
+
+
+async def login_as(client, db_session, username):
+    db_session.add(
+        User(email=f"{username}@example.com", username=username, hashed_password=get_password_hash("testpass123"))
+    )
+    await db_session.commit()
+    response = await client.post("/api/v1/users/login", json={"username": username, "password": "testpass123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def create(client, headers, distance_km, started_at=f"{MONDAY}T08:00:00"):
+    response = await client.post(
+        "/api/v1/workouts",
+        headers=headers,
+        json={"workout_type": "running", "duration_minutes": 30, "distance_km": distance_km, "started_at": started_at},
+    )
+    return response.json()["id"]
+
+
+async def board(client, headers, path="", **params):
+    response = await client.get(
+        f"/api/v1/leaderboards/distance{path}", headers=headers, params={"date": MONDAY.isoformat(), **params}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_leaderboard_follows_workout_changes(client, auth_headers, db_session, fake_redis):
+    other = await login_as(client, db_session, "rival")
+    mine = await create(client, auth_headers, 5)
+    await create(client, other, 8)
+    await create(client, auth_headers, 20, started_at=f"{NEXT_WEEK}T08:00:00")
+
+    top = await board(client, auth_headers)
+    assert top["period"] == WEEK_ID
+    assert [(entry["username"], entry["score"]) for entry in top["entries"]] == [("rival", 8), ("testuser", 5)]
+
+    me = await board(client, auth_headers, "/me")
+    assert (me["rank"], me["score"], me["total"]) == (2, 5, 2)
+
+    await client.put(f"/api/v1/workouts/{mine}", headers=auth_headers, json={"distance_km": 12})
+    assert (await board(client, auth_headers, "/me"))["rank"] == 1
+
+    monthly = await board(client, auth_headers, period="month")
+    assert monthly["period"] == f"{MONDAY:%Y-%m}"
+    assert monthly["entries"][0]["score"] == 32
+
+    await client.delete(f"/api/v1/workouts/{mine}", headers=auth_headers)
+    me = await board(client, auth_headers, "/me")
+    assert me["rank"] is None and me["total"] == 1
+    assert await fake_redis.ttl(LeaderboardService.key("distance", WEEK_ID)) > 0
+
+
+async def test_around_me_window(client, auth_headers, db_session, fake_redis):
+    await create(client, auth_headers, 10.5)
+    await fake_redis.zadd(
+        LeaderboardService.key("distance", WEEK_ID),
+        {str(1000 + index): float(index) for index in range(1, 21)},
+    )
+
+    around = await board(client, auth_headers, "/around-me", radius=2)
+    assert [entry["rank"] for entry in around["entries"]] == [9, 10, 11, 12, 13]
+    assert around["entries"][2]["username"] == "testuser"
+    assert around["entries"][0]["score"] == 12
+
+
+async def test_rebuild_repairs_drift(client, auth_headers, fake_redis):
+    await create(client, auth_headers, 7)
+    await create(client, auth_headers, 3, started_at=f"{MONDAY + timedelta(days=2)}T08:00:00")
+    key = LeaderboardService.key("distance", WEEK_ID)
+    await fake_redis.zadd(key, {"999": 50.0, "1": 1.0})
+
+    users = await LeaderboardService.rebuild("week", MONDAY)
+
+    assert users == 1
+    assert await fake_redis.zrange(key, 0, -1, withscores=True) == [(b"1", 10.0)]
+    assert await fake_redis.zscore(LeaderboardService.key("workouts", WEEK_ID), "1") == 2
+    assert await fake_redis.ttl(key) > 0
+
+
+async def test_leaderboards_unavailable_without_redis(client, auth_headers):
+    response = await client.get("/api/v1/leaderboards/distance", headers=auth_headers)
+    assert response.status_code == 503
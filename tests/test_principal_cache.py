@@ -0,0 +1,94 @@
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy import update
+from src.core.cache import cache_service
+from src.models.models import User
+from src.services.user_service import UserService, principal_cache, principal_cache_stats
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_principal_served_from_local_then_redis(client, auth_headers, fake_redis):
+    principal_cache.clear()
+    queries, saved = principal_cache_stats["db_queries"], principal_cache_stats["db_queries_saved"]
+
+    await client.get("/api/v1/goals", headers=auth_headers)
+    assert principal_cache_stats["db_queries"] == queries + 1
+    assert await fake_redis.exists("user:1:principal")
+
+    await client.get("/api/v1/goals", headers=auth_headers)
+    principal_cache.clear()
+    cache_service.local.clear()
+    await client.get("/api/v1/goals", headers=auth_headers)
+
+    assert principal_cache_stats["db_queries"] == queries + 1
+    assert principal_cache_stats["db_queries_saved"] == saved + 2
+
+
+async def test_profile_update_invalidates_after_commit(client, auth_headers, fake_redis):
+    await client.get("/api/v1/goals", headers=auth_headers)
+
+    response = await client.put("/api/v1/users/me", headers=auth_headers, json={"height": 190})
+    assert response.status_code == 200
+
+    assert not await fake_redis.exists("user:1:principal")
+    await client.get("/api/v1/goals", headers=auth_headers)
+    local_key = await cache_service.tagged_key("user:1:principal", ["user:1:principal"])
+    assert principal_cache.get(local_key).height == 190
+
+
+async def test_deactivated_user_rejected_after_invalidation(client, auth_headers, db_session, fake_redis):
+    assert (await client.get("/api/v1/goals", headers=auth_headers)).status_code == 200
+
+    await db_session.execute(update(User).where(User.id == 1).values(is_active=False))
+    await db_session.commit()
+    await UserService.invalidate_principal(1)
+
+    assert (await client.get("/api/v1/goals", headers=auth_headers)).status_code == 403
+
+
+async def test_deleted_user_is_evicted_from_every_worker(client, auth_headers, fake_redis):
+    await client.get("/api/v1/goals", headers=auth_headers)
+    other_worker = dict(principal_cache._data)
+
+    assert (await client.delete("/api/v1/users/me", headers=auth_headers)).status_code == 204
+
+    principal_cache._data.update(other_worker)
+    response = await client.post(
+        "/api/v1/workouts",
+        headers=auth_headers,
+        json={"workout_type": "running", "duration_minutes": 30, "started_at": "2026-03-02T08:00:00"},
+    )
+    assert response.status_code == 401
+
+
+async def test_purge_keeps_generations(client, auth_headers, fake_redis):
+    await UserService.invalidate_principal(1)
+    await cache_service.purge("user:1:*")
+
+    assert await fake_redis.get("user:1:principal:generation") == b"1"
+
+
+class BrokenRedis:
+    async def get(self, *args, **kwargs):
+        raise RedisConnectionError("недоступен")
+
+    setex = set = unlink = mget = get
+
+    def pipeline(self, *args, **kwargs):
+        raise RedisConnectionError("недоступен")
+
+
+async def test_redis_errors_fall_back_to_database(client, auth_headers, monkeypatch):
+    principal_cache.clear()
+    monkeypatch.setattr(cache_service, "redis", BrokenRedis())
+    if cache_service.local is not None:
+        cache_service.local.clear()
+
+    response = await client.get("/api/v1/users/me/records", headers=auth_headers)
+    assert response.status_code == 200
+
+    principal_cache.clear()
+    response = await client.put("/api/v1/users/me", headers=auth_headers, json={"age": 30})
+    assert response.status_code == 200
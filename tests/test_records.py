@@ -0,0 +1,97 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import select
+from src.models.models import PersonalRecord
+from src.services.record_service import PersonalRecordService
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def create(client, auth_headers, **fields):
+    response = await client.post(
+        "/api/v1/workouts",
+        headers=auth_headers,
+        json={"workout_type": "running", "duration_minutes": 30, "started_at": "2026-03-02T08:00:00", **fields},
+    )
+    return response.json()["id"]
+
+
+async def records(client, auth_headers):
+    response = await client.get("/api/v1/users/me/records", headers=auth_headers)
+    return {record["record_type"]: record for record in response.json()}
+
+
+async def test_records_follow_create_update_and_delete(client, auth_headers):
+    slow = await create(client, auth_headers, distance_km=5, duration_minutes=30)
+    fast = await create(client, auth_headers, distance_km=10, duration_minutes=50)
+    ride = await create(client, auth_headers, workout_type="cycling", distance_km=40, started_at="2026-03-10T08:00:00")
+
+    current = await records(client, auth_headers)
+    assert current["fastest_5k"]["workout_id"] == fast
+    assert current["fastest_5k"]["value"] == 25
+    assert current["fastest_10k"]["workout_id"] == fast
+    assert current["longest_ride"]["workout_id"] == ride
+    assert current["biggest_week"]["value"] == 40
+    assert current["biggest_week"]["achieved_at"] == "2026-03-09T00:00:00"
+
+    await client.put(f"/api/v1/workouts/{fast}", headers=auth_headers, json={"duration_minutes": 70})
+    current = await records(client, auth_headers)
+    assert current["fastest_5k"]["workout_id"] == slow
+    assert current["fastest_10k"]["value"] == 70
+
+    await client.delete(f"/api/v1/workouts/{fast}", headers=auth_headers)
+    current = await records(client, auth_headers)
+    assert "fastest_10k" not in current
+    assert current["fastest_1k"]["workout_id"] == slow
+
+    await client.delete(f"/api/v1/workouts/{ride}", headers=auth_headers)
+    current = await records(client, auth_headers)
+    assert current["biggest_week"]["value"] == 5
+    assert current["biggest_week"]["achieved_at"] == "2026-03-02T00:00:00"
+
+
+async def test_backfill_matches_incremental(client, auth_headers, monkeypatch):
+    monkeypatch.setattr("src.core.config.settings.RECORDS_BACKFILL_CHUNK_USERS", 1)
+    for distance, duration, started_at in ((5, 28, "2026-03-02T08:00:00"), (12, 60, "2026-03-04T08:00:00"), (3, 12, "2026-03-20T08:00:00")):
+        await create(client, auth_headers, distance_km=distance, duration_minutes=duration, started_at=started_at)
+    await client.post(
+        "/api/v1/workouts/batch",
+        headers=auth_headers,
+        json={"workouts": [{"workout_type": "cycling", "duration_minutes": 90, "distance_km": 45, "started_at": "2026-03-21T08:00:00"}]},
+    )
+
+    incremental = await records(client, auth_headers)
+
+    assert await PersonalRecordService.backfill(concurrency=2) == 1
+
+    assert await records(client, auth_headers) == incremental
+    assert set(incremental) == {"fastest_1k", "fastest_5k", "fastest_10k", "longest_ride", "biggest_week"}
+
+
+async def test_deleting_account_removes_records(client, auth_headers, db_session):
+    await create(client, auth_headers, distance_km=5)
+
+    response = await client.delete("/api/v1/users/me", headers=auth_headers)
+    assert response.status_code == 204
+
+    result = await db_session.execute(select(PersonalRecord))
+    assert result.scalars().all() == []
+
+
+async def test_first_record_upserts_over_a_concurrent_insert(db_session, test_user):
+    achieved_at = datetime(2026, 3, 2, 8)
+    await PersonalRecordService._set(db_session, {}, test_user.id, "fastest_5k", 25, None, achieved_at)
+    await PersonalRecordService._set(db_session, {}, test_user.id, "longest_ride", 40, None, achieved_at)
+    await db_session.commit()
+
+    for record_type, value in (("fastest_5k", 30), ("fastest_5k", 20), ("longest_ride", 30)):
+        records = {}
+        await PersonalRecordService._set(
+            db_session, records, test_user.id, record_type, value, None, achieved_at
+        )
+        assert records[record_type].record_type == record_type
+    await db_session.commit()
+
+    result = await db_session.execute(select(PersonalRecord.record_type, PersonalRecord.value))
+    assert dict(result.all()) == {"fastest_5k": 20, "longest_ride": 40}
@@ -0,0 +1,172 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from src.models.models import WorkoutDailyRollup
+from src.services.rollup_service import RollupService, ROLLUP_METRICS
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def rollup_rows(db_session, user_id):
+    result = await db_session.execute(
+        select(WorkoutDailyRollup)
+        .where(WorkoutDailyRollup.user_id == user_id)
+        .order_by(WorkoutDailyRollup.day, WorkoutDailyRollup.workout_type)
+    )
+    return [
+        (row.day, row.workout_type, *(getattr(row, metric) for metric in ROLLUP_METRICS))
+        for row in result.scalars().all()
+    ]
+
+
+async def test_incremental_rollups_match_rebuild(client, auth_headers, test_user, db_session):
+    now = datetime.utcnow()
+    ids = []
+    for days_ago, workout_type, heart_rate in ((1, "running", 150), (1, "running", None), (3, "cycling", 130)):
+        response = await client.post(
+            "/api/v1/workouts",
+            headers=auth_headers,
+            json={
+                "workout_type": workout_type,
+                "duration_minutes": 40,
+                "distance_km": 8,
+                "average_heart_rate": heart_rate,
+                "started_at": (now - timedelta(days=days_ago)).isoformat(),
+            },
+        )
+        ids.append(response.json()["id"])
+
+    await client.post(
+        "/api/v1/workouts/batch",
+        headers=auth_headers,
+        json={"workouts": [
+            {"workout_type": "yoga", "duration_minutes": 60, "started_at": (now - timedelta(days=2)).isoformat()},
+        ]},
+    )
+    await client.put(
+        f"/api/v1/workouts/{ids[0]}",
+        headers=auth_headers,
+        json={"duration_minutes": 55, "started_at": (now - timedelta(days=5)).isoformat()},
+    )
+    await client.delete(f"/api/v1/workouts/{ids[2]}", headers=auth_headers)
+
+    incremental = await rollup_rows(db_session, test_user.id)
+
+    await RollupService.rebuild(db_session, [test_user.id])
+    await db_session.commit()
+
+    assert incremental == await rollup_rows(db_session, test_user.id)
+    assert len(incremental) == 3
+
+
+async def test_stats_read_from_rollups(client, auth_headers):
+    now = datetime.utcnow()
+    for days_ago, heart_rate in ((1, 140), (2, None), (40, 160)):
+        await client.post(
+            "/api/v1/workouts",
+            headers=auth_headers,
+            json={
+                "workout_type": "running",
+                "duration_minutes": 30,
+                "distance_km": 5,
+                "average_heart_rate": heart_rate,
+                "started_at": (now - timedelta(days=days_ago)).isoformat(),
+            },
+        )
+
+    response = await client.get("/api/v1/workouts/stats", headers=auth_headers, params={"days": 30})
+    stats = response.json()
+
+    assert stats["total_workouts"] == 2
+    assert stats["total_duration_minutes"] == 60
+    assert stats["total_distance_km"] == 10
+    assert stats["average_heart_rate"] == 140
+    assert stats["favorite_workout_type"] == "running"
+
+
+async def test_stats_series_buckets_by_week_and_type(client, auth_headers):
+    for started_at, workout_type in (
+        ("2026-03-02T08:00:00", "running"),
+        ("2026-03-08T20:00:00", "cycling"),
+        ("2026-03-09T08:00:00", "running"),
+        ("2026-03-11T08:00:00", "running"),
+    ):
+        await client.post(
+            "/api/v1/workouts",
+            headers=auth_headers,
+            json={
+                "workout_type": workout_type,
+                "duration_minutes": 30,
+                "distance_km": 5,
+                "started_at": started_at,
+            },
+        )
+
+    response = await client.get(
+        "/api/v1/workouts/stats/series",
+        headers=auth_headers,
+        params={"bucket": "week", "from": "2026-03-01", "to": "2026-03-31"},
+    )
+    buckets = response.json()["buckets"]
+
+    assert [bucket["start"] for bucket in buckets] == ["2026-03-02", "2026-03-09"]
+    assert buckets[0]["total_workouts"] == 2
+    assert buckets[0]["by_type"]["cycling"]["total_distance_km"] == 5
+    assert buckets[1]["by_type"] == {
+        "running": {
+            "total_workouts": 2,
+            "total_duration_minutes": 60,
+            "total_distance_km": 10,
+            "total_calories_burned": buckets[1]["total_calories_burned"],
+        }
+    }
+
+    month = await client.get(
+        "/api/v1/workouts/stats/series",
+        headers=auth_headers,
+        params={"bucket": "month", "from": "2026-03-01", "to": "2026-03-31"},
+    )
+    assert [bucket["start"] for bucket in month.json()["buckets"]] == ["2026-03-01"]
+    assert month.json()["buckets"][0]["total_workouts"] == 4
+
+
+async def test_stats_series_rejects_inverted_range(client, auth_headers):
+    response = await client.get(
+        "/api/v1/workouts/stats/series",
+        headers=auth_headers,
+        params={"from": "2026-03-10", "to": "2026-03-01"},
+    )
+    assert response.status_code == 400
+
+
+async def test_weight_change_recalculates_calories_and_rollups(client, auth_headers, test_user, db_session):
+    await client.put("/api/v1/users/me", headers=auth_headers, json={"weight": 70})
+    now = datetime.utcnow()
+    for days_ago, workout_type in ((1, "running"), (2, "cycling"), (2, "yoga")):
+        await client.post(
+            "/api/v1/workouts",
+            headers=auth_headers,
+            json={
+                "workout_type": workout_type,
+                "duration_minutes": 45,
+                "distance_km": 9,
+                "started_at": (now - timedelta(days=days_ago)).isoformat(),
+            },
+        )
+    before = (await client.get("/api/v1/workouts/stats", headers=auth_headers)).json()
+    assert before["total_calories_burned"] > 0
+
+    await client.put("/api/v1/users/me", headers=auth_headers, json={"weight": 140})
+
+    progress = await client.get("/api/v1/users/me/calorie-recalculation", headers=auth_headers)
+    assert progress.json()["status"] == "completed"
+    assert progress.json()["processed"] == 3
+
+    after = (await client.get("/api/v1/workouts/stats", headers=auth_headers)).json()
+    assert after["total_calories_burned"] == pytest.approx(2 * before["total_calories_burned"])
+
+    incremental = await rollup_rows(db_session, test_user.id)
+    await RollupService.rebuild(db_session, [test_user.id])
+    await db_session.commit()
+    assert incremental == await rollup_rows(db_session, test_user.id)
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from src.services.samples_service import WorkoutSamplesService
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def ride(seconds=3 * 3600, seed=3):
+    rng = np.random.default_rng(seed)
+    heart_rate = np.clip(140 + np.cumsum(rng.integers(-1, 2, seconds)), 60, 200)
+    speed = np.clip(28 + np.cumsum(rng.normal(0, 0.05, seconds)), 0, 60).round(2)
+    cadence = np.clip(85 + np.cumsum(rng.integers(-1, 2, seconds)), 0, 130)
+    return heart_rate.tolist(), speed.tolist(), cadence.tolist()
+
+
+async def test_channels_round_trip_and_stay_compact(client, auth_headers):
+    created = await client.post(
+        "/api/v1/workouts",
+        headers=auth_headers,
+        json={"workout_type": "cycling", "duration_minutes": 180, "started_at": "2026-02-01T08:00:00"},
+    )
+    workout_id = created.json()["id"]
+    heart_rate, speed, cadence = ride()
+
+    response = await client.put(
+        f"/api/v1/workouts/{workout_id}/samples",
+        headers=auth_headers,
+        json={"heart_rate": heart_rate, "speed_kmh": speed, "cadence": cadence},
+    )
+    assert response.status_code == 200
+    assert response.json()["sample_count"] == 3 * 3600
+    assert response.json()["stored_bytes"] < 24 * 1024
+
+    samples = (await client.get(f"/api/v1/workouts/{workout_id}/samples", headers=auth_headers)).json()
+    assert samples["heart_rate"] == heart_rate
+    assert samples["cadence"] == cadence
+    np.testing.assert_allclose(samples["speed_kmh"], speed, atol=0.005)
+
+
+async def test_time_in_zone_matches_zone_bands(client, auth_headers):
+    created = await client.post(
+        "/api/v1/workouts",
+        headers=auth_headers,
+        json={"workout_type": "running", "duration_minutes": 1, "started_at": "2026-02-01T08:00:00"},
+    )
+    workout_id = created.json()["id"]
+    await client.put(
+        f"/api/v1/workouts/{workout_id}/samples",
+        headers=auth_headers,
+        json={"interval_seconds": 2, "heart_rate": [80, 100, 119, 120, 150, 179, 180, 200, 210]},
+    )
+
+    response = await client.get(
+        f"/api/v1/workouts/{workout_id}/samples/zones",
+        headers=auth_headers,
+        params={"max_heart_rate": 200},
+    )
+
+    assert response.json()["seconds_in_zone"] == {
+        "zone1_recovery": 4.0,
+        "zone2_endurance": 2.0,
+        "zone3_tempo": 2.0,
+        "zone4_threshold": 2.0,
+        "zone5_max": 6.0,
+    }
+
+
+async def test_mismatched_channels_are_rejected(client, auth_headers):
+    created = await client.post(
+        "/api/v1/workouts",
+        headers=auth_headers,
+        json={"workout_type": "running", "duration_minutes": 1, "started_at": "2026-02-01T08:00:00"},
+    )
+    response = await client.put(
+        f"/api/v1/workouts/{created.json()['id']}/samples",
+        headers=auth_headers,
+        json={"heart_rate": [120, 121], "cadence": [80]},
+    )
+    assert response.status_code == 400
+
+
+def test_channel_round_trip():
+    blob = WorkoutSamplesService.encode_channel([150, 151, 149, 149])
+    assert WorkoutSamplesService.decode_channel(blob).tolist() == [150, 151, 149, 149]
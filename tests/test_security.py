@@ -0,0 +1,90 @@
+import asyncio
+import hashlib
+import threading
+import time
+import pytest
+from datetime import timedelta
+from src.core import security
+from src.core.security import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+    create_access_token,
+    decode_access_token,
+    password_hasher,
+    token_cache,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_full_hasher_pool_rejects_and_recovers():
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        blocked = asyncio.create_task(hasher.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        assert hasher.pending == 1
+
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher.run(lambda: None)
+        assert hasher.rejected == 1
+
+        release.set()
+        assert await blocked is True
+        assert hasher.pending == 0
+
+        def fail():
+            raise ValueError("ошибка")
+
+        with pytest.raises(ValueError):
+            await hasher.run(fail)
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+
+async def test_login_returns_503_when_hasher_saturated(client, test_user, monkeypatch):
+    monkeypatch.setattr(password_hasher, "pending", password_hasher.max_pending)
+
+    response = await client.post(
+        "/api/v1/users/login",
+        json={"username": "testuser", "password": "testpass123"},
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert password_hasher.pending == password_hasher.max_pending
+
+
+def cache_key(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def test_decoded_tokens_are_cached_as_copies(monkeypatch):
+    token = create_access_token({"sub": "42"})
+    payload = decode_access_token(token)
+    payload["sub"] = "изменено"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("повторное декодирование")
+
+    monkeypatch.setattr(security.jwt, "decode", fail)
+    assert decode_access_token(token)["sub"] == "42"
+
+
+async def test_cached_token_evicted_at_expiry(monkeypatch):
+    token = create_access_token({"sub": "7"}, expires_delta=timedelta(minutes=5))
+    assert decode_access_token(token)["sub"] == "7"
+    assert token_cache.get(cache_key(token)) is not None
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 301)
+    assert token_cache.get(cache_key(token)) is None
+
+
+async def test_invalid_and_expired_tokens_are_not_cached():
+    expired = create_access_token({"sub": "7"}, expires_delta=timedelta(minutes=-1))
+    for token in ("не-токен", expired, create_access_token({"sub": "7"})[:-2] + "xx"):
+        assert decode_access_token(token) is None
+        assert token_cache.get(cache_key(token)) is None
@@ -0,0 +1,83 @@
+import io
+import pytest
+from src.services.track_service import TrackImportService
+
+
+pytestmark = pytest.mark.asyncio
+
+GPX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1"
+     xmlns:gpxtpx="http://www.garmin.com/xmlschemas/TrackPointExtension/v1">
+  <trk><trkseg>
+    <trkpt lat="55.750000" lon="37.600000"><time>2026-04-01T07:00:00Z</time>
+      <extensions><gpxtpx:TrackPointExtension><gpxtpx:hr>120</gpxtpx:hr></gpxtpx:TrackPointExtension></extensions>
+    </trkpt>
+    <trkpt lat="55.759000" lon="37.600000"><time>2026-04-01T07:06:00Z</time>
+      <extensions><gpxtpx:TrackPointExtension><gpxtpx:hr>150</gpxtpx:hr></gpxtpx:TrackPointExtension></extensions>
+    </trkpt>
+    <trkpt lat="55.759000" lon="37.600000"><time>2026-04-01T07:16:00Z</time></trkpt>
+    <trkpt lat="55.768000" lon="37.600000"><time>2026-04-01T07:21:00Z</time></trkpt>
+  </trkseg></trk>
+</gpx>"""
+
+TCX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<TrainingCenterDatabase xmlns="http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2">
+  <Activities><Activity Sport="Running"><Lap><Track>
+    <Trackpoint>
+      <Time>2026-04-01T07:00:00Z</Time>
+      <Position><LatitudeDegrees>55.75</LatitudeDegrees><LongitudeDegrees>37.6</LongitudeDegrees></Position>
+      <HeartRateBpm><Value>130</Value></HeartRateBpm>
+    </Trackpoint>
+    <Trackpoint><Time>2026-04-01T07:01:00Z</Time></Trackpoint>
+    <Trackpoint>
+      <Time>2026-04-01T07:05:00Z</Time>
+      <Position><LatitudeDegrees>55.759</LatitudeDegrees><LongitudeDegrees>37.6</LongitudeDegrees></Position>
+      <HeartRateBpm><Value>160</Value></HeartRateBpm>
+    </Trackpoint>
+  </Track></Lap></Activity></Activities>
+</TrainingCenterDatabase>"""
+
+
+def test_gpx_distance_moving_time_and_splits():
+    summary = TrackImportService.analyze(**TrackImportService.parse(io.BytesIO(GPX)))
+
+    assert summary.points == 4
+    assert summary.distance_km == pytest.approx(2.0015, abs=0.001)
+    assert summary.elapsed_minutes == 21
+    assert summary.moving_minutes == 11
+    assert summary.average_heart_rate == 135
+    assert [split.km for split in summary.splits] == [1, 2]
+    assert summary.splits[0].duration_seconds == pytest.approx(360 / 1.00075, abs=0.5)
+
+
+def test_tcx_skips_points_without_position():
+    summary = TrackImportService.analyze(**TrackImportService.parse(io.BytesIO(TCX)))
+
+    assert summary.points == 2
+    assert summary.max_heart_rate == 160
+    assert summary.moving_minutes == 5
+
+
+async def test_track_upload_creates_workout(client, auth_headers):
+    response = await client.post(
+        "/api/v1/workouts/import/track",
+        headers=auth_headers,
+        params={"workout_type": "running"},
+        files={"file": ("morning.gpx", GPX, "application/gpx+xml")},
+    )
+
+    assert response.status_code == 201
+    workout = response.json()["workout"]
+    assert workout["distance_km"] == pytest.approx(2.0015, abs=0.001)
+    assert workout["duration_minutes"] == 11
+    assert workout["calories_burned"] > 0
+    assert workout["started_at"] == "2026-04-01T07:00:00"
+
+
+async def test_malformed_track_is_rejected(client, auth_headers):
+    response = await client.post(
+        "/api/v1/workouts/import/track",
+        headers=auth_headers,
+        files={"file": ("broken.gpx", b"<gpx><trk>", "application/gpx+xml")},
+    )
+    assert response.status_code == 400
@@ -0,0 +1,45 @@
+import pytest
+from src.core.config import settings
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_batch_creates_valid_items_and_reports_invalid(client, auth_headers):
+    response = await client.post(
+        "/api/v1/workouts/batch",
+        headers=auth_headers,
+        json={"workouts": [
+            {"workout_type": "running", "duration_minutes": 30, "started_at": "2026-03-02T08:00:00"},
+            {"workout_type": "dancing", "duration_minutes": 30, "started_at": "2026-03-02T09:00:00"},
+            {"workout_type": "yoga", "duration_minutes": 0, "started_at": "2026-03-02T10:00:00"},
+            {"workout_type": "cycling", "duration_minutes": 90, "distance_km": 40, "started_at": "2026-03-03T08:00:00"},
+        ]},
+    )
+
+    result = response.json()
+    assert response.status_code == 200
+    assert result["created"] == 2
+    assert len(result["workout_ids"]) == 2
+    assert [error["index"] for error in result["errors"]] == [1, 2]
+    assert result["errors"][0]["errors"][0].startswith("workout_type")
+    assert result["errors"][1]["errors"][0].startswith("duration_minutes")
+
+    listed = await client.get("/api/v1/workouts", headers=auth_headers)
+    assert sorted(workout["id"] for workout in listed.json()) == sorted(result["workout_ids"])
+
+
+async def test_batch_rejects_too_many_items(client, auth_headers):
+    item = {"workout_type": "running", "duration_minutes": 30, "started_at": "2026-03-02T08:00:00"}
+
+    response = await client.post(
+        "/api/v1/workouts/batch",
+        headers=auth_headers,
+        json={"workouts": [item] * (settings.WORKOUT_BATCH_MAX_ITEMS + 1)},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "too_long"
+
+    response = await client.post("/api/v1/workouts/batch", headers=auth_headers, json={"workouts": []})
+    assert response.status_code == 422
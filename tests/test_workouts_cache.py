@@ -0,0 +1,149 @@
+import pytest
+from datetime import datetime, timedelta
+
+
+pytestmark = pytest.mark.asyncio
+
+WORKOUT = {
+    "workout_type": "running",
+    "duration_minutes": 30,
+    "distance_km": 5,
+    "started_at": "2026-01-10T08:00:00",
+}
+
+
+async def test_created_workout_visible_on_next_cached_list(client, auth_headers, fake_redis):
+    first = await client.get("/api/v1/workouts", headers=auth_headers)
+    assert first.json() == []
+
+    await client.post("/api/v1/workouts", headers=auth_headers, json=WORKOUT)
+
+    second = await client.get("/api/v1/workouts", headers=auth_headers)
+    assert len(second.json()) == 1
+
+
+async def test_write_invalidates_every_cached_page(client, auth_headers, fake_redis):
+    await client.post("/api/v1/workouts", headers=auth_headers, json=WORKOUT)
+
+    for params in ({"limit": 10}, {"skip": 0, "limit": 20}, {"workout_type": "running"}):
+        response = await client.get("/api/v1/workouts", headers=auth_headers, params=params)
+        assert len(response.json()) == 1
+
+    workout_id = response.json()[0]["id"]
+    await client.delete(f"/api/v1/workouts/{workout_id}", headers=auth_headers)
+
+    for params in ({"limit": 10}, {"skip": 0, "limit": 20}, {"workout_type": "running"}):
+        response = await client.get("/api/v1/workouts", headers=auth_headers, params=params)
+        assert response.json() == []
+
+
+async def test_update_visible_in_every_stats_window(client, auth_headers, fake_redis):
+    created = await client.post(
+        "/api/v1/workouts",
+        headers=auth_headers,
+        json={**WORKOUT, "started_at": (datetime.utcnow() - timedelta(days=2)).isoformat()},
+    )
+    workout_id = created.json()["id"]
+
+    for days in (7, 30):
+        response = await client.get(
+            "/api/v1/workouts/stats", headers=auth_headers, params={"days": days}
+        )
+        assert response.json()["total_duration_minutes"] == 30
+
+    await client.put(
+        f"/api/v1/workouts/{workout_id}",
+        headers=auth_headers,
+        json={"duration_minutes": 45},
+    )
+
+    for days in (7, 30):
+        response = await client.get(
+            "/api/v1/workouts/stats", headers=auth_headers, params={"days": days}
+        )
+        assert response.json()["total_duration_minutes"] == 45
+
+
+async def test_invalidation_is_a_single_generation_bump(fake_redis):
+    from src.core.cache import cache_service
+
+    old_key = await cache_service.tagged_key("user:1:workouts:0:100:None", ["user:1:workouts"])
+    await cache_service.set(old_key, "[]")
+
+    await cache_service.invalidate_tags("user:1:workouts")
+
+    new_key = await cache_service.tagged_key("user:1:workouts:0:100:None", ["user:1:workouts"])
+    assert new_key != old_key
+    assert await fake_redis.get("user:1:workouts:generation") == b"1"
+    assert await cache_service.get(new_key) is None
+
+
+async def test_cached_pages_are_served_as_stored_bytes(client, auth_headers, fake_redis, monkeypatch):
+    import fastapi.routing
+
+    for index in range(3):
+        await client.post(
+            "/api/v1/workouts",
+            headers=auth_headers,
+            json={**WORKOUT, "started_at": f"2026-01-1{index}T08:00:00"},
+        )
+    miss = await client.get("/api/v1/workouts", headers=auth_headers)
+
+    serialized = []
+    original = fastapi.routing.serialize_response
+
+    async def spy(*args, **kwargs):
+        serialized.append(kwargs.get("field"))
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(fastapi.routing, "serialize_response", spy)
+
+    for path in ("/api/v1/workouts", "/api/v1/workouts/page", "/api/v1/workouts/stats"):
+        response = await client.get(path, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+    hit = await client.get("/api/v1/workouts", headers=auth_headers)
+
+    assert hit.content == miss.content
+    assert len(hit.json()) == 3
+    assert serialized == []
+
+
+async def test_uncached_raw_payload_matches_response_model(client, auth_headers):
+    await client.post("/api/v1/workouts", headers=auth_headers, json=WORKOUT)
+
+    workouts = await client.get("/api/v1/workouts", headers=auth_headers)
+    stats = await client.get("/api/v1/workouts/stats", headers=auth_headers, params={"days": 365})
+
+    assert workouts.json()[0]["distance_km"] == 5
+    assert workouts.json()[0]["started_at"] == "2026-01-10T08:00:00"
+    assert stats.json()["total_workouts"] == 1
+
+
+async def test_purge_unlinks_matching_keys_in_batches(fake_redis, monkeypatch):
+    from src.core.cache import cache_service
+
+    monkeypatch.setattr("src.core.config.settings.REDIS_SCAN_BATCH_SIZE", 3)
+    for index in range(10):
+        await cache_service.set(f"user:5:workouts:{index}", "[]")
+    await cache_service.set("user:6:workouts:0", "[]")
+
+    assert await cache_service.purge("user:5:*") == 10
+
+    assert await fake_redis.keys("user:5:*") == []
+    assert await cache_service.get("user:5:workouts:0") is None
+    assert await cache_service.get("user:6:workouts:0") == "[]"
+
+
+async def test_only_generation_tagged_keys_enter_l1(client, auth_headers, fake_redis):
+    from src.core.cache import cache_service
+
+    await client.get("/api/v1/workouts", headers=auth_headers)
+
+    tagged = [key for key in cache_service.local._data if ":workouts:" in key]
+    assert tagged and all(key.endswith(":g0") for key in tagged)
+    assert "user:1:principal" not in cache_service.local._data
+
+    await cache_service.set("user:1:principal", "{}")
+    await fake_redis.delete("user:1:principal")
+    assert await cache_service.get("user:1:principal") is None
@@ -0,0 +1,61 @@
+import base64
+import pytest
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def create_workouts(client, auth_headers):
+    items = [
+        {"workout_type": workout_type, "duration_minutes": 30 + index, "started_at": started_at}
+        for index, (workout_type, started_at) in enumerate([
+            ("running", "2026-03-02T08:00:00"),
+            ("cycling", "2026-03-02T08:00:00"),
+            ("running", "2026-03-02T08:00:00"),
+            ("running", "2026-03-03T08:00:00"),
+            ("yoga", "2026-03-03T08:00:00"),
+            ("running", "2026-03-01T08:00:00"),
+        ])
+    ]
+    response = await client.post("/api/v1/workouts/batch", headers=auth_headers, json={"workouts": items})
+    return response.json()["workout_ids"]
+
+
+async def walk(client, auth_headers, **params):
+    pages = []
+    cursor = None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/v1/workouts/page", headers=auth_headers, params=query)
+        assert response.status_code == 200
+        page = response.json()
+        pages.append([item["id"] for item in page["items"]])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return pages
+
+
+async def test_cursor_walk_visits_ties_once(client, auth_headers):
+    ids = await create_workouts(client, auth_headers)
+
+    pages = await walk(client, auth_headers, limit=2)
+
+    expected = sorted(ids[3:5], reverse=True) + sorted(ids[:3], reverse=True) + [ids[5]]
+    assert [workout_id for page in pages for workout_id in page] == expected
+    assert all(len(page) <= 2 for page in pages)
+
+
+async def test_cursor_walk_with_type_filter(client, auth_headers):
+    ids = await create_workouts(client, auth_headers)
+
+    pages = await walk(client, auth_headers, limit=1, workout_type="running")
+
+    assert [workout_id for page in pages for workout_id in page] == [ids[3], ids[2], ids[0], ids[5]]
+
+
+async def test_invalid_cursor_is_rejected(client, auth_headers):
+    for cursor in ("не-курсор", base64.urlsafe_b64encode(b"2026-03-02|x").decode()):
+        response = await client.get(
+            "/api/v1/workouts/page", headers=auth_headers, params={"cursor": cursor}
+        )
+        assert response.status_code == 400